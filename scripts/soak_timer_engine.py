@@ -0,0 +1,80 @@
+import sys
+import os
+import shutil
+import tempfile
+import time
+
+# The soak never shows a window
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Ensure we can import from src
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from PySide6.QtWidgets import QApplication
+from core.clock import VirtualScheduler
+from utils.settings_manager import SettingsManager
+from utils import event_journal
+import main as app_main
+
+def soak(app, days=1, power_saver=False):
+    """
+    Runs the application's whole signal graph (main.build_app: widget, tray,
+    journal, session store) for `days` of virtual time and checks the result.
+    """
+    data_dir = tempfile.mkdtemp(prefix="tomodorange_soak_")
+    try:
+        # Default settings, so the user's own (e.g. the work log dialog) stay out of it
+        SettingsManager.REPO_SETTINGS_FILE = os.path.join(data_dir, "settings.json")
+        SettingsManager.CUSTOM_SETTINGS_FILE = os.path.join(data_dir, "custom_settings.json")
+
+        scheduler = VirtualScheduler()
+        components = app_main.build_app(app, scheduler=scheduler, data_dir=data_dir)
+        engine = components["timer_engine"]
+        widget = components["widget"]
+        engine.set_power_saver(power_saver)
+
+        counts = {"heartbeat": 0, "display": 0, "progress": 0}
+        events = []
+        last_display = [widget.label.text()]
+        engine.display_changed.connect(lambda text: last_display.__setitem__(0, text))
+        engine.heartbeat.connect(lambda secs: counts.__setitem__("heartbeat", counts["heartbeat"] + 1))
+        engine.display_changed.connect(lambda text: counts.__setitem__("display", counts["display"] + 1))
+        engine.progress_changed.connect(lambda p: counts.__setitem__("progress", counts["progress"] + 1))
+        engine.work_completed.connect(lambda: events.append("work_completed"))
+        engine.state_changed.connect(lambda state: events.append(state))
+
+        started = time.perf_counter()
+        scheduler.advance(days * 24 * 3600)
+        elapsed = time.perf_counter() - started
+
+        settings = SettingsManager.load_settings()
+        cycles = int(days * 24 * 3600 // engine.schedule.cycle_seconds)
+        expected = ["work_completed", "break", "work"] * cycles
+        checks = {
+            "signal order": events[:len(expected)] == expected,
+            "widget text": widget.label.text() == last_display[0],
+            "widget mode": widget.current_mode == engine.current_state,
+            "widget color": widget.current_text_color == settings[f"{engine.current_state}_color"],
+            "session snapshot": components["session_store"].load()["slot"] == engine.current_slot,
+            "journal": sum(1 for e in components["journal"].iter_events()
+                           if e.event == event_journal.WORK_COMPLETED) == events.count("work_completed"),
+        }
+
+        mode = "power saver" if power_saver else "precise"
+        print(f"{mode}: {days} virtual days, {cycles} cycles, {scheduler.wakeups} wake-ups, "
+              f"{counts['heartbeat']} heartbeats, {counts['display']} display / "
+              f"{counts['progress']} progress updates in {elapsed:.2f}s")
+        for name, ok in checks.items():
+            print(f"{'PASS' if ok else 'FAIL'}: {name}")
+
+        components["session_store"].close()
+        components["tray_manager"].tray_icon.hide()
+        widget.close()
+        return all(checks.values())
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    results = [soak(app, power_saver=False), soak(app, power_saver=True)]
+    sys.exit(0 if all(results) else 1)
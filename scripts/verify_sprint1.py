@@ -16,10 +16,10 @@ def test_log_manager():
         shutil.rmtree(test_dir)
         
     # Initialize
-    manager = LogManager(data_dir=test_dir, filename="test_logs.json")
+    manager = LogManager(data_dir=test_dir, filename="test_logs.jsonl")
     
     # Test 1: File Creation
-    if not os.path.exists(os.path.join(test_dir, "test_logs.json")):
+    if not os.path.exists(os.path.join(test_dir, "test_logs.jsonl")):
         print("FAIL: File not created")
         return
     print("PASS: File created")
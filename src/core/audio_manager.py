@@ -1,43 +1,113 @@
-from PySide6.QtCore import QUrl, QObject
-from PySide6.QtMultimedia import QSoundEffect, QMediaPlayer, QAudioOutput, QMediaDevices
+from PySide6.QtCore import QUrl, QObject, Signal
+from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput, QMediaDevices
+from core.sound_engine import SoundEngine
+from core.sound_bank import SoundBank
 import os
+import threading
 
 class AudioManager(QObject):
+    """
+    Tick and break sounds. WAV assets are decoded once and mixed into a single
+    QAudioSink stream by the SoundEngine; a compressed break loop (waves.mp3)
+    falls back to QMediaPlayer. Everything is built on demand: the engine on
+    the first audible sound, the media player on the first audible break, and
+    the device watcher alongside whichever comes first. The ambient WAV is
+    decoded on a worker thread when the first audible break starts, so the GUI
+    thread never waits for it. Users who keep audio muted never pay for any of
+    it. Missing asset files are detected once and remembered as unavailable.
+    """
+    TICK_FILE = "water_drop.wav"
+    BREAK_WAV_FILE = "waves.wav" # Pre-decoded and mixed, preferred
+    BREAK_FILE = "waves.mp3"     # Decoded by QMediaPlayer
+
+    ambient_decoded = Signal(object) # Ambient samples (None if unreadable), from the decoder thread
+
     def __init__(self):
         super().__init__()
         
         self.assets_dir = os.path.join(os.getcwd(), "assets", "audio")
         
-        # --- Work Internal (Water Drop) ---
-        # Using QSoundEffect for low latency, low overhead short sounds
-        self.tick_effect = QSoundEffect()
-        tick_path = os.path.join(self.assets_dir, "water_drop.wav")
-        self.tick_effect.setSource(QUrl.fromLocalFile(tick_path))
-        self.tick_effect.setVolume(0.5) # Default
-        
-        # --- Break Interval (Waves) ---
-        # Using QMediaPlayer for longer audio/looping
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        
-        waves_path = os.path.join(self.assets_dir, "waves.mp3")
-        self.player.setSource(QUrl.fromLocalFile(waves_path))
-        self.audio_output.setVolume(0.5) # Default
-        self.player.setLoops(QMediaPlayer.Infinite) # Continuous loop
+        # Created lazily (see _ensure_sound_engine / _ensure_player)
+        self.sound_engine = None
+        self._engine_has_ambient = None # None: not decoded yet, then True/False
+        self._ambient_thread = None
+        self.ambient_decoded.connect(self._on_ambient_decoded)
+        self.player = None
+        self.audio_output = None
+        self.media_devices = None
+        self._unavailable = set() # Asset files known to be missing
         
+        # Requested state, applied when the objects exist
         self.is_muted = False
-        
-        self._setup_connections()
+        self.work_volume = 0.5
+        self.break_volume = 0.5
+        self._break_active = False # Between start_break_sound() and stop_break_sound()
 
-    def _setup_connections(self):
-        """Setup signal connections for error handling and device changes."""
-        # Listen for media player errors
-        self.player.errorOccurred.connect(self._on_player_error)
-        
-        # Listen for system audio device changes
-        self.media_devices = QMediaDevices(self)
-        self.media_devices.audioOutputsChanged.connect(self._on_audio_outputs_changed)
+    def _asset_path(self, filename):
+        """Full path of an audio asset, or None if it is missing (checked once per file)."""
+        if filename in self._unavailable:
+            return None
+        path = os.path.join(self.assets_dir, filename)
+        if not os.path.exists(path):
+            print(f"AudioManager: {path} not found, sound disabled")
+            self._unavailable.add(filename)
+            return None
+        return path
+
+    def _ensure_sound_engine(self):
+        """
+        Work Interval (Water Drop) and, if shipped as WAV, the Break loop
+        (see _load_ambient): decoded once and mixed into one low-latency output stream.
+        """
+        if self.sound_engine is None:
+            self.sound_engine = SoundEngine(self)
+            self.sound_engine.set_tick_volume(self.work_volume)
+            self.sound_engine.set_ambient_volume(self.break_volume)
+            self.sound_engine.set_muted(self.is_muted)
+            tick_path = self._asset_path(self.TICK_FILE)
+            if tick_path is not None:
+                self.sound_engine.load_tick(tick_path)
+            self._ensure_device_watcher()
+        return self.sound_engine
+
+    def _load_ambient(self, path):
+        """Decodes the ambient WAV on a worker thread; ambient_decoded delivers it."""
+        if self._ambient_thread is not None:
+            return
+        # A private bank: the engine's own is only touched on the GUI thread
+        decode = lambda: self.ambient_decoded.emit(SoundBank().load("ambient", path))
+        self._ambient_thread = threading.Thread(target=decode, name="AmbientDecoder", daemon=True)
+        self._ambient_thread.start()
+
+    def _on_ambient_decoded(self, samples):
+        self._engine_has_ambient = self._ensure_sound_engine().set_ambient_samples(samples)
+        # The break may have ended (or been muted) while decoding
+        if self._break_audible():
+            self._play_break_loop()
+
+    def _ensure_player(self):
+        """Break Interval (Waves) fallback: QMediaPlayer for a compressed loop."""
+        if self.player is None:
+            waves_path = self._asset_path(self.BREAK_FILE)
+            if waves_path is None:
+                return None
+            self.player = QMediaPlayer()
+            self.audio_output = QAudioOutput()
+            self.player.setAudioOutput(self.audio_output)
+            self.player.setSource(QUrl.fromLocalFile(waves_path))
+            self.audio_output.setVolume(self.break_volume)
+            self.audio_output.setMuted(self.is_muted)
+            self.player.setLoops(QMediaPlayer.Infinite) # Continuous loop
+            # Listen for media player errors
+            self.player.errorOccurred.connect(self._on_player_error)
+            self._ensure_device_watcher()
+        return self.player
+
+    def _ensure_device_watcher(self):
+        """Listen for system audio device changes (once any output exists)."""
+        if self.media_devices is None:
+            self.media_devices = QMediaDevices(self)
+            self.media_devices.audioOutputsChanged.connect(self._on_audio_outputs_changed)
 
     def _on_player_error(self, error, error_string):
         """Handle media player errors."""
@@ -50,69 +120,101 @@ class AudioManager(QObject):
         """Handle changes in available audio outputs."""
         print("AudioManager: Audio outputs changed. Checking device validity...")
         # If current device is null or invalid, try to reset to default
-        if self.audio_output.device().isNull():
+        player_lost = self.audio_output is not None and self.audio_output.device().isNull()
+        if player_lost or self._engine_device_stale():
              self._recover_audio_state()
 
+    def _engine_device_stale(self):
+        """True if the engine's stream is open on a device that is no longer the default."""
+        if self.sound_engine is None or self.sound_engine.device is None:
+            return False
+        return self.sound_engine.device != QMediaDevices.defaultAudioOutput()
+
     def _recover_audio_state(self):
         """Attempt to recover audio state by resetting to default device."""
         print("AudioManager: Attempting to recover audio state...")
         
-        # 1. Reset QAudioOutput to default device
+        # 1. Reset outputs that exist to the default device
         default_device = QMediaDevices.defaultAudioOutput()
         if not default_device.isNull():
-            self.audio_output.setDevice(default_device)
-            self.tick_effect.setAudioDevice(default_device)
+            if self.audio_output is not None:
+                self.audio_output.setDevice(default_device)
+            if self.sound_engine is not None:
+                self.sound_engine.set_device(default_device)
             print(f"AudioManager: Reset to default device: {default_device.description()}")
             
         # 2. If we were supposed to be playing/looping, ensure we are
         # Validating player state might be tricky if it thinks it's stopped due to error
-        # For the break sound (waves), if we are in a state where it SHOULD be playing, restart it.
-        # But we don't strictly know if it *should* be playing currently without state from outside.
-        # However, if the player has source and is not playing, and we just fixed the device...
-        # A safer bet implies we might need the main controller to tell us 'resume'
-        # BUT, for now, let's just ensure volume/mute state is re-applied
-        
-        self.audio_output.setMuted(self.is_muted)
+        # For now, let's just ensure volume/mute state is re-applied
+        if self.audio_output is not None:
+            self.audio_output.setMuted(self.is_muted)
 
+    def _break_audible(self):
+        return self._break_active and not self.is_muted and self.break_volume > 0
 
     def toggle_mute(self, is_muted):
         """Toggle mute state."""
         self.is_muted = is_muted
         
-        # If we are currently playing the loop and get muted, pause/stop it?
-        # OR just rely on logic next time checks happen.
-        # Actually, if we are playing break sound and mute is hit, we should silence it immediately.
-        # But QSoundEffect/QAudioOutput mute is easiest.
-        
-
-        self.audio_output.setMuted(is_muted)
+        if self.audio_output is not None:
+            self.audio_output.setMuted(is_muted)
+        if self.sound_engine is not None:
+            self.sound_engine.set_muted(is_muted)
+        # Unmuted mid-break: the player may not have been built yet
+        if self._break_audible():
+            self._play_break_loop()
 
     def play_tick(self):
         """Play the work tick sound once."""
-        if self.is_muted:
+        if self.is_muted or self.work_volume <= 0:
             return
             
-        if self.tick_effect.status() == QSoundEffect.Ready:
-            self.tick_effect.play()
+        if self.TICK_FILE in self._unavailable:
+            return
+        self._ensure_sound_engine().play_tick()
 
     def start_break_sound(self):
         """Start the continuous break sound."""
-        # Even if muted, we might 'start' it so it's playing but silent?
-        # Or just not play. Let's rely on setMuted() above which handles the output silence.
-        if self.player.playbackState() != QMediaPlayer.PlayingState:
-            self.player.play()
+        self._break_active = True
+        # Muted or silent: don't build the player until the break becomes audible
+        if self._break_audible():
+            self._play_break_loop()
+
+    def _play_break_loop(self):
+        ambient_path = self._asset_path(self.BREAK_WAV_FILE)
+        if ambient_path is not None and self._engine_has_ambient is not False:
+            if self._engine_has_ambient:
+                self._ensure_sound_engine().start_loop()
+            else:
+                # First audible break: the loop starts once the decoder is done
+                self._load_ambient(ambient_path)
+            return
+        player = self._ensure_player()
+        if player is not None and player.playbackState() != QMediaPlayer.PlayingState:
+            player.play()
 
     def stop_break_sound(self):
         """Stop the break sound."""
-        if self.player.playbackState() == QMediaPlayer.PlayingState:
+        self._break_active = False
+        if self.sound_engine is not None:
+            self.sound_engine.stop_loop()
+        if self.player is not None and self.player.playbackState() == QMediaPlayer.PlayingState:
             self.player.stop()
 
     def set_work_volume(self, volume_0_100):
         """Set volume for tick (0-100)."""
-        # QSoundEffect volume is 0.0 to 1.0
-        self.tick_effect.setVolume(volume_0_100 / 100.0)
+        # Engine volume is 0.0 to 1.0
+        self.work_volume = volume_0_100 / 100.0
+        if self.sound_engine is not None:
+            self.sound_engine.set_tick_volume(self.work_volume)
 
     def set_break_volume(self, volume_0_100):
         """Set volume for waves (0-100)."""
         # QAudioOutput setVolume is 0.0 to 1.0
-        self.audio_output.setVolume(volume_0_100 / 100.0)
+        self.break_volume = volume_0_100 / 100.0
+        if self.audio_output is not None:
+            self.audio_output.setVolume(self.break_volume)
+        if self.sound_engine is not None:
+            self.sound_engine.set_ambient_volume(self.break_volume)
+        if self._break_audible():
+            self._play_break_loop()
@@ -0,0 +1,92 @@
+import math
+import time
+from PySide6.QtCore import QTimer, Qt
+
+class QtScheduler:
+    """
+    Real-time scheduler for TimerEngine: time.monotonic() plus one single-shot QTimer.
+    A scheduler holds at most one pending wake-up; arming again replaces it.
+    """
+    def __init__(self):
+        self._callback = None
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+    def now(self):
+        return time.monotonic()
+
+    def set_callback(self, callback):
+        self._callback = callback
+
+    def arm(self, delay, coarse=False):
+        """
+        Wake up in `delay` seconds. coarse=True lets the OS batch the wake-up (power saving);
+        it may then fire up to half a second early or late.
+        """
+        delay = max(0.0, delay)
+        if not coarse:
+            timer_type = Qt.PreciseTimer
+        elif delay < 1.0:
+            # VeryCoarseTimer rounds to whole seconds: a shorter delay would fire at once
+            timer_type = Qt.CoarseTimer
+        else:
+            timer_type = Qt.VeryCoarseTimer
+        self._timer.setTimerType(timer_type)
+        self._timer.start(int(math.ceil(delay * 1000)))
+
+    def cancel(self):
+        self._timer.stop()
+
+    def _fire(self):
+        if self._callback:
+            self._callback()
+
+
+class VirtualScheduler:
+    """
+    Virtual-time scheduler for tests, benchmarks and soak runs.
+    Time only moves when advance() is called; due wake-ups fire immediately and
+    in order, so hours of timer activity run in milliseconds with the same
+    signal sequence as real time.
+    """
+    def __init__(self, start=0.0, latency=0.0, coarse_rounding=False):
+        self._now = float(start)
+        # Every wake-up fires this many seconds late (simulates a loaded machine)
+        self.latency = latency
+        # Coarse wake-ups round to whole seconds, like Qt.VeryCoarseTimer
+        self.coarse_rounding = coarse_rounding
+        self._due = None
+        self._callback = None
+        self.wakeups = 0
+
+    def now(self):
+        return self._now
+
+    def set_callback(self, callback):
+        self._callback = callback
+
+    def arm(self, delay, coarse=False):
+        delay = max(0.0, delay)
+        if coarse and self.coarse_rounding:
+            delay = float(round(delay))
+        self._due = self._now + delay + self.latency
+
+    def cancel(self):
+        self._due = None
+
+    def advance(self, seconds):
+        """Moves virtual time forward, firing every wake-up that falls inside the window."""
+        target = self._now + seconds
+        while self._due is not None and self._due <= target:
+            # A wake-up overdue after jump() fires now, like a QTimer after a stall
+            self._now = max(self._now, self._due)
+            self._due = None
+            self.wakeups += 1
+            if self._callback:
+                self._callback()
+        self._now = target
+
+    def jump(self, seconds):
+        """Moves time forward WITHOUT firing wake-ups on the way (simulates a stall or sleep)."""
+        self._now += seconds
@@ -0,0 +1,85 @@
+from bisect import bisect_right
+from collections import namedtuple
+
+# One period of the schedule.
+# state: "work" or "break" (what the engine reports), kind: finer label such as "long_break",
+# start: offset (seconds) from the beginning of the cycle, duration: seconds.
+Slot = namedtuple("Slot", ["state", "kind", "start", "duration"])
+
+
+class Schedule:
+    """
+    A repeating timer schedule compiled once into a timeline of slots.
+    Slots are addressed by an absolute index that keeps counting across
+    repetitions (index len(schedule) is the first slot of the second cycle),
+    and positions are seconds since the start of the first cycle.
+    Looking up the slot for a position is a binary search over the slot starts.
+    """
+    def __init__(self, periods):
+        """
+        periods: iterable of (state, seconds) or (state, seconds, kind).
+        Durations are clamped to at least one second.
+        """
+        self.slots = []
+        self._starts = []
+        self._work_before = [0] # Number of work slots before index i
+        offset = 0
+        for period in periods:
+            state, seconds = period[0], period[1]
+            kind = period[2] if len(period) > 2 else state
+            if state not in ("work", "break"):
+                raise ValueError(f"Unknown schedule state: {state}")
+            duration = max(1, int(seconds))
+            self.slots.append(Slot(state, kind, offset, duration))
+            self._starts.append(offset)
+            self._work_before.append(self._work_before[-1] + (state == "work"))
+            offset += duration
+        if not self.slots:
+            raise ValueError("A schedule needs at least one slot")
+        self.cycle_seconds = offset
+        self.work_per_cycle = self._work_before[-1]
+
+    @classmethod
+    def standard(cls, work_minutes=25, break_minutes=5, long_break_minutes=15, cycles_before_long_break=0):
+        """
+        Classic pomodoro: work/break pairs, with the break after every
+        `cycles_before_long_break`-th work period replaced by a long one
+        (0 disables long breaks).
+        """
+        work, short = work_minutes * 60, break_minutes * 60
+        if cycles_before_long_break <= 0:
+            return cls([("work", work), ("break", short)])
+
+        periods = []
+        for _ in range(cycles_before_long_break - 1):
+            periods += [("work", work), ("break", short)]
+        periods += [("work", work), ("break", long_break_minutes * 60, "long_break")]
+        return cls(periods)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def slot(self, index):
+        """The slot at an absolute index (wraps around the cycle)."""
+        return self.slots[index % len(self.slots)]
+
+    def start_of(self, index):
+        """Position at which the slot with this absolute index begins."""
+        cycles, i = divmod(index, len(self.slots))
+        return cycles * self.cycle_seconds + self._starts[i]
+
+    def end_of(self, index):
+        return self.start_of(index + 1)
+
+    def index_at(self, position):
+        """Absolute index of the slot containing `position` (binary search)."""
+        cycles, offset = divmod(max(0, position), self.cycle_seconds)
+        return int(cycles) * len(self.slots) + bisect_right(self._starts, offset) - 1
+
+    def work_slots_between(self, first, last):
+        """Number of work slots with an absolute index in [first, last)."""
+        return self._work_count(last) - self._work_count(first)
+
+    def _work_count(self, index):
+        cycles, i = divmod(index, len(self.slots))
+        return cycles * self.work_per_cycle + self._work_before[i]
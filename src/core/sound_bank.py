@@ -0,0 +1,243 @@
+import os
+import sys
+import wave
+from array import array
+from itertools import repeat
+from math import gcd
+from operator import add, floordiv
+
+# Every sound is decoded once into this format; the mixer output uses it too.
+SAMPLE_RATE = 44100
+SAMPLE_BYTES = 2 # signed 16-bit, mono
+INT16_MIN, INT16_MAX = -32768, 32767
+
+
+def decode_wav(path, sample_rate=SAMPLE_RATE):
+    """
+    Decodes a PCM WAV file into mono signed 16-bit samples at `sample_rate`.
+    8/16/32-bit input is converted, stereo is downmixed, other rates are
+    resampled (nearest sample; fine for short effects and ambience).
+    Conversions work on whole buffers (byte/array slicing and C-level map)
+    rather than per-sample Python generators.
+    """
+    with wave.open(path, 'rb') as w:
+        channels, width, rate = w.getnchannels(), w.getsampwidth(), w.getframerate()
+        raw = w.readframes(w.getnframes())
+
+    if width == 2:
+        pcm = raw
+    elif width == 1:
+        # 8-bit WAV is unsigned: flip the sign bit and use it as the high byte
+        pcm = bytearray(len(raw) * 2)
+        pcm[1::2] = raw.translate(_UNSIGNED_TO_SIGNED)
+    elif width == 4:
+        # Keep the high 16 bits of each little-endian 32-bit sample
+        count = len(raw) // 4
+        pcm = bytearray(count * 2)
+        pcm[0::2] = raw[2:count * 4:4]
+        pcm[1::2] = raw[3:count * 4:4]
+    else:
+        raise ValueError(f"Unsupported sample width: {width * 8} bits")
+
+    if len(pcm) % 2:
+        pcm = pcm[:-1]
+    samples = array('h')
+    samples.frombytes(pcm)
+    if sys.byteorder == 'big':
+        # WAV data is little-endian
+        samples.byteswap()
+
+    if channels > 1:
+        # Average the interleaved channels (floor division, like // per frame)
+        frames = len(samples) // channels
+        sums = samples[0:frames * channels:channels]
+        for channel in range(1, channels):
+            sums = map(add, sums, samples[channel:frames * channels:channels])
+        samples = array('h', map(floordiv, sums, repeat(channels)))
+
+    if rate != sample_rate:
+        samples = _resample(samples, rate, sample_rate)
+    return samples
+
+
+# 8-bit unsigned -> signed high byte
+_UNSIGNED_TO_SIGNED = bytes((b + 128) % 256 for b in range(256))
+
+
+def _resample(samples, rate, sample_rate):
+    """
+    Nearest-sample resampling: output sample i is input sample i * rate // sample_rate.
+    The pattern repeats every `outputs` samples (e.g. 147 outputs per 160 inputs for
+    48000 -> 44100), so output phase k is one strided slice of the input.
+    """
+    count = len(samples) * sample_rate // rate
+    common = gcd(rate, sample_rate)
+    outputs, inputs = sample_rate // common, rate // common
+    out = array('h', bytes(count * SAMPLE_BYTES))
+    for k in range(min(outputs, count)):
+        length = len(range(k, count, outputs))
+        first = k * inputs // outputs
+        out[k::outputs] = samples[first:first + length * inputs:inputs]
+    return out
+
+
+def scale(samples, volume):
+    """Returns a copy of `samples` multiplied by `volume` (0.0 - 1.0)."""
+    if volume >= 1.0:
+        return array('h', samples)
+    if volume <= 0.0:
+        return array('h', bytes(len(samples) * SAMPLE_BYTES))
+    # Fixed-point multiply keeps this to integer ops
+    factor = int(volume * 65536)
+    return array('h', ((s * factor) >> 16 for s in samples))
+
+
+class SoundBank:
+    """Sounds decoded once into memory, by name. Missing/unreadable files are remembered as None."""
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._sounds = {}
+
+    def load(self, name, path):
+        if name not in self._sounds:
+            try:
+                self._sounds[name] = decode_wav(path, self.sample_rate) if os.path.exists(path) else None
+            except (wave.Error, ValueError, EOFError, OSError) as e:
+                print(f"SoundBank: Could not decode {path}: {e}")
+                self._sounds[name] = None
+        return self._sounds[name]
+
+    def get(self, name):
+        return self._sounds.get(name)
+
+    def __contains__(self, name):
+        return self._sounds.get(name) is not None
+
+
+class _Channel:
+    """Per-channel volume and mute. Volume is applied to pre-scaled copies, never per mix."""
+    def __init__(self, samples, volume=1.0):
+        self.samples = samples
+        self.volume = volume
+        self.muted = False
+
+    @property
+    def gain(self):
+        return 0.0 if self.muted else self.volume
+
+
+class OneShotChannel(_Channel):
+    """Short effect (the tick); each trigger starts a voice that plays once."""
+    def __init__(self, samples, volume=1.0):
+        super().__init__(samples, volume)
+        self._voices = [] # read positions
+        self._scaled = None
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self._scaled = None
+
+    def trigger(self):
+        if self.gain > 0:
+            self._voices.append(0)
+
+    @property
+    def active(self):
+        return bool(self._voices)
+
+    def voices(self, count):
+        """Yields (offset in output, samples) for the next `count` frames and advances."""
+        if self._scaled is None:
+            self._scaled = scale(self.samples, self.volume)
+        remaining = []
+        for pos in self._voices:
+            chunk = self._scaled[pos:pos + count]
+            yield chunk
+            if pos + count < len(self._scaled):
+                remaining.append(pos + count)
+        self._voices = remaining
+
+    def stop(self):
+        self._voices = []
+
+
+class LoopChannel(_Channel):
+    """Ambient loop. The scaled copy is built chunk by chunk as playback reaches it."""
+    CHUNK = 4096
+
+    def __init__(self, samples, volume=1.0):
+        super().__init__(samples, volume)
+        self.playing = False
+        self._pos = 0
+        self._chunks = {}
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self._chunks = {}
+
+    def _chunk(self, index):
+        chunk = self._chunks.get(index)
+        if chunk is None:
+            start = index * self.CHUNK
+            chunk = scale(self.samples[start:start + self.CHUNK], self.volume)
+            self._chunks[index] = chunk
+        return chunk
+
+    def read(self, count):
+        """Next `count` frames of the loop, wrapping around."""
+        out = array('h')
+        length = len(self.samples)
+        while len(out) < count:
+            index, offset = divmod(self._pos, self.CHUNK)
+            chunk = self._chunk(index)
+            take = min(count - len(out), len(chunk) - offset)
+            out.extend(chunk[offset:offset + take])
+            self._pos = (self._pos + take) % length
+        return out
+
+
+class Mixer:
+    """
+    Mixes the tick and the ambient loop into one mono 16-bit stream.
+    The common cases are copies: silence, the loop alone, or ticks over
+    silence. Samples are only summed (and clipped) where sounds overlap.
+    """
+    def __init__(self):
+        self.tick = None
+        self.ambient = None
+
+    def set_tick(self, samples, volume=1.0):
+        self.tick = OneShotChannel(samples, volume) if samples is not None else None
+
+    def set_ambient(self, samples, volume=1.0):
+        self.ambient = LoopChannel(samples, volume) if samples is not None else None
+
+    @property
+    def active(self):
+        """True while there is anything to play (otherwise the output can be suspended)."""
+        return bool((self.tick and self.tick.active)
+                    or (self.ambient and self.ambient.playing and self.ambient.gain > 0))
+
+    def mix(self, count):
+        """Returns `count` frames of mixed audio as bytes."""
+        if self.ambient and self.ambient.playing and self.ambient.gain > 0:
+            out = self.ambient.read(count)
+        else:
+            out = None
+
+        if self.tick and self.tick.active:
+            for voice in self.tick.voices(count):
+                if out is None:
+                    # Tick over silence: copy, then pad
+                    out = array('h', voice)
+                    out.extend(array('h', bytes((count - len(voice)) * SAMPLE_BYTES)))
+                else:
+                    for i, s in enumerate(voice):
+                        mixed = out[i] + s
+                        out[i] = INT16_MAX if mixed > INT16_MAX else INT16_MIN if mixed < INT16_MIN else mixed
+
+        if out is None:
+            return bytes(count * SAMPLE_BYTES)
+        if sys.byteorder == 'big':
+            out.byteswap()
+        return out.tobytes()
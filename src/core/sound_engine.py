@@ -0,0 +1,166 @@
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+from core.sound_bank import SoundBank, Mixer, SAMPLE_RATE, SAMPLE_BYTES
+
+class SoundEngine(QObject):
+    """
+    Plays pre-decoded sounds through one QAudioSink stream.
+    The tick and the ambient loop are decoded once (SoundBank) and mixed in
+    software (Mixer); volume and mute are applied to pre-scaled buffers, so
+    they never reopen the device. A pump timer tops the sink's small buffer
+    up, which bounds the tick latency at about BUFFER_MS. After a stretch of
+    silence the sink is suspended and the pump stops; the device handle stays open.
+    """
+    PUMP_INTERVAL_MS = 20
+    BUFFER_MS = 80
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bank = SoundBank()
+        self.mixer = Mixer()
+        self.tick_volume = 1.0
+        self.ambient_volume = 1.0
+        self.muted = False
+
+        self._format = QAudioFormat()
+        self._format.setSampleRate(SAMPLE_RATE)
+        self._format.setChannelCount(1)
+        self._format.setSampleFormat(QAudioFormat.Int16)
+
+        self._sink = None
+        self._io = None
+        self.device = None # QAudioDevice the stream is open on
+        self._suspended = False
+        self._idle_bytes = 0 # Silence written since the mixer went idle
+
+        self._pump = QTimer(self)
+        self._pump.setTimerType(Qt.PreciseTimer)
+        self._pump.setInterval(self.PUMP_INTERVAL_MS)
+        self._pump.timeout.connect(self._fill)
+
+    # --- Sounds ---
+
+    def load_tick(self, path):
+        """Decodes the tick sound; returns False if it is missing or unreadable."""
+        self.mixer.set_tick(self.bank.load("tick", path), self.tick_volume)
+        self._apply_mute()
+        return self.mixer.tick is not None
+
+    def load_ambient(self, path):
+        """Decodes the ambient loop; returns False if it is missing or unreadable."""
+        return self.set_ambient_samples(self.bank.load("ambient", path))
+
+    def set_ambient_samples(self, samples):
+        """Installs an ambient loop decoded elsewhere (e.g. on a worker thread); None: unavailable."""
+        self.mixer.set_ambient(samples, self.ambient_volume)
+        self._apply_mute()
+        return self.mixer.ambient is not None
+
+    def play_tick(self):
+        if self.mixer.tick is None:
+            return
+        self.mixer.tick.trigger()
+        self._wake()
+
+    def start_loop(self):
+        if self.mixer.ambient is None:
+            return
+        self.mixer.ambient.playing = True
+        self._wake()
+
+    def stop_loop(self):
+        if self.mixer.ambient is not None:
+            self.mixer.ambient.playing = False
+
+    @property
+    def loop_playing(self):
+        return self.mixer.ambient is not None and self.mixer.ambient.playing
+
+    # --- Per-channel volume / mute (no device reopen) ---
+
+    def set_tick_volume(self, volume):
+        self.tick_volume = volume
+        if self.mixer.tick is not None:
+            self.mixer.tick.set_volume(volume)
+
+    def set_ambient_volume(self, volume):
+        self.ambient_volume = volume
+        if self.mixer.ambient is not None:
+            self.mixer.ambient.set_volume(volume)
+        if self.loop_playing:
+            self._wake()
+
+    def set_muted(self, muted):
+        self.muted = muted
+        self._apply_mute()
+        if muted and self.mixer.tick is not None:
+            self.mixer.tick.stop()
+        elif self.loop_playing:
+            self._wake()
+
+    def _apply_mute(self):
+        for channel in (self.mixer.tick, self.mixer.ambient):
+            if channel is not None:
+                channel.muted = self.muted
+
+    # --- Output stream ---
+
+    def set_device(self, device):
+        """Moves the stream to another output device (e.g. after the default one changed)."""
+        if self._sink is None:
+            return
+        self._close()
+        self._open(device)
+        self._wake()
+
+    def _open(self, device=None):
+        if device is None:
+            device = QMediaDevices.defaultAudioOutput()
+        self.device = device
+        self._sink = QAudioSink(device, self._format, self)
+        self._sink.setBufferSize(SAMPLE_RATE * SAMPLE_BYTES * self.BUFFER_MS // 1000)
+        self._io = self._sink.start() # Push mode: we write into the returned QIODevice
+        self._suspended = False
+
+    def _close(self):
+        self._pump.stop()
+        if self._sink is not None:
+            self._sink.stop()
+            self._sink.deleteLater()
+        self._sink = None
+        self._io = None
+        self.device = None
+
+    def _wake(self):
+        if not self.mixer.active:
+            return
+        if self._sink is None:
+            self._open()
+        elif self._suspended:
+            self._sink.resume()
+            self._suspended = False
+        self._idle_bytes = 0
+        if not self._pump.isActive():
+            self._pump.start()
+        self._fill()
+
+    def _fill(self):
+        if self._io is None:
+            return
+        free = self._sink.bytesFree()
+        free -= free % SAMPLE_BYTES
+        if free > 0:
+            self._io.write(self.mixer.mix(free // SAMPLE_BYTES))
+
+        if self.mixer.active:
+            self._idle_bytes = 0
+            return
+        # Nothing left to play: once the buffered tail has played out, go quiet
+        self._idle_bytes += free
+        if self._idle_bytes >= self._sink.bufferSize():
+            self._pump.stop()
+            self._sink.suspend()
+            self._suspended = True
+
+    def close(self):
+        self._close()
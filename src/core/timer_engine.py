@@ -1,35 +1,83 @@
-from PySide6.QtCore import QObject, QTimer, Signal
+import math
+from PySide6.QtCore import QObject, Signal
+from core.clock import QtScheduler
+from core.schedule import Schedule
 
 class TimerEngine(QObject):
     # Signals
     tick = Signal(str) # Emits current time string "MM" or "MM:SS" (conceptually we only show MM but engine knows all)
     tick_progress = Signal(float) # Emits 0.0 to 1.0 progress (0=start, 1=end)
-    state_changed = Signal(str) # "work" or "break"
+    # Cheaper alternatives to tick/tick_progress, which both fire every second
+    heartbeat = Signal(int) # Every second: remaining seconds (for per-second audio)
+    display_changed = Signal(str) # Only when the displayed minute text changes
+    progress_changed = Signal(float) # Only when progress crosses a 1/progress_resolution step
+    state_changed = Signal(str) # "work" or "break" (a long break is a "break"; see current_kind)
     completed = Signal() # Timer finished a cycle
     work_completed = Signal() # Specifically when WORK session ends
+    running_changed = Signal(bool) # Started (True) or paused/stopped (False)
+    schedule_changed = Signal() # Durations/schedule replaced (the current period restarts if its duration changed)
+    timer_reset = Signal() # reset_timer() put us back at the start of the schedule
 
-    def __init__(self, work_minutes=25, break_minutes=5):
+    # A wake-up this close to a second boundary counts as having reached it
+    BOUNDARY_TOLERANCE = 0.001
+    # Coarse timers may round to whole seconds: aim this much early, then finish precisely
+    COARSE_SLACK = 1.0
+
+    def __init__(self, work_minutes=25, break_minutes=5, progress_resolution=100, scheduler=None,
+                 schedule=None):
         super().__init__()
         
+        self.progress_resolution = progress_resolution
+        self._last_display = None
+        self._last_progress = None
+        
         self.work_seconds = work_minutes * 60
         self.break_seconds = break_minutes * 60
         
-        self.current_state = "work" # or "break"
-        self.remaining_seconds = self.work_seconds
+        # Periods come from a precompiled timeline; _slot is the absolute slot index
+        self.schedule = schedule or Schedule.standard(work_minutes, break_minutes)
+        self._slot = 0
+        self.current_state = self.schedule.slot(0).state # "work" or "break"
+        self.remaining_seconds = self._current_duration()
         
-        self.timer = QTimer()
-        self.timer.setInterval(1000) # 1 second
-        self.timer.timeout.connect(self._on_tick)
+        # Remaining time is derived from an absolute monotonic deadline, so late
+        # or coalesced timeouts never make the period run long.
+        # The scheduler (real QTimer or virtual) supplies the clock and the wake-ups.
+        self.scheduler = scheduler or QtScheduler()
+        self.scheduler.set_callback(self._on_tick)
+        self._clock = self.scheduler.now
+        self._deadline = None # Monotonic time the current period ends (while running)
+        self._paused_remaining = float(self.remaining_seconds) # Exact remaining time while stopped
+        self._expected_wake = None
         
         self.is_running = False
+        # Power saver: wake only at visible boundaries using a coarse timer
+        self.power_saver = False
+        self.reset_drift_stats()
+        self.reset_wakeup_stats()
 
     def start(self):
+        if self.is_running:
+            return
         self.is_running = True
-        self.timer.start()
+        self._deadline = self._clock() + self._paused_remaining
+        if self._last_display is None:
+            # Publish the initial display right away; in power saver mode the
+            # first wake-up can be up to a minute out
+            self._emit_tick(force=True, beat=False)
+        self._schedule_next()
+        self.running_changed.emit(True)
 
     def stop(self):
+        was_running = self.is_running
+        if self.is_running:
+            self._paused_remaining = max(0.0, self._deadline - self._clock())
         self.is_running = False
-        self.timer.stop()
+        self._deadline = None
+        self._expected_wake = None
+        self.scheduler.cancel()
+        if was_running:
+            self.running_changed.emit(False)
         
     def toggle_pause(self):
         if self.is_running:
@@ -37,61 +85,315 @@ class TimerEngine(QObject):
         else:
             self.start()
 
-    def update_durations(self, work_mins, break_mins):
-        """Update durations and restart current current state with new time."""
+    def _current_duration(self):
+        return self.schedule.slot(self._slot).duration
+
+    @property
+    def current_kind(self):
+        """Label of the current slot, e.g. "work", "break" or "long_break"."""
+        return self.schedule.slot(self._slot).kind
+
+    @property
+    def current_slot(self):
+        """Index of the current slot within one cycle of the schedule."""
+        return self._slot % len(self.schedule)
+
+    def _enter_slot(self, index):
+        self._slot = index
+        self.current_state = self.schedule.slot(index).state
+
+    def position(self):
+        """Seconds since the start of the schedule's first cycle (exact, even mid-second)."""
+        if self.is_running:
+            remaining = self._deadline - self._clock()
+        else:
+            remaining = self._paused_remaining
+        return self.schedule.end_of(self._slot) - remaining
+
+    def _restart_period(self):
+        """Starts the current state over with its full duration."""
+        duration = self._current_duration()
+        self.remaining_seconds = duration
+        self._paused_remaining = float(duration)
+        if self.is_running:
+            self._deadline = self._clock() + duration
+            self._schedule_next()
+
+    def update_durations(self, work_mins, break_mins, long_break_mins=15, cycles_before_long_break=0):
+        """Update durations; the current period restarts only if its own duration changed."""
         self.work_seconds = work_mins * 60
         self.break_seconds = break_mins * 60
+        self.set_schedule(Schedule.standard(work_mins, break_mins, long_break_mins, cycles_before_long_break))
+
+    def set_schedule(self, schedule):
+        """
+        Swaps in a new schedule and restarts the current period with its new duration.
+        We stay in the same state: if the slot at our position in the new timeline
+        has the other state, move to the next slot that matches. If the period keeps
+        its duration (e.g. only the long break changed), its deadline is kept too.
+        """
+        old_duration = self._current_duration()
+        self.schedule = schedule
+        index = self._slot % len(schedule)
+        for offset in range(len(schedule)):
+            if schedule.slot(index + offset).state == self.current_state:
+                index += offset
+                break
+        self._enter_slot(index)
         
         # Reset current state to new duration immediately
-        if self.current_state == "work":
-            self.remaining_seconds = self.work_seconds
+        if self._current_duration() != old_duration:
+            self._restart_period()
+        self._emit_tick(force=True)
+        self.schedule_changed.emit()
+
+    def skip(self):
+        """Ends the current period early and starts the next slot (no work_completed)."""
+        self.seek(self.schedule.end_of(self._slot))
+
+    def seek(self, position):
+        """
+        Jumps to a schedule position (seconds since the start of the first cycle).
+        The slot is found by binary search, so any jump costs O(log n).
+        """
+        index = self.schedule.index_at(position)
+        state_changed = index != self._slot
+        self._enter_slot(index)
+        
+        remaining = self.schedule.end_of(index) - max(0, position)
+        self._paused_remaining = float(remaining)
+        self.remaining_seconds = math.ceil(remaining - self.BOUNDARY_TOLERANCE)
+        if self.is_running:
+            self._deadline = self._clock() + remaining
+            self._schedule_next()
+        
+        if state_changed:
+            self.state_changed.emit(self.current_state)
+        self._emit_tick(force=True)
+
+    def snapshot(self):
+        """
+        Minimal description of the session (JSON-serializable) for crash recovery:
+        the slot within the cycle, the exact remaining time, whether we were running,
+        and the schedule it refers to.
+        """
+        if self.is_running:
+            remaining = max(0.0, self._deadline - self._clock())
         else:
-            self.remaining_seconds = self.break_seconds
-            
-        self._emit_tick()
+            remaining = self._paused_remaining
+        return {
+            "slot": self.current_slot,
+            "state": self.current_state,
+            "remaining": remaining,
+            "running": self.is_running,
+            "schedule": [[slot.state, slot.duration, slot.kind] for slot in self.schedule.slots],
+        }
+
+    def restore(self, snapshot, elapsed=0.0):
+        """
+        Resumes a session from snapshot(). `elapsed` is the time that passed since
+        the snapshot was taken; for a running session it is replayed through the
+        normal catch-up path (so work_completed/state_changed fire as if we had been
+        asleep). Returns False if the snapshot doesn't match the current schedule.
+        """
+        try:
+            saved_schedule = [tuple(slot) for slot in snapshot["schedule"]]
+            slot = int(snapshot["slot"])
+            remaining = float(snapshot["remaining"])
+            running = bool(snapshot["running"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        current_schedule = [(s.state, s.duration, s.kind) for s in self.schedule.slots]
+        if saved_schedule != current_schedule or not 0 <= slot < len(self.schedule):
+            return False
+        
+        self.stop()
+        remaining = min(max(0.0, remaining), self.schedule.slot(slot).duration)
+        self.seek(self.schedule.end_of(slot) - remaining)
+        if running:
+            # Back-date the deadline; the first wake-up catches up on the downtime
+            self._paused_remaining = remaining - max(0.0, elapsed)
+            self.start()
+        return True
+
+    def set_progress_resolution(self, steps):
+        """Number of progress_changed steps per period (e.g. 6 for the orange segments)."""
+        self.progress_resolution = max(1, int(steps))
+        self._last_progress = None
         
     def reset_timer(self):
         self.stop()
-        self.current_state = "work"
-        self.remaining_seconds = self.work_seconds
-        self._emit_tick()
+        self._enter_slot(0)
+        self._restart_period()
+        self._emit_tick(force=True)
+        self.timer_reset.emit()
         self.state_changed.emit(self.current_state)
 
+    def set_power_saver(self, enabled):
+        """
+        Power saver mode (for when the tick sound is muted/disabled): instead of
+        waking every second, arm one very coarse timer for the next visible change
+        (minute text, progress step or state switch). heartbeat then only fires
+        on those wake-ups; display/progress/state signals are unaffected.
+        """
+        if self.power_saver == enabled:
+            return
+        self.power_saver = enabled
+        if self.is_running:
+            self._schedule_next()
+
+    def _schedule_next(self):
+        """Arms the timer for the next moment something observable changes."""
+        remaining = self._deadline - self._clock()
+        shown = max(0, math.ceil(remaining - self.BOUNDARY_TOLERANCE))
+        
+        if self.power_saver:
+            delay = self._delay_to_visible_change(remaining, shown)
+        else:
+            # Next whole second
+            delay = max(0.0, remaining - (shown - 1)) if shown > 0 else 0.0
+        
+        # A sub-second coarse timer can fire at once, so only the long wait is coarse;
+        # the early wake-up lands here again and the final approach is precise
+        coarse = self.power_saver and delay >= 2 * self.COARSE_SLACK
+        if coarse:
+            delay -= self.COARSE_SLACK
+        
+        self._expected_wake = self._clock() + delay
+        self.scheduler.arm(delay, coarse=coarse)
+
+    def _delay_to_visible_change(self, remaining, shown):
+        """Seconds until the minute text, the progress step or the state changes."""
+        if shown <= 0:
+            return 0.0
+        
+        # Minute text (ceil minutes) changes when remaining drops to the previous multiple of 60
+        minute_target = (math.ceil(shown / 60) - 1) * 60
+        
+        # Progress step k changes once remaining seconds fall to ~total * (1 - (k+1)/resolution);
+        # nudge the estimate so it matches _quantized_progress exactly despite float rounding
+        total = self._current_duration()
+        current_step = self._quantized_progress(shown)
+        step = round(current_step * self.progress_resolution) + 1
+        progress_target = min(shown - 1, math.floor(total * (1.0 - step / self.progress_resolution)))
+        while progress_target > 0 and self._quantized_progress(progress_target) == current_step:
+            progress_target -= 1
+        
+        # State switch at 0
+        target = max(minute_target, progress_target, 0)
+        return max(0.0, remaining - target)
+
     def _on_tick(self):
-        if self.remaining_seconds > 0:
-            self.remaining_seconds -= 1
-            self._emit_tick()
+        if not self.is_running:
+            return
+        now = self._clock()
+        self.wakeups += 1
+        self._record_drift(now)
+        
+        remaining = self._deadline - now
+        if remaining <= self.BOUNDARY_TOLERANCE:
+            self._catch_up(now)
         else:
-            self._switch_state()
+            shown = math.ceil(remaining - self.BOUNDARY_TOLERANCE)
+            # An early wake-up may land just short of the boundary; don't tick twice
+            if shown != self.remaining_seconds:
+                self.remaining_seconds = shown
+                self._emit_tick()
+        self._schedule_next()
 
-    def _switch_state(self):
-        trigger_auto_start = True # Requirements imply continuous flow ("looping waves" etc)
+    def _catch_up(self, now):
+        """
+        Moves past every period whose deadline has passed (e.g. after sleep).
+        Missed seconds are skipped, not replayed: listeners get one work_completed
+        (if a work period ended) and one state_changed for the state we land in.
+        The landing slot is found by binary search on the timeline, however long the stall.
+        """
+        old = self._slot
+        end = self.schedule.end_of(old)
+        # Where on the timeline "now" is; the tolerance skips a slot we'd land on the end of
+        position = end + (now - self._deadline) + self.BOUNDARY_TOLERANCE
+        new = self.schedule.index_at(position)
+        work_finished = (self.current_state == "work"
+                         or self.schedule.work_slots_between(old + 1, new) > 0)
+        
+        # Chain from the old deadline, not from now, so no time is lost or gained
+        self._deadline += self.schedule.end_of(new) - end
+        self._enter_slot(new)
+        # Listeners of state_changed (e.g. the journal) must see the new period's time
+        self.remaining_seconds = math.ceil(self._deadline - now - self.BOUNDARY_TOLERANCE)
         
-        if self.current_state == "work":
+        self._switch_state(work_finished)
+        self._emit_tick(force=True)
+
+    def _switch_state(self, work_finished):
+        if work_finished:
             # Work finished -> Emit signal
             self.work_completed.emit()
-            
-            self.current_state = "break"
-            self.remaining_seconds = self.break_seconds
-        else:
-            self.current_state = "work"
-            self.remaining_seconds = self.work_seconds
-            
         self.state_changed.emit(self.current_state)
-        self._emit_tick()
-        
-        if not trigger_auto_start:
-            self.stop()
 
-    def _emit_tick(self):
+    # --- Wake-up Metrics ---
+
+    def reset_wakeup_stats(self):
+        self.wakeups = 0
+        self._wakeups_since = self._clock()
+
+    def wakeups_per_hour(self):
+        """Timer wake-ups per hour since the last reset (about 3600 normally, ~120 in power saver)."""
+        elapsed = self._clock() - self._wakeups_since
+        if elapsed <= 0:
+            return 0.0
+        return self.wakeups * 3600.0 / elapsed
+
+    # --- Drift Metrics ---
+
+    def reset_drift_stats(self):
+        self._drift_count = 0
+        self._drift_total_ms = 0.0
+        self.last_drift_ms = 0.0
+        self.max_drift_ms = 0.0
+
+    def _record_drift(self, now):
+        if self._expected_wake is None:
+            return
+        drift_ms = (now - self._expected_wake) * 1000.0
+        self.last_drift_ms = drift_ms
+        self.max_drift_ms = max(self.max_drift_ms, abs(drift_ms))
+        self._drift_count += 1
+        self._drift_total_ms += abs(drift_ms)
+
+    def drift_stats(self):
+        """
+        How late (ms) timeouts fired relative to the second boundary they targeted.
+        Lateness no longer accumulates into the countdown; this just shows timer accuracy.
+        """
+        return {
+            "samples": self._drift_count,
+            "last_ms": self.last_drift_ms,
+            "max_ms": self.max_drift_ms,
+            "mean_ms": self._drift_total_ms / self._drift_count if self._drift_count else 0.0,
+        }
+
+    def _progress(self, remaining_seconds):
+        """Calculate Progress (0.0 -> 1.0)"""
+        total = self._current_duration()
+        if total > 0:
+            return 1.0 - (remaining_seconds / total)
+        return 0.0
+
+    def _quantized_progress(self, remaining_seconds):
+        progress = self._progress(remaining_seconds)
+        return math.floor(progress * self.progress_resolution) / self.progress_resolution
+
+    def _emit_tick(self, force=False, beat=True):
         """Format logic: Minutes only.
         Rounded UP (Ceiling). 
         23:44 -> 24
         11:50 -> 12
         00:12 -> 01
         00:00 -> 00 (handled by check)
+        force: emit display/progress even if unchanged (after resets and state switches)
+        beat: also emit the per-second tick/heartbeat signals
         """
-        import math
         if self.remaining_seconds == 0:
             minutes = 0
         else:
@@ -101,12 +403,18 @@ class TimerEngine(QObject):
         if len(display_text) == 1:
             display_text = f"0{display_text}"
             
-        self.tick.emit(display_text)
+        if beat:
+            self.tick.emit(display_text)
+            self.heartbeat.emit(self.remaining_seconds)
         
-        # Calculate Progress (0.0 -> 1.0)
-        total = self.work_seconds if self.current_state == "work" else self.break_seconds
-        if total > 0:
-            progress = 1.0 - (self.remaining_seconds / total)
-        else:
-            progress = 0.0
-        self.tick_progress.emit(progress)
+        if force or display_text != self._last_display:
+            self._last_display = display_text
+            self.display_changed.emit(display_text)
+        
+        if beat:
+            self.tick_progress.emit(self._progress(self.remaining_seconds))
+        
+        quantized = self._quantized_progress(self.remaining_seconds)
+        if force or quantized != self._last_progress:
+            self._last_progress = quantized
+            self.progress_changed.emit(quantized)
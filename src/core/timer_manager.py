@@ -0,0 +1,152 @@
+import heapq
+import itertools
+from PySide6.QtCore import QObject, Signal
+from core.clock import QtScheduler
+from core.timer_engine import TimerEngine
+
+class HeapScheduler:
+    """
+    Multiplexes many timers onto one underlying scheduler (one OS timer).
+    Each timer gets a channel implementing the scheduler interface
+    (now/set_callback/arm/cancel). Pending deadlines sit in a min-heap and only
+    the earliest one is armed on the base scheduler. Cancelled or re-armed
+    entries are left in the heap and skipped when they surface (lazy deletion).
+    """
+    # Wake-ups are rounded to whole milliseconds; anything this close counts as due
+    DUE_TOLERANCE = 0.0005
+
+    def __init__(self, base=None):
+        self.base = base or QtScheduler()
+        self.base.set_callback(self._fire)
+        self._heap = [] # (due, seq, channel, generation, coarse)
+        self._seq = itertools.count()
+        self._dispatching = False
+        self._armed_due = None
+
+    def now(self):
+        return self.base.now()
+
+    def channel(self):
+        """A new scheduler endpoint for one timer."""
+        return _Channel(self)
+
+    def _push(self, channel, due, coarse):
+        heapq.heappush(self._heap, (due, next(self._seq), channel, channel.generation, coarse))
+        if not self._dispatching:
+            self._rearm()
+
+    def _cancelled(self):
+        if not self._dispatching:
+            self._rearm()
+
+    def _drop_stale(self):
+        while self._heap and self._heap[0][3] != self._heap[0][2].generation:
+            heapq.heappop(self._heap)
+
+    def _rearm(self):
+        """Arms the base timer for the earliest live deadline (or disarms it)."""
+        self._drop_stale()
+        if not self._heap:
+            self._armed_due = None
+            self.base.cancel()
+            return
+        due, _, _, _, coarse = self._heap[0]
+        if due == self._armed_due:
+            return
+        self._armed_due = due
+        self.base.arm(max(0.0, due - self.base.now()), coarse=coarse)
+
+    def _fire(self):
+        self._armed_due = None
+        self._dispatching = True
+        try:
+            # Callbacks re-arm their channels; newly due entries are picked up by the loop
+            while True:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > self.base.now() + self.DUE_TOLERANCE:
+                    break
+                _, _, channel, _, _ = heapq.heappop(self._heap)
+                channel.generation += 1
+                if channel.callback:
+                    channel.callback()
+        finally:
+            self._dispatching = False
+        self._rearm()
+
+    def __len__(self):
+        """Number of live pending deadlines."""
+        return sum(1 for entry in self._heap if entry[3] == entry[2].generation)
+
+
+class _Channel:
+    """One timer's view of a HeapScheduler: a scheduler with a single pending wake-up."""
+    def __init__(self, heap):
+        self._heap = heap
+        self.callback = None
+        self.generation = 0
+
+    def now(self):
+        return self._heap.now()
+
+    def set_callback(self, callback):
+        self.callback = callback
+
+    def arm(self, delay, coarse=False):
+        # Arming again replaces the pending wake-up, like a single-shot QTimer
+        self.generation += 1
+        self._heap._push(self, self._heap.now() + max(0.0, delay), coarse)
+
+    def cancel(self):
+        self.generation += 1
+        self._heap._cancelled()
+
+    def __lt__(self, other):
+        # Heap entries are unique by sequence number; never actually compared
+        return id(self) < id(other)
+
+
+class TimerManager(QObject):
+    """
+    Hosts several TimerEngines (e.g. a pomodoro plus meeting countdowns and a
+    stand-up reminder) on one HeapScheduler, so N timers cost one OS timer.
+    Every engine keeps its own signals; the first one added is the primary timer.
+    """
+    timer_added = Signal(str)
+    timer_removed = Signal(str)
+
+    def __init__(self, base_scheduler=None):
+        super().__init__()
+        self.scheduler = HeapScheduler(base_scheduler)
+        self._timers = {} # name -> TimerEngine (insertion ordered)
+
+    def add_timer(self, name, **engine_kwargs):
+        """Creates an engine driven by the shared scheduler. kwargs go to TimerEngine."""
+        if name in self._timers:
+            raise ValueError(f"Timer already exists: {name}")
+        engine = TimerEngine(scheduler=self.scheduler.channel(), **engine_kwargs)
+        self._timers[name] = engine
+        self.timer_added.emit(name)
+        return engine
+
+    def remove_timer(self, name):
+        engine = self._timers.pop(name, None)
+        if engine is None:
+            return
+        engine.stop()
+        self.timer_removed.emit(name)
+
+    def get(self, name):
+        return self._timers.get(name)
+
+    def names(self):
+        return list(self._timers)
+
+    @property
+    def primary(self):
+        return next(iter(self._timers.values()), None)
+
+    def __iter__(self):
+        return iter(self._timers.values())
+
+    def __len__(self):
+        return len(self._timers)
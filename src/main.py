@@ -1,16 +1,24 @@
 import sys
 import os
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QAction
+import time
+# Reference point for time-to-first-paint, taken before the heavy Qt imports
+STARTUP_T0 = time.perf_counter()
+from utils.startup_profiler import StartupProfiler
+StartupProfiler.start(STARTUP_T0) # No-op unless TOMODORANGE_PROFILE_STARTUP is set
+
+# Only what the floating widget needs to appear is imported up front. Dialogs,
+# windows and the QtMultimedia stack are imported when first used (see main()).
+from PySide6.QtWidgets import QApplication, QSystemTrayIcon
+from PySide6.QtCore import QTimer
 from ui.floating_widget import FloatingWidget
-from ui.settings_window import SettingsWindow
-from ui.log_entry_dialog import LogEntryDialog
 from ui.tray_manager import TrayIconManager
 from utils.startup_manager import StartupManager
-from core.timer_engine import TimerEngine
-from core.audio_manager import AudioManager
-
-from ui.log_viewer_window import LogViewerWindow
+from utils.settings_manager import SettingsManager
+from core.timer_manager import TimerManager
+from core.schedule import Schedule
+from utils.background_writer import BackgroundWriter
+from utils.session_store import SessionStore
+from utils.event_journal import EventJournal
 
 def main():
     # Fix Taskbar Icon on Windows
@@ -20,74 +28,136 @@ def main():
 
     app = QApplication(sys.argv)
     
+    # All log/settings writes go through one worker thread; drain it before exiting
+    writer = BackgroundWriter.instance()
+    writer.start()
+    
     # Prevent the app from quitting when the last window (Settings) is closed
-    settings = SettingsWindow() # Init early to get defaults
-    log_viewer = LogViewerWindow() 
     app.setQuitOnLastWindowClosed(False)
     
+    components = build_app(app)
+    # Connected after the components' own quit handlers, so their last writes get drained
+    app.aboutToQuit.connect(SettingsManager.flush)
+    app.aboutToQuit.connect(writer.stop)
+    
+    components["widget"].show()
+    
+    sys.exit(app.exec())
+
+def build_app(app, scheduler=None, data_dir="user_data"):
+    """
+    Creates the widget, tray, timers and stores and connects the whole signal graph.
+    scheduler: base scheduler for the timers (real time by default; the soak script
+    passes a VirtualScheduler). data_dir: where the session snapshot and event
+    journal live. Returns the components by name; the caller shows the widget.
+    """
+    journal = EventJournal(data_dir=data_dir)
+    app.aboutToQuit.connect(journal.flush)
+    
+    # Settings come straight from SettingsManager; the Settings and Log Viewer
+    # windows are only built the first time the tray asks for them
+    current_settings = SettingsManager.load_settings()
+    settings_ref = [None]
+    log_viewer_ref = [None]
+    
     # Components
-    widget = FloatingWidget()
-    # settings = SettingsWindow() # Already inited
-    tray_manager = TrayIconManager()
-    timer_engine = TimerEngine(work_minutes=settings.current_settings['work_minutes'], break_minutes=settings.current_settings['break_minutes'])
-    audio_manager = AudioManager()
+    with StartupProfiler.measure("FloatingWidget"):
+        widget = FloatingWidget()
+    
+    # Time-to-first-paint of the floating widget; deferred work starts after it
+    def report_first_paint():
+        # Printed with the rest of the profile (only when TOMODORANGE_PROFILE_STARTUP is set)
+        StartupProfiler.mark("FloatingWidget first paint")
+        QTimer.singleShot(0, finish_startup)
+        
+    widget.first_painted.connect(report_first_paint)
+    with StartupProfiler.measure("TrayIconManager"):
+        tray_manager = TrayIconManager()
+    def build_schedule(s):
+        return Schedule.standard(
+            s['work_minutes'], s['break_minutes'],
+            s.get('long_break_minutes', 15), s.get('cycles_before_long_break', 0)
+        )
+    
+    # All timers share one heap-based scheduler (one OS timer); the pomodoro is the primary
+    # Progress only needs to be as fine as the orange's segments
+    with StartupProfiler.measure("TimerManager + pomodoro engine"):
+        timer_manager = TimerManager(scheduler)
+        timer_engine = timer_manager.add_timer(
+            "pomodoro",
+            work_minutes=current_settings['work_minutes'],
+            break_minutes=current_settings['break_minutes'],
+            progress_resolution=FloatingWidget.SEGMENTS,
+            schedule=build_schedule(current_settings)
+        )
+    
+    # Audio (and QtMultimedia) is only loaded once the widget has painted;
+    # until then audio_ref[0] is None and the handlers below skip sound
+    audio_ref = [None]
+    
+    # Timer wakes every second only when the tick sound can actually be heard
+    def update_timer_power_saver():
+        current_s = SettingsManager.load_settings()
+        tick_silent = current_s.get('is_muted', False) or current_s['work_volume'] == 0
+        timer_engine.set_power_saver(tick_silent)
     
     # --- Logic connection ---
     
-    # 0. Timer -> Widget (Update Time)
-    timer_engine.tick.connect(widget.label.setText)
+    # 0. Timer -> Widget (Update Time, only when the minute text changes)
+    timer_engine.display_changed.connect(widget.label.setText)
     
     # 1. Timer -> Widget (Update Visual State Work/Break)
     def handle_state_change(state):
         # Retrieve latest settings to ensure we use current colors
-        current_settings = settings.get_current_settings()
+        current_s = SettingsManager.load_settings()
         
         if state == "work":
             # Use configured Work Color
-            widget.current_text_color = current_settings['work_color']
+            widget.current_text_color = current_s['work_color']
             widget.update_style(
                 text_color=widget.current_text_color, 
                 bg_opacity=widget.current_bg_opacity, 
                 text_opacity=widget.current_text_opacity, 
                 text_size=widget.current_text_size
             )
-            audio_manager.stop_break_sound()
+            if audio_ref[0]:
+                audio_ref[0].stop_break_sound()
             
         elif state == "break":
             # Use configured Break Color
-            widget.current_text_color = current_settings['break_color']
+            widget.current_text_color = current_s['break_color']
             widget.update_style(
                 text_color=widget.current_text_color, 
                 bg_opacity=widget.current_bg_opacity, 
                 text_opacity=widget.current_text_opacity, 
                 text_size=widget.current_text_size
             )
-            audio_manager.start_break_sound()
+            if audio_ref[0]:
+                audio_ref[0].start_break_sound()
             
     timer_engine.state_changed.connect(handle_state_change)
     
     # 1.1 Timer -> Widget (Update Mode Work/Break for Orange Style)
     timer_engine.state_changed.connect(widget.set_mode)
     
-    # 1.2 Timer -> Widget (Update Progress)
-    timer_engine.tick_progress.connect(widget.set_progress)
+    # 1.2 Timer -> Widget (Update Progress, quantized)
+    timer_engine.progress_changed.connect(widget.set_progress)
     
-    # 2. Timer -> Audio (Ticks)
-    def handle_tick_sound(time_str):
+    # 2. Timer -> Audio (Ticks, keeps the per-second cadence)
+    def handle_tick_sound(remaining_seconds):
         # Play tick only during Work phase
-        if timer_engine.current_state == "work":
-            audio_manager.play_tick()
+        if timer_engine.current_state == "work" and audio_ref[0]:
+            audio_ref[0].play_tick()
             
-    timer_engine.tick.connect(handle_tick_sound)
+    timer_engine.heartbeat.connect(handle_tick_sound)
     
     # 2.1 Timer -> Log Dialog
-    from PySide6.QtCore import QTimer
-    
     # Keep reference to prevent GC
     log_dialog_ref = [None]
     
     def open_log_dialog(mode="logging"):
         # Create dialog on demand to ensure fresh state/LogManager reading
+        from ui.log_entry_dialog import LogEntryDialog
         dialog = LogEntryDialog(mode=mode)
         log_dialog_ref[0] = dialog
         
@@ -104,7 +174,7 @@ def main():
     
     def open_log_dialog_wrapper(mode="logging"):
         # Check if work logging is enabled
-        current_s = settings.get_current_settings()
+        current_s = SettingsManager.load_settings()
         # Default to True if not present (though it should be via defaults)
         if not current_s.get('work_log_enabled', False) and mode == "logging":
             return
@@ -115,52 +185,79 @@ def main():
     timer_engine.work_completed.connect(lambda: open_log_dialog_wrapper("logging"))
 
     # 3. Settings -> Timer & Audio
-    def handle_settings_change(settings_dict):
-        # Visuals
+    # Each subsystem only reacts to the keys it owns (settings_diff carries changed keys only)
+    STYLE_KEYS = {'bg_opacity', 'text_opacity', 'text_size', 'work_color', 'break_color'}
+    DURATION_KEYS = {'work_minutes', 'break_minutes', 'long_break_minutes', 'cycles_before_long_break'}
+
+    def handle_style_settings(changes):
+        if not STYLE_KEYS & changes.keys():
+            return
+        current_s = SettingsManager.load_settings()
+        
         # Store current visuals for state retention
-        widget.current_bg_opacity = settings_dict['bg_opacity']
-        widget.current_text_opacity = settings_dict['text_opacity']
-        widget.current_text_size = settings_dict['text_size']
+        widget.current_bg_opacity = current_s['bg_opacity']
+        widget.current_text_opacity = current_s['text_opacity']
+        widget.current_text_size = current_s['text_size']
         
         # Determine which color to apply based on CURRENT state
         if timer_engine.current_state == "work":
-             widget.current_text_color = settings_dict['work_color']
+             widget.current_text_color = current_s['work_color']
         else:
-             widget.current_text_color = settings_dict['break_color']
+             widget.current_text_color = current_s['break_color']
 
         widget.update_style(
             text_color=widget.current_text_color, 
-            bg_opacity=settings_dict['bg_opacity'],
-            text_opacity=settings_dict['text_opacity'],
-            text_size=settings_dict['text_size']
+            bg_opacity=widget.current_bg_opacity,
+            text_opacity=widget.current_text_opacity,
+            text_size=widget.current_text_size
         )
-        
-        # Orange Style Updates
-        widget.set_timer_style(settings_dict.get('timer_style', 'orange'))
-        widget.set_orange_opacity(settings_dict.get('orange_opacity', 1.0))
-        
-        # Timer Durations - Fix: Only update if changed to avoid reset
-        # Check if values differ from current engine values (converted to minutes)
-        current_work_min = int(timer_engine.work_seconds / 60)
-        current_break_min = int(timer_engine.break_seconds / 60)
-        
-        if (settings_dict['work_minutes'] != current_work_min or 
-            settings_dict['break_minutes'] != current_break_min):
-            timer_engine.update_durations(settings_dict['work_minutes'], settings_dict['break_minutes'])
-        
-        # Audio Volume & Mute
-        audio_manager.set_work_volume(settings_dict['work_volume'])
-        audio_manager.set_break_volume(settings_dict['break_volume'])
-        audio_manager.toggle_mute(settings_dict.get('is_muted', False))
-        
-        # Startup
-        if settings_dict['run_at_startup'] != StartupManager.is_run_at_startup():
-            StartupManager.set_run_at_startup(settings_dict['run_at_startup'])
 
-    settings.settings_changed.connect(handle_settings_change)
+    def handle_orange_settings(changes):
+        if 'timer_style' in changes:
+            widget.set_timer_style(changes['timer_style'])
+        if 'orange_opacity' in changes:
+            widget.set_orange_opacity(changes['orange_opacity'])
+
+    def handle_duration_settings(changes):
+        # Only touch the engine when a duration really changed; it restarts the period if its own duration did
+        if not DURATION_KEYS & changes.keys():
+            return
+        current_s = SettingsManager.load_settings()
+        timer_engine.update_durations(
+            current_s['work_minutes'], current_s['break_minutes'],
+            current_s.get('long_break_minutes', 15), current_s.get('cycles_before_long_break', 0)
+        )
+
+    def handle_audio_settings(changes):
+        audio_manager = audio_ref[0]
+        if audio_manager and 'work_volume' in changes:
+            audio_manager.set_work_volume(changes['work_volume'])
+        if audio_manager and 'break_volume' in changes:
+            audio_manager.set_break_volume(changes['break_volume'])
+        if 'work_volume' in changes:
+            update_timer_power_saver()
+
+    def handle_startup_settings(changes):
+        if 'run_at_startup' not in changes:
+            return
+        if changes['run_at_startup'] != StartupManager.is_run_at_startup():
+            StartupManager.set_run_at_startup(changes['run_at_startup'])
+
+    def get_settings_window():
+        if settings_ref[0] is None:
+            from ui.settings_window import SettingsWindow
+            settings = SettingsWindow()
+            settings.settings_diff.connect(handle_style_settings)
+            settings.settings_diff.connect(handle_orange_settings)
+            settings.settings_diff.connect(handle_duration_settings)
+            settings.settings_diff.connect(handle_audio_settings)
+            settings.settings_diff.connect(handle_startup_settings)
+            settings_ref[0] = settings
+        return settings_ref[0]
     
     # Tray -> Settings / Exit
     def show_settings():
+        settings = get_settings_window()
         settings.showNormal()
         settings.activateWindow()
         settings.raise_()
@@ -168,6 +265,15 @@ def main():
     tray_manager.show_settings_requested.connect(show_settings)
     tray_manager.quit_requested.connect(app.quit)
     
+    # Writer -> Tray (Surface failed saves instead of losing them silently)
+    def handle_write_failed(key, error):
+        tray_manager.tray_icon.showMessage(
+            "TomodOrange", f"Could not save {os.path.basename(key)}: {error}",
+            QSystemTrayIcon.Warning
+        )
+        
+    BackgroundWriter.instance().write_failed.connect(handle_write_failed)
+    
     # Tray -> Ghost Mode
     def handle_tray_ghost_toggle(enabled):
         widget.toggle_ghost_mode(enabled)
@@ -178,28 +284,22 @@ def main():
     # Tray -> Mute Toggle
     def handle_tray_mute_toggle(is_muted):
         # 1. Update Audio
-        audio_manager.toggle_mute(is_muted)
+        if audio_ref[0]:
+            audio_ref[0].toggle_mute(is_muted)
         
-        # 2. Persist
-        # We need to update the settings file. We can fetch current from window + mute override
-        # OR just load, update, save. Using SettingsWindow helper is risky if window is stale? 
-        # Actually window is alive.
-        current_s = settings.get_current_settings()
-        current_s['is_muted'] = is_muted
-        from utils.settings_manager import SettingsManager
-        SettingsManager.save_settings(current_s)
+        # 2. Persist (only the key that changed)
+        SettingsManager.save_settings({'is_muted': is_muted})
+        update_timer_power_saver()
         
     tray_manager.toggle_mute_requested.connect(handle_tray_mute_toggle)
     
     # Tray -> Work Log Toggle
     def handle_tray_work_log_toggle(enabled):
         # 1. Update Settings Persistence
-        # Ensure SettingsWindow internal state is updated so get_current_settings() includes it
-        settings.set_work_log_enabled(enabled)
-        
-        current_s = settings.get_current_settings()
-        from utils.settings_manager import SettingsManager
-        SettingsManager.save_settings(current_s)
+        SettingsManager.save_settings({'work_log_enabled': enabled})
+        # Keep an already-built SettingsWindow in sync so it doesn't emit a stale value
+        if settings_ref[0] is not None:
+            settings_ref[0].set_work_log_enabled(enabled)
         
         # 2. Update Tray State (optimization: tray likely triggered this, but good to be explicit)
         tray_manager.update_work_log_state(enabled)
@@ -208,6 +308,10 @@ def main():
     
     # Tray -> Review Logs
     def show_log_viewer():
+        if log_viewer_ref[0] is None:
+            from ui.log_viewer_window import LogViewerWindow
+            log_viewer_ref[0] = LogViewerWindow()
+        log_viewer = log_viewer_ref[0]
         log_viewer.showNormal()
         log_viewer.activateWindow()
         log_viewer.raise_()
@@ -215,12 +319,8 @@ def main():
     tray_manager.review_logs_requested.connect(show_log_viewer)
 
     # Initialize
-    # Sync visual defaults from Settings (which loaded from JSON)
-    current_settings = settings.get_current_settings()
-    # Note: 'is_muted' might be missing from get_current_settings() if we removed the UI element
-    # So we'll fetch it from the raw loaded settings or re-read.
-    # The settings window `current_settings` AT INIT TIME had it.
-    initial_mute_state = settings.current_settings.get('is_muted', False)
+    # Sync visual defaults from the loaded settings
+    initial_mute_state = current_settings.get('is_muted', False)
     
     widget.current_bg_opacity = current_settings['bg_opacity']
     widget.current_text_opacity = current_settings['text_opacity']
@@ -244,13 +344,21 @@ def main():
     widget.set_orange_opacity(current_settings.get('orange_opacity', 1.0))
     # Ensure initial mode is set (TimerEngine starts at Work)
     widget.set_mode("work") 
-    timer_engine.start()
     
-    # Apply initial Audio volumes
-    audio_manager.set_work_volume(current_settings['work_volume'])
-    audio_manager.set_break_volume(current_settings['break_volume'])
-    audio_manager.toggle_mute(initial_mute_state)
     tray_manager.update_mute_state(initial_mute_state)
+    update_timer_power_saver()
+    
+    # Resume the session from before a crash or reboot (state_changed re-syncs the UI),
+    # otherwise start a fresh work period. Snapshots are kept on every transition.
+    session_store = SessionStore(data_dir=data_dir)
+    session_store.attach(timer_engine)
+    # Quitting from the tray starts fresh next time. Not aboutToQuit: Qt also emits
+    # it at OS logoff/shutdown, and that session should resume after the reboot.
+    tray_manager.quit_requested.connect(session_store.close)
+    # Binary event journal for analytics (starts, pauses, resets, switches, edits)
+    journal.attach(timer_engine)
+    if not session_store.restore(timer_engine):
+        timer_engine.start()
     
 
     
@@ -258,15 +366,38 @@ def main():
     initial_work_log_state = current_settings.get('work_log_enabled', False)
     tray_manager.update_work_log_state(initial_work_log_state)
     
-    # Initial Sync (Settings -> Widget)
-    # Ensure startup registry matches our default (True) if not already set
-    current_settings = settings.get_current_settings()
-    if current_settings['run_at_startup'] and not StartupManager.is_run_at_startup():
-        StartupManager.set_run_at_startup(True)
+    # Everything not needed for the first frame runs right after it
+    def finish_startup():
+        # Audio: imports QtMultimedia and applies the current volumes/mute
+        with StartupProfiler.measure("AudioManager (import + init)"):
+            from core.audio_manager import AudioManager
+            audio_manager = AudioManager()
+        current_s = SettingsManager.load_settings()
+        audio_manager.set_work_volume(current_s['work_volume'])
+        audio_manager.set_break_volume(current_s['break_volume'])
+        audio_manager.toggle_mute(current_s.get('is_muted', False))
+        audio_ref[0] = audio_manager
+        if timer_engine.current_state == "break":
+            # A restored session may already be in its break
+            audio_manager.start_break_sound()
+        
+        # Initial Sync (Settings -> Widget)
+        # Ensure startup registry matches our default (True) if not already set
+        with StartupProfiler.measure("StartupManager sync"):
+            if current_s['run_at_startup'] and not StartupManager.is_run_at_startup():
+                StartupManager.set_run_at_startup(True)
+        
+        StartupProfiler.mark("Startup finished")
+        StartupProfiler.report()
 
-    widget.show()
-    
-    sys.exit(app.exec())
+    return {
+        "widget": widget,
+        "tray_manager": tray_manager,
+        "timer_manager": timer_manager,
+        "timer_engine": timer_engine,
+        "journal": journal,
+        "session_store": session_store,
+    }
 
 if __name__ == "__main__":
     main()
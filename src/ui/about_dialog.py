@@ -1,5 +1,5 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame
-from PySide6.QtGui import QDesktopServices, QFont, QIcon
+from PySide6.QtGui import QDesktopServices, QFont, QIcon, QPixmap
 from PySide6.QtCore import Qt, QUrl
 import os
 from utils.constants import APP_NAME, APP_VERSION, DEVELOPER_NAME, WEBSITE_URL, SUPPORT_EMAIL
@@ -24,7 +24,6 @@ class AboutDialog(QDialog):
         # For simplicity, let's just use the text first, but if we had the logo image we'd show it.
         # Let's try to show the icon if it exists via a Pixmap Label
         if os.path.exists(icon_path):
-            from PySide6.QtGui import QPixmap 
             logo_label = QLabel()
             pixmap = QPixmap(icon_path).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(pixmap)
@@ -1,15 +1,25 @@
 from PySide6.QtWidgets import QMainWindow, QLabel, QVBoxLayout, QWidget, QApplication
 from utils.settings_manager import SettingsManager
-from PySide6.QtGui import QColor, QPalette, QFont, QPainter, QBrush, QPen, QScreen, QAction
-from PySide6.QtCore import Qt, QPoint, QRectF, QLineF, QTimer
+from PySide6.QtGui import QColor, QPalette, QFont, QPainter, QBrush, QPen, QScreen, QAction, QPixmap, QIcon
+from PySide6.QtCore import Qt, QPoint, QRect, QRectF, QLineF, QTimer, Signal
+from collections import OrderedDict
+import os
 import ctypes
 from ctypes import wintypes
 
 class FloatingWidget(QMainWindow):
+    SEGMENTS = 6
+    # 7 visible-segment states x 2 modes, plus room for a few sizes/opacities
+    FACE_CACHE_SIZE = 32
+    
+    # Emitted once, after the first paintEvent (used to measure time-to-first-paint)
+    first_painted = Signal()
+
     def __init__(self):
         super().__init__()
         
         # State
+        self._first_paint_done = False
         self.ghost_mode = False
         self.drag_pos = None
         self.current_bg_opacity = 0.0 # Default 0
@@ -22,6 +32,8 @@ class FloatingWidget(QMainWindow):
         self.orange_opacity = 1.0
         self.current_mode = "work" # "work" or "break"
         self.progress = 0.0 # 0.0 to 1.0
+        self.visible_count = self.SEGMENTS
+        self._face_cache = OrderedDict() # (size, dpr, mode, visible, opacity) -> QPixmap
         self.current_size_val = 72 # Store size value
         
         # Constants
@@ -74,10 +86,7 @@ class FloatingWidget(QMainWindow):
     def save_position(self):
         """Saves the current position to settings."""
         pos = self.pos()
-        settings = SettingsManager.load_settings()
-        settings['widget_x'] = pos.x()
-        settings['widget_y'] = pos.y()
-        SettingsManager.save_settings(settings)
+        SettingsManager.save_settings({'widget_x': pos.x(), 'widget_y': pos.y()})
         
     def init_ui(self):
         # Window Flags
@@ -89,10 +98,8 @@ class FloatingWidget(QMainWindow):
         
         # App Icon
         # Try to load icon if exists, otherwise it might be set via QApplication
-        import os
         icon_path = os.path.join(os.getcwd(), 'assets', 'icon.png')
         if os.path.exists(icon_path):
-            from PySide6.QtGui import QIcon
             self.setWindowIcon(QIcon(icon_path))
         
         # Translucent Background
@@ -139,8 +146,12 @@ class FloatingWidget(QMainWindow):
 
     def set_progress(self, progress):
         self.progress = progress
-        if self.timer_style == "orange":
-            self.update()
+        # Only repaint when a segment actually appears/disappears
+        visible_count = self.visible_segments(progress)
+        if visible_count != self.visible_count:
+            self.visible_count = visible_count
+            if self.timer_style == "orange":
+                self.update()
 
     def set_mode(self, mode):
         self.current_mode = mode
@@ -185,178 +196,116 @@ class FloatingWidget(QMainWindow):
             self.resize(s, s)
             self.update()
 
+    @classmethod
+    def visible_segments(cls, progress):
+        """Number of orange segments still shown for a 0.0 -> 1.0 progress value."""
+        visible_count = int(cls.SEGMENTS * (1.0 - progress) + 0.99)
+        return max(0, min(cls.SEGMENTS, visible_count))
+
     def paintEvent(self, event):
         if self.timer_style == "orange":
+            # The face only has a handful of states, so it is rendered once per state and cached
             painter = QPainter(self)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setOpacity(self.orange_opacity)
-            
-            rect = self.rect()
-            min_dim = min(rect.width(), rect.height())
-            center = rect.center()
-            radius = (min_dim / 2) * 0.9 # 10% padding
-            
-            peel_color = self.ORANGE_PEEL if self.current_mode == "work" else self.GREEN_PEEL
-            seg_color = self.ORANGE_SEGMENT if self.current_mode == "work" else self.GREEN_SEGMENT
-            empty_seg_color = self.ORANGE_EMPTY if self.current_mode == "work" else self.GREEN_EMPTY
-            
-            # 1. Draw Peel Frame (Ring + Connectors)
-            # This frame persists even as segments disappear.
-            # This meets the "separate segment using peel color" requirement.
-            
-            peel_thickness = radius * 0.12 # Slightly thicker
-            
-            # Draw Ring
-            painter.setPen(QPen(QColor(peel_color), peel_thickness))
-            painter.setBrush(Qt.NoBrush)
-            
-            # Adjust ellipse for pen width
-            peel_rect = QRectF(center.x() - radius + peel_thickness/2, 
-                               center.y() - radius + peel_thickness/2, 
-                               (radius - peel_thickness/2) * 2, 
-                               (radius - peel_thickness/2) * 2)
-            
-            painter.drawEllipse(peel_rect)
-            
-            # Draw Spokes (Separators)
-            # 6 spokes.
-            painter.setPen(QPen(QColor(peel_color), peel_thickness/1.5)) # Slightly thinner spokes
-            
-            # Inner radius for spokes (connect to center, extend to ring)
-            # Start from center? Or small hub? Let's do small hub.
-            # Hub radius
-            hub_radius = radius * 0.05
-            
-            # Draw Hub
-            painter.setBrush(QBrush(QColor(peel_color)))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(center, hub_radius, hub_radius)
-            
-            # Draw Lines
-            painter.setPen(QPen(QColor(peel_color), peel_thickness/2))
-            
-            import math
-            for i in range(6):
-                angle_deg = 30 + i * 60 # Centers of the gaps (30, 90, 150...)
-                # No, segments are 60 deg slices. Spokes should be at boundaries.
-                # Segment 0 is 12-2 (90 to 30 deg). Boundary at 90, 30.
-                # Let's verify angles.
-                # 0, 60, 120, 180, 240, 300.
-                angle_rad = math.radians(angle_deg)
-                
-                # Start: Center (or hub edge)
-                # End: Ring inner edge
-                # Ring inner edge is radius - peel_thickness
-                end_r = radius - peel_thickness/2
-                
-                # Calculate coords
-                # Qt Coords: Y down. 0 deg is right (3 o'clock).
-                # 90 deg is Down (6 o'clock)?
-                # Standard Math: 0 Right. 90 Up.
-                # Qt Trig (math.cos/sin) uses standard radians. Y is inverted visually only.
-                # Let's just use (cos, sin) and map to center.
-                
-                x_end = center.x() + end_r * math.cos(angle_rad)
-                y_end = center.y() + end_r * math.sin(angle_rad) # Y down for +sin? 
-                # Actually let's assume standard trig logic, visuals will just be rotated.
-                # Symmetry means rotation doesn't matter much for 6 spokes.
-                
-                painter.drawLine(center, QPoint(int(x_end), int(y_end)))
-            
-            # 2. Draw Segments
-            # Segments fill the space between spokes.
-            # We draw them "under" the spokes? Or carefully sized gaps?
-            # Easier to draw segments FIRST, then draw the Frame (Peel+Spokes) on TOP.
-            # This ensures clean separation.
-            # Let's Reorder.
-            
-            # --- REORDERED PAINTING ---
-            
-            # A. Calculate Segments Logic
-            # Loop over ALL 6 segments
-            visible_count = int(6.0 * (1.0 - self.progress) + 0.99)
-            if visible_count > 6: visible_count = 6
-            if visible_count < 0: visible_count = 0
-            
-            seg_radius = radius - peel_thickness/2 # Go slightly under the ring to avoid hairline gaps
-            
-            painter.setPen(Qt.NoPen)
-            
-            for i in range(6):
-                # Start Angle (CCW)
-                # i=0: 90 (12h) -> 12-10
-                # i=1: 150 (10h) -> 10-8
-                
-                # Determine Color: Is this segment visible or empty?
-                # Visible segments are 0 to visible_count - 1
-                if i < visible_count:
-                    painter.setBrush(QBrush(QColor(seg_color)))
-                else:
-                    painter.setBrush(QBrush(QColor(empty_seg_color)))
-                
-                a_start_deg = 90 + i * 60
-                
-                # Full 60 deg span (Spokes will cover edges)
-                final_start = a_start_deg * 16
-                final_span = 60 * 16
-                
-                rect_seg = QRectF(center.x() - seg_radius, 
-                                  center.y() - seg_radius, 
-                                  seg_radius * 2, 
-                                  seg_radius * 2)
-                                  
-                painter.drawPie(rect_seg, int(final_start), int(final_span))
-            
-            # B. Draw Frame (Peel Ring + Spokes) ON TOP
-            
-            # Draw Spokes
-            painter.setPen(QPen(QColor(peel_color), peel_thickness/2))
-            for i in range(6):
-                # Spokes at 30, 90, 150... (Boundaries of segments centered at 0, 60...)
-                # Wait, my segment i starts at 90. Ends at 150.
-                # So boundaries are 90, 150, 210...
-                angle_deg = 90 + i * 60 
-                # Note: math functions take radians
-                # Angle in Qt paint (degrees): 0 is 3 o'clock. 90 is 12 o'clock (CCW).
-                # Math functions: 0 is 3 o'clock. positive CCW.
-                # But Y is inverted on screen. 
-                # (0,1) is Down.
-                # degrees: 90 -> -90 in math logic if Y inverted?
-                # Let's not overthink. The Segments align to 90, 150...
-                # So we put spokes at 90, 150...
-                
-                # To convert "Qt Degrees" (90=Top) to "Math Radians for Screen Coordinates":
-                # Top is -90 math (if Y down)? Or 270?
-                # Top (0, -1). 
-                # Right (1, 0).
-                # 0 deg = Right.
-                # 90 deg (Qt) = Top.
-                # So Qt 90 corresponds to Math 270 (-90).
-                # Formula: rad = -degrees * PI / 180 ? 
-                # Or just use `QLineF` with polar?
-                
-                spoke_line = QLineF.fromPolar(radius - peel_thickness/2, angle_deg)
-                # Translate to center
-                spoke_line.translate(center)
-                # That places start at center?
-                # QLineF.fromPolar(length, angle) -> creates line starting at (0,0).
-                # So we translate it.
-                
-                painter.drawLine(spoke_line)
-                
-            # Draw Hub (Center Cap)
-            painter.setBrush(QBrush(QColor(peel_color)))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(center, hub_radius, hub_radius)
-            
-            # Draw Outer Ring
-            painter.setPen(QPen(QColor(peel_color), peel_thickness))
-            painter.setBrush(Qt.NoBrush)
-            painter.drawEllipse(peel_rect)
-                
+            painter.drawPixmap(0, 0, self._get_face_pixmap())
+            painter.end()
         else:
             # Classic: Paint nothing special, QLabel handles it.
             super().paintEvent(event)
+        
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self.first_painted.emit()
+
+    def _get_face_pixmap(self):
+        """Returns the cached orange face for the current state, rendering it on a miss."""
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self.current_mode, self.visible_count, self.orange_opacity)
+        
+        pixmap = self._face_cache.get(key)
+        if pixmap is not None:
+            self._face_cache.move_to_end(key)
+            return pixmap
+        
+        pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        
+        painter = QPainter(pixmap)
+        self._paint_face(painter, QRect(0, 0, self.width(), self.height()))
+        painter.end()
+        
+        # Bounded LRU: drop the least recently used face
+        self._face_cache[key] = pixmap
+        if len(self._face_cache) > self.FACE_CACHE_SIZE:
+            self._face_cache.popitem(last=False)
+        return pixmap
+
+    def _paint_face(self, painter, rect):
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setOpacity(self.orange_opacity)
+        
+        min_dim = min(rect.width(), rect.height())
+        center = rect.center()
+        radius = (min_dim / 2) * 0.9 # 10% padding
+        
+        peel_color = self.ORANGE_PEEL if self.current_mode == "work" else self.GREEN_PEEL
+        seg_color = self.ORANGE_SEGMENT if self.current_mode == "work" else self.GREEN_SEGMENT
+        empty_seg_color = self.ORANGE_EMPTY if self.current_mode == "work" else self.GREEN_EMPTY
+        
+        peel_thickness = radius * 0.12 # Slightly thicker
+        hub_radius = radius * 0.05
+        
+        # Adjust ellipse for pen width
+        peel_rect = QRectF(center.x() - radius + peel_thickness/2, 
+                           center.y() - radius + peel_thickness/2, 
+                           (radius - peel_thickness/2) * 2, 
+                           (radius - peel_thickness/2) * 2)
+        
+        # 1. Draw Segments first, then the Frame (Peel + Spokes) on top.
+        # This ensures clean separation ("separate segment using peel color").
+        seg_radius = radius - peel_thickness/2 # Go slightly under the ring to avoid hairline gaps
+        rect_seg = QRectF(center.x() - seg_radius, 
+                          center.y() - seg_radius, 
+                          seg_radius * 2, 
+                          seg_radius * 2)
+        
+        painter.setPen(Qt.NoPen)
+        
+        for i in range(self.SEGMENTS):
+            # Start Angle (CCW)
+            # i=0: 90 (12h) -> 12-10
+            # i=1: 150 (10h) -> 10-8
+            
+            # Visible segments are 0 to visible_count - 1
+            if i < self.visible_count:
+                painter.setBrush(QBrush(QColor(seg_color)))
+            else:
+                painter.setBrush(QBrush(QColor(empty_seg_color)))
+            
+            # Full 60 deg span (Spokes will cover edges)
+            a_start_deg = 90 + i * 60
+            painter.drawPie(rect_seg, int(a_start_deg * 16), int(60 * 16))
+        
+        # 2. Draw Spokes at the segment boundaries (90, 150, 210...)
+        # Angle in Qt paint (degrees): 0 is 3 o'clock. 90 is 12 o'clock (CCW),
+        # which is what QLineF.fromPolar expects.
+        painter.setPen(QPen(QColor(peel_color), peel_thickness/2))
+        for i in range(self.SEGMENTS):
+            angle_deg = 90 + i * 60 
+            # fromPolar starts the line at (0,0), so move it to the center
+            spoke_line = QLineF.fromPolar(radius - peel_thickness/2, angle_deg)
+            spoke_line.translate(center)
+            painter.drawLine(spoke_line)
+            
+        # 3. Draw Hub (Center Cap)
+        painter.setBrush(QBrush(QColor(peel_color)))
+        painter.setPen(Qt.NoPen)
+        painter.drawEllipse(center, hub_radius, hub_radius)
+        
+        # 4. Draw Outer Ring
+        painter.setPen(QPen(QColor(peel_color), peel_thickness))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawEllipse(peel_rect)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton and not self.ghost_mode:
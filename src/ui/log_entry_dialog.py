@@ -4,7 +4,7 @@ from PySide6.QtWidgets import (
     QGroupBox, QWidget, QButtonGroup
 )
 from PySide6.QtCore import Qt, Signal
-from utils.log_manager import LogManager
+from utils.log_manager import create_log_manager
 
 class LogEntryDialog(QDialog):
     def __init__(self, parent=None, mode="logging"):
@@ -19,7 +19,7 @@ class LogEntryDialog(QDialog):
         self.resize(500, 600)
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
         
-        self.log_manager = LogManager()
+        self.log_manager = create_log_manager()
         
         # Layout
         layout = QVBoxLayout(self)
@@ -208,16 +208,8 @@ class LogEntryDialog(QDialog):
  
     def populate_tasks(self):
         """Fill combo with historical tasks."""
-        # Get tasks from log manager (need to implement a unique task getter or just iterate logs)
-        # For efficiency, LogManager could support `get_unique_task_names()`
-        # We'll just read all logs for now.
-        logs = self.log_manager.get_all_logs()
-        seen = set()
-        for log in logs:
-            name = log.get('task_name')
-            if name and name not in seen:
-                self.task_combo.addItem(name)
-                seen.add(name)
+        # LogManager keeps unique task names indexed, no need to walk every log
+        self.task_combo.addItems(self.log_manager.get_task_names())
         
         # Select last used
         last = self.log_manager.get_last_task_name()
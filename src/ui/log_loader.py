@@ -0,0 +1,82 @@
+import threading
+from PySide6.QtCore import QObject, Signal
+from ui.log_table_model import LogTableModel
+
+class LogLoader(QObject):
+    """
+    Reads and sorts the whole work log on a worker thread, then streams it to
+    the GUI in chunks, newest first, so the first page shows up early. The
+    store's search index is brought up to date before `loaded` is emitted.
+    The log store is not thread-safe: its owner must leave it alone until
+    `loaded` arrives, or until `finished` after a cancel.
+    """
+    CHUNK_SIZE = 2000
+
+    chunk_ready = Signal(object)    # list of entries, newest first
+    progress = Signal(int, int)     # entries delivered, total
+    loaded = Signal(object, object) # store version (None on failure), last entry in log order
+    finished = Signal()             # worker done (also after cancel); the store is free again
+
+    def __init__(self, log_manager):
+        super().__init__()
+        self.log_manager = log_manager
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="LogLoader", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stops at the next chunk boundary; nothing is emitted afterwards."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self._load()
+        finally:
+            self.finished.emit()
+
+    def _load(self):
+        try:
+            version, _, entries = self.log_manager.get_changes()
+        except Exception as e:
+            print(f"LogLoader: Failed to load logs: {e}")
+            if not self.cancelled:
+                self.loaded.emit(None, None)
+            return
+        if self.cancelled:
+            return
+
+        last_entry = entries[-1] if entries else None
+        entries.sort(key=LogTableModel.sort_key, reverse=True)
+
+        total = len(entries)
+        for start in range(0, total, self.CHUNK_SIZE):
+            if self.cancelled:
+                return
+            chunk = entries[start:start + self.CHUNK_SIZE]
+            self.chunk_ready.emit(chunk)
+            self.progress.emit(start + len(chunk), total)
+
+        if self.cancelled:
+            return
+        try:
+            # While we own the store anyway: get the search index ready too
+            self.log_manager.prepare_search()
+        except Exception as e:
+            print(f"LogLoader: Failed to prepare search: {e}")
+
+        if not self.cancelled:
+            self.loaded.emit(version, last_entry)
@@ -0,0 +1,150 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from datetime import datetime
+
+class LogTableModel(QAbstractTableModel):
+    """
+    Read-only table model over work log entries, newest first.
+    Cells are formatted on demand in data(), so only visible rows ever get
+    their timestamp parsed, and rows are exposed in pages through
+    canFetchMore()/fetchMore() as the view scrolls. No per-cell items exist.
+    """
+    HEADERS = ["Date", "Task ID", "Task Name", "Session", "Rating"]
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = [] # Newest first
+        self._loaded = 0   # Rows exposed to the view so far
+
+    def set_entries(self, entries, presorted=False):
+        """
+        Replaces the data. Entries are shown newest first, unless `presorted`
+        (e.g. search results, which keep their ranking).
+        """
+        self.beginResetModel()
+        self._entries = list(entries) if presorted else sorted(entries, key=self.sort_key, reverse=True)
+        self._loaded = min(self.PAGE_SIZE, len(self._entries))
+        self.endResetModel()
+
+    @staticmethod
+    def sort_key(entry):
+        return entry.get('timestamp', '')
+
+    def extend_entries(self, entries):
+        """
+        Appends entries that sort after every current row (a load streamed
+        in newest-first chunks). Rows are exposed until the first page is full.
+        """
+        self._entries.extend(entries)
+        count = min(self.PAGE_SIZE, len(self._entries)) - self._loaded
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+            self._loaded += count
+            self.endInsertRows()
+
+    def add_entries(self, entries, replaces=None):
+        """
+        Inserts new entries at their sorted position without resetting the view.
+        replaces: an entry currently shown that entries[0] supersedes (an amended log entry).
+        """
+        if replaces is not None:
+            # The superseded entry is almost always the newest row
+            row = next((i for i, e in enumerate(self._entries) if e is replaces), None)
+            if row is not None:
+                self._remove_row(row)
+        for entry in entries:
+            self._insert_row(self._sorted_row(self.sort_key(entry)), entry)
+
+    def _sorted_row(self, timestamp):
+        # Binary search on the descending timestamps; equal ones keep log order
+        lo, hi = 0, len(self._entries)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.sort_key(self._entries[mid]) >= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _insert_row(self, row, entry):
+        if row > self._loaded:
+            # Not exposed yet; fetchMore() will get to it
+            self._entries.insert(row, entry)
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._entries.insert(row, entry)
+        self._loaded += 1
+        self.endInsertRows()
+
+    def _remove_row(self, row):
+        if row >= self._loaded:
+            del self._entries[row]
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._entries[row]
+        self._loaded -= 1
+        self.endRemoveRows()
+
+    def entry(self, row):
+        """The log entry shown at `row` (or None)."""
+        if 0 <= row < self._loaded:
+            return self._entries[row]
+        return None
+
+    def total_count(self):
+        return len(self._entries)
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._entries)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self._entries) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return self._format(entry, index.column())
+        if role == Qt.UserRole:
+            return entry
+        return None
+
+    @staticmethod
+    def _format(entry, column):
+        if column == 0:
+            # Format Date
+            ts_str = entry.get('timestamp', '')
+            try:
+                return datetime.fromisoformat(ts_str).strftime("%Y-%m-%d %H:%M")
+            except (TypeError, ValueError):
+                return ts_str
+        if column == 1:
+            return entry.get('task_id', '')
+        if column == 2:
+            return entry.get('task_name', '')
+        if column == 3:
+            return str(entry.get('session_num_display', ''))
+        # Rating as Stars
+        rating = entry.get('rating', 0)
+        return "⭐" * rating if rating > 0 else "-"
@@ -1,34 +1,60 @@
+import os
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QHeaderView, QTextBrowser, 
-    QSplitter, QGroupBox
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
+    QAbstractItemView, QHeaderView, QTextBrowser, 
+    QSplitter, QGroupBox, QProgressBar, QApplication, QLineEdit
 )
-from PySide6.QtCore import Qt
-from utils.log_manager import LogManager
-from datetime import datetime
+from PySide6.QtCore import Qt, QFileSystemWatcher, QTimer
+from utils.log_manager import create_log_manager
+from ui.log_table_model import LogTableModel
+from ui.log_loader import LogLoader
 
 class LogViewerWindow(QWidget):
+    UPDATE_DELAY_MS = 200
+    SEARCH_DELAY_MS = 150 # Typing pause before searching
+    SEARCH_LIMIT = 200
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Work Log History")
         self.resize(800, 600)
         
-        self.log_manager = LogManager()
+        self.log_manager = create_log_manager()
         
         layout = QVBoxLayout(self)
         
+        # Full-text search over task names and reflections
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search tasks and reflections...")
+        self.search_box.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.apply_search)
+        self.search_box.textChanged.connect(self._search_timer.start)
+        layout.addWidget(self.search_box)
+        
+        # Slim progress bar, only visible while the history loads in the background
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumHeight(6)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+        
         # Splitter to resize Table vs Details
         splitter = QSplitter(Qt.Vertical)
         
         # --- Table View (Master) ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Date", "Task ID", "Task Name", "Session", "Rating"])
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch) # Stretch Task Name
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.itemSelectionChanged.connect(self.load_details)
+        # Virtualized: the model formats only the rows the view asks for
+        self.model = LogTableModel(self)
+        self.search_model = LogTableModel(self) # Ranked matches while a search is active
+        self.table = QTableView()
+        # Fixed row height so the view never measures rows one by one
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().hide()
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
         splitter.addWidget(self.table)
         
@@ -40,57 +66,173 @@ class LogViewerWindow(QWidget):
         details_group.setLayout(details_layout)
         
         splitter.addWidget(details_group)
+        self._show_model(self.model)
         
         # Set initial splitter sizes (60% table, 40% details)
         splitter.setSizes([360, 240])
         
         layout.addWidget(splitter)
         
-        # Load Data
-        self.refresh_data()
+        # Data is loaded in showEvent, so constructing the window stays cheap
+        self._version = None    # Log store version the table reflects
+        self._last_entry = None # Shown entry for the store's last position (may get amended)
+        self._loader = None           # Full load in progress (owns log_manager meanwhile)
+        self._cancelled_loader = None # Cancelled load that may still be winding down
+        self._update_pending = False  # Log changed during a load
+        QApplication.instance().aboutToQuit.connect(self._shutdown_loaders)
+
+        # Pick up entries written by the app (or another instance) while open.
+        # Bursts of writes are coalesced into one update.
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.UPDATE_DELAY_MS)
+        self._update_timer.timeout.connect(self.update_data)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_log_file_changed)
+        self._watch_log_file()
+
+    def _show_model(self, model):
+        """Switches the table between the full history and the search results."""
+        if self.table.model() is model:
+            return
+        self.table.setModel(model)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch) # Stretch Task Name
+        self.table.selectionModel().selectionChanged.connect(self.load_details)
+        self.details_browser.clear()
+
+    def apply_search(self):
+        """Shows the entries matching the search box, best first, or the whole history when it is empty."""
+        query = self.search_box.text().strip()
+        if not query:
+            self._show_model(self.model)
+            return
+        if self._loader is not None or self._cancelled_loader is not None:
+            # The store is busy; _on_load_finished searches again
+            return
+        self.search_model.set_entries(self.log_manager.search(query, self.SEARCH_LIMIT), presorted=True)
+        self._show_model(self.search_model)
+
+    def _watch_log_file(self):
+        path = self.log_manager.filepath
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def _on_log_file_changed(self, path):
+        # A replaced file (migration, atomic rewrite) drops out of the watch list
+        self._watch_log_file()
+        if self.isVisible():
+            self._update_timer.start()
+        # While hidden, showEvent compares versions instead
 
     def refresh_data(self):
-        """Reloads data from LogManager."""
-        self.logs = self.log_manager.get_all_logs()
-        # Sort by timestamp desc (newest first)
-        self.logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        
-        self.table.setRowCount(0)
-        
-        for row_idx, entry in enumerate(self.logs):
-            self.table.insertRow(row_idx)
-            
-            # Format Date
-            ts_str = entry.get('timestamp', '')
-            date_str = ts_str
-            try:
-                dt = datetime.fromisoformat(ts_str)
-                date_str = dt.strftime("%Y-%m-%d %H:%M")
-            except:
-                pass
-                
-            self.table.setItem(row_idx, 0, QTableWidgetItem(date_str))
-            self.table.setItem(row_idx, 1, QTableWidgetItem(entry.get('task_id', '')))
-            self.table.setItem(row_idx, 2, QTableWidgetItem(entry.get('task_name', '')))
-            self.table.setItem(row_idx, 3, QTableWidgetItem(str(entry.get('session_num_display', ''))))
-            
-            # Rating as Stars
-            rating = entry.get('rating', 0)
-            stars = "⭐" * rating if rating > 0 else "-"
-            self.table.setItem(row_idx, 4, QTableWidgetItem(stars))
-            
-            # Store original index if needed, but we rely on self.logs order matching table
+        """Reloads data from LogManager (rows are formatted lazily by the model)."""
+        self._version = None
+        self.update_data()
+
+    def update_data(self):
+        """
+        Brings the table up to date with the log store. Does nothing when the
+        store's version is unchanged; appended entries are inserted as rows
+        and a first or replaced log is loaded in the background.
+        """
+        if self._loader is not None:
+            # The loader owns the log store until it finishes
+            self._update_pending = True
+            return
+        if self._cancelled_loader is not None:
+            # A cancelled load is still reading the store; we resume once it has stopped
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.show()
+            return
+        if self._version is None:
+            self._start_load()
+            return
+
+        version, start, entries = self.log_manager.get_changes(self._version)
+        if start == 0:
+            self._start_load()
+            return
+        if entries:
+            replaces = self._last_entry if start < self._version[1] else None
+            self.model.add_entries(entries, replaces=replaces)
+            self._last_entry = entries[-1]
+        self._version = version
+        if entries and self.search_box.text().strip():
+            self.apply_search()
+
+    # --- Background loading ---
+
+    def _start_load(self):
+        self.model.set_entries([])
+        self.details_browser.clear()
+        self.progress_bar.setRange(0, 0) # Busy until the sorted rows start arriving
+        self.progress_bar.show()
+
+        loader = LogLoader(self.log_manager)
+        loader.chunk_ready.connect(self._on_chunk_loaded)
+        loader.progress.connect(self._on_load_progress)
+        loader.loaded.connect(self._on_load_finished)
+        loader.finished.connect(self._on_loader_stopped)
+        self._loader = loader
+        loader.start()
+
+    def _cancel_load(self):
+        if self._loader is None:
+            return
+        self._loader.cancel()
+        self._cancelled_loader = self._loader
+        self._loader = None
+        self._version = None # The table is incomplete; reload on next show
+        self._update_pending = False
+        self.progress_bar.hide()
+
+    def _shutdown_loaders(self):
+        self._cancel_load()
+        if self._cancelled_loader is not None:
+            self._cancelled_loader.join()
+            self._cancelled_loader = None
+
+    def _on_loader_stopped(self):
+        loader = self.sender() # None if a finished loader was already released
+        if loader is None or loader is not self._cancelled_loader:
+            return
+        self._cancelled_loader.join()
+        self._cancelled_loader = None
+        if self.isVisible():
+            self.update_data()
+
+    def _on_chunk_loaded(self, entries):
+        # Queued signals from a cancelled load can still trickle in
+        if self.sender() is self._loader:
+            self.model.extend_entries(entries)
+
+    def _on_load_progress(self, done, total):
+        if self.sender() is self._loader:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+
+    def _on_load_finished(self, version, last_entry):
+        if self.sender() is not self._loader:
+            return
+        self._loader.join()
+        self._loader = None
+        self.progress_bar.hide()
+        self._version = version
+        self._last_entry = last_entry
+        if self.search_box.text().strip():
+            self.apply_search()
+        if self._update_pending:
+            self._update_pending = False
+            self.update_data()
             
     def load_details(self):
-        selected_items = self.table.selectedItems()
-        if not selected_items:
+        selected_rows = self.table.selectionModel().selectedRows()
+        if not selected_rows:
             self.details_browser.clear()
             return
             
-        row = selected_items[0].row()
-        if row < len(self.logs):
-            entry = self.logs[row]
-            
+        entry = self.table.model().entry(selected_rows[0].row())
+        if entry is not None:
             html = f"""
             <h3>{entry.get('task_name', 'Unknown Task')} <span style="color:#777">({entry.get('task_id','')})</span></h3>
             <p><b>Focus:</b> {entry.get('rating',0)}/5 &nbsp;|&nbsp; <b>Session:</b> {entry.get('session_num_display', '?')}</p>
@@ -114,6 +256,11 @@ class LogViewerWindow(QWidget):
         return text.replace("\n", "<br>")
 
     def showEvent(self, event):
-        """Refresh when shown."""
-        self.refresh_data()
+        """Catch up with the log store when shown (no-op if nothing changed)."""
+        self.update_data()
         super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Closing the window mid-load stops the background load."""
+        self._cancel_load()
+        super().hideEvent(event)
@@ -3,12 +3,15 @@ from PySide6.QtWidgets import (
     QSpinBox, QCheckBox, QColorDialog, QPushButton, QGroupBox, QRadioButton, QButtonGroup
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor
+from PySide6.QtGui import QColor, QIcon
+import os
 from utils.settings_manager import SettingsManager
 
 class SettingsWindow(QWidget):
     # Signals to update the main widget/logic
-    settings_changed = Signal(dict)
+    settings_changed = Signal(dict) # Full settings snapshot
+    settings_diff = Signal(dict) # Only the keys that changed since the last emission
+    setting_changed = Signal(str, object) # One emission per changed key
 
     def __init__(self):
         super().__init__()
@@ -16,10 +19,8 @@ class SettingsWindow(QWidget):
         self.resize(350, 500)
         
         # App Icon
-        import os
         icon_path = os.path.join(os.getcwd(), 'assets', 'icon.png')
         if os.path.exists(icon_path):
-            from PySide6.QtGui import QIcon
             self.setWindowIcon(QIcon(icon_path))
         
         # Load persisted settings
@@ -68,9 +69,27 @@ class SettingsWindow(QWidget):
         self.break_input.setValue(self.current_settings['break_minutes'])
         self.break_input.setPrefix("Break: ")
         
+        # Long break replaces every Nth short break (0 = never)
+        long_break_layout = QHBoxLayout()
+        self.long_break_input = QSpinBox()
+        self.long_break_input.setRange(1, 120)
+        self.long_break_input.setValue(self.current_settings.get('long_break_minutes', 15))
+        self.long_break_input.setPrefix("Long Break: ")
+        
+        self.long_break_every_input = QSpinBox()
+        self.long_break_every_input.setRange(0, 12)
+        self.long_break_every_input.setValue(self.current_settings.get('cycles_before_long_break', 0))
+        self.long_break_every_input.setPrefix("Every: ")
+        self.long_break_every_input.setSpecialValueText("Long Break: Off")
+        
         timer_layout.addWidget(self.work_input)
         timer_layout.addWidget(self.break_input)
-        timer_group.setLayout(timer_layout)
+        long_break_layout.addWidget(self.long_break_input)
+        long_break_layout.addWidget(self.long_break_every_input)
+        timer_outer = QVBoxLayout()
+        timer_outer.addLayout(timer_layout)
+        timer_outer.addLayout(long_break_layout)
+        timer_group.setLayout(timer_outer)
         layout.addWidget(timer_group)
         
         # --- Visuals Section ---
@@ -140,6 +159,9 @@ class SettingsWindow(QWidget):
         # Initial State update
         self._update_visibility()
         
+        # Baseline for diffing later emissions
+        self._last_emitted = self.get_current_settings()
+        
     def _update_visibility(self):
         is_orange = self.radio_orange.isChecked()
         
@@ -201,6 +223,8 @@ class SettingsWindow(QWidget):
         # Inputs that might need 'editingFinished' or valueChanged
         self.work_input.valueChanged.connect(self.emit_settings)
         self.break_input.valueChanged.connect(self.emit_settings)
+        self.long_break_input.valueChanged.connect(self.emit_settings)
+        self.long_break_every_input.valueChanged.connect(self.emit_settings)
         self.work_vol_slider['slider'].valueChanged.connect(self.emit_settings)
         self.break_vol_slider['slider'].valueChanged.connect(self.emit_settings)
 
@@ -219,6 +243,8 @@ class SettingsWindow(QWidget):
         return {
             "work_minutes": self.work_input.value(),
             "break_minutes": self.break_input.value(),
+            "long_break_minutes": self.long_break_input.value(),
+            "cycles_before_long_break": self.long_break_every_input.value(),
             "work_color": self.work_color,
             "break_color": self.break_color,
             "text_size": self.size_slider['slider'].value(),
@@ -235,11 +261,27 @@ class SettingsWindow(QWidget):
     
     def set_work_log_enabled(self, enabled):
         self.work_log_enabled = enabled
+        # Changed from the tray, which persists it itself; keep the diff baseline in sync
+        self._last_emitted['work_log_enabled'] = enabled
 
     def emit_settings(self):
         settings = self.get_current_settings()
-        SettingsManager.save_settings(settings)
+        changes = SettingsManager.diff_settings(self._last_emitted, settings)
+        if not changes:
+            return
+        self._last_emitted = settings
+        
+        # Applied in memory now; the disk write is debounced while sliders move
+        SettingsManager.update_settings(changes)
         self.settings_changed.emit(settings)
+        self.settings_diff.emit(changes)
+        for key, value in changes.items():
+            self.setting_changed.emit(key, value)
+
+    def hideEvent(self, event):
+        # Persist anything still waiting on the debounce timer
+        SettingsManager.flush()
+        super().hideEvent(event)
 
     def closeEvent(self, event):
         # Minimize instead of close if this was a separate window, 
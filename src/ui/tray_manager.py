@@ -1,7 +1,7 @@
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu
-from PySide6.QtGui import QIcon, QAction, QImage, QPixmap
+from PySide6.QtGui import QIcon, QAction, QImage, QPixmap, QPainter, QColor
 from PySide6.QtCore import Signal, QObject, Qt
-from ui.about_dialog import AboutDialog
+import os
 
 class TrayIconManager(QObject):
     # Signals
@@ -22,14 +22,12 @@ class TrayIconManager(QObject):
         self.tray_icon = QSystemTrayIcon(parent)
         
         # Try to load real icon
-        import os
         icon_path = os.path.join(os.getcwd(), 'assets', 'icon.png')
         
         if os.path.exists(icon_path):
              self.normal_icon = QIcon(icon_path)
         else:
             # Fallback to generated pixel
-            from PySide6.QtGui import QPixmap, QPainter, QColor
             pixmap = QPixmap(16, 16)
             pixmap.fill(Qt.transparent)
             painter = QPainter(pixmap)
@@ -148,6 +146,8 @@ class TrayIconManager(QObject):
 
     def show_about_dialog(self):
         if not self.about_dialog:
+            # Imported on first use; the About dialog isn't needed at startup
+            from ui.about_dialog import AboutDialog
             self.about_dialog = AboutDialog()
         
         self.about_dialog.show()
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from PySide6.QtCore import QObject, Signal
+
+class BackgroundWriter(QObject):
+    """
+    Single worker thread that owns log and settings persistence,
+    keeping disk I/O off the GUI thread.
+
+    Jobs submitted with coalesce=True replace any queued job with the same key
+    (latest wins, e.g. settings). Other jobs run strictly in submission order
+    (e.g. log appends). Until start() is called, jobs run synchronously,
+    which keeps scripts and tests simple.
+    """
+    write_finished = Signal(str) # key
+    write_failed = Signal(str, str) # key, error message
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        """Returns the shared application-wide writer."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._cond = threading.Condition()
+        self._pending = OrderedDict() # internal key -> (key, job)
+        self._active_key = None
+        self._seq = 0
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name="BackgroundWriter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Flushes everything still queued, then stops the worker (call on app quit)."""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, job, key, coalesce=False):
+        """
+        Queues job() for the writer thread.
+        key: identifies the target (usually the file path) for coalescing and signals.
+        """
+        with self._cond:
+            running = self._running
+            if running:
+                if coalesce:
+                    internal_key = key
+                else:
+                    self._seq += 1
+                    internal_key = (key, self._seq)
+                # Replacing an existing key keeps its place in the queue
+                self._pending[internal_key] = (key, job)
+                self._cond.notify_all()
+
+        if not running:
+            self._run_job(key, job)
+
+    def has_pending(self, key):
+        """True while a job for key is queued or being written."""
+        with self._cond:
+            if self._active_key == key:
+                return True
+            return any(k == key for k, _ in self._pending.values())
+
+    def wait(self, key, timeout=None):
+        """Blocks until no job for key is queued or being written."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._active_key != key and all(k != key for k, _ in self._pending.values()),
+                timeout
+            )
+
+    def flush(self, timeout=None):
+        """Blocks until all queued jobs have been written."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and self._active_key is None, timeout
+            )
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._pending:
+                    # Stopped and fully drained
+                    return
+                _, (key, job) = self._pending.popitem(last=False)
+                self._active_key = key
+
+            self._run_job(key, job)
+
+            with self._cond:
+                self._active_key = None
+                self._cond.notify_all()
+
+    def _run_job(self, key, job):
+        try:
+            job()
+        except Exception as e:
+            print(f"BackgroundWriter: Error writing {key}: {e}")
+            self.write_failed.emit(key, str(e))
+        else:
+            self.write_finished.emit(key)
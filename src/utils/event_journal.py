@@ -0,0 +1,231 @@
+import os
+import math
+import struct
+import time
+from collections import namedtuple
+from PySide6.QtCore import QCoreApplication, QTimer
+from utils.background_writer import BackgroundWriter
+
+# Event codes
+START = 1           # Timer started/resumed
+PAUSE = 2           # Timer paused/stopped
+RESET = 3           # reset_timer()
+STATE = 4           # Switched to a new slot (work/break/long break)
+DURATIONS = 5       # Durations/schedule edited (the current period restarts if its own duration changed)
+WORK_COMPLETED = 6  # A work period ran to the end
+SCHEDULE = 7        # Written just before DURATIONS: the new schedule's shape (see encode_schedule)
+
+# Slot kinds
+KIND_WORK = 0
+KIND_BREAK = 1
+KIND_LONG_BREAK = 2
+# Set in the kind byte while the timer is running, so every record carries the full state
+RUNNING_FLAG = 0x80
+
+JournalEvent = namedtuple("JournalEvent", ["timestamp", "event", "kind", "running", "slot", "value"])
+ScheduleShape = namedtuple("ScheduleShape", ["work_minutes", "break_minutes", "long_break_minutes",
+                                             "cycles_before_long_break"])
+
+
+def encode_schedule(schedule):
+    """
+    Packs a schedule's shape into a SCHEDULE record's value: one byte each for
+    the work, short break and long break minutes and the long-break cadence
+    (0 for a period the schedule doesn't have). Values are capped at 255.
+    """
+    def minutes(kind):
+        return next((slot.duration // 60 for slot in schedule.slots if slot.kind == kind), 0)
+    has_long = any(slot.kind == "long_break" for slot in schedule.slots)
+    fields = (minutes("work"), minutes("break"), minutes("long_break"),
+              schedule.work_per_cycle if has_long else 0)
+    value = 0
+    for shift, field in enumerate(fields):
+        value |= min(255, field) << (8 * shift)
+    return value
+
+
+def decode_schedule(value):
+    """The ScheduleShape packed into a SCHEDULE record's value by encode_schedule()."""
+    return ScheduleShape(*((value >> (8 * shift)) & 0xFF for shift in range(4)))
+
+
+class EventJournal:
+    """
+    Append-only binary journal of what the timer actually did.
+    Each event is one fixed-width 16-byte record:
+        float64 unix timestamp | uint8 event | uint8 kind (+ running flag) | uint16 slot | uint32 value
+    value is the whole seconds remaining in the period when the event happened,
+    except for SCHEDULE, whose value packs the durations just edited (decode_schedule()).
+    Every record describes the whole timer state (a SCHEDULE record is always
+    followed by a DURATIONS one with the remaining time), so a scan can start
+    anywhere without replaying earlier events. Records are buffered in memory and
+    flushed in batches through the background writer, so the timer never waits
+    on disk. Fixed-width, time-ordered records mean years of history stay in
+    the hundreds of KB and a time range is found by binary search.
+    """
+    RECORD = struct.Struct("<dBBHI")
+    MAGIC = b"TOMOJRN1".ljust(RECORD.size, b"\0") # Header occupies one record slot
+    FLUSH_INTERVAL_MS = 30000
+    MAX_BUFFERED = 256
+
+    def __init__(self, data_dir="user_data", filename="timer_events.bin", clock=time.time):
+        self.data_dir = os.path.join(os.getcwd(), data_dir)
+        self.filepath = os.path.join(self.data_dir, filename)
+        self._clock = clock
+        self._buffer = bytearray()
+        self._flush_timer = None
+        self._ensure_file_exists()
+
+    def _ensure_file_exists(self):
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+        if not os.path.exists(self.filepath):
+            with open(self.filepath, 'wb') as f:
+                f.write(self.MAGIC)
+
+    # --- Writing ---
+
+    def attach(self, engine):
+        """Records the engine's starts, pauses, resets, state switches and duration edits."""
+        engine.running_changed.connect(lambda running: self._record_engine(engine, START if running else PAUSE))
+        engine.timer_reset.connect(lambda: self._record_engine(engine, RESET))
+        engine.state_changed.connect(lambda state: self._record_engine(engine, STATE))
+        engine.schedule_changed.connect(lambda: self._record_schedule(engine))
+        # Emitted after the engine already moved to the break, so record the work slot explicitly
+        engine.work_completed.connect(lambda: self.record(WORK_COMPLETED, KIND_WORK, True, 0, 0))
+
+    def _record_engine(self, engine, event):
+        # remaining_seconds only moves on wake-ups (sparse in power saver); the
+        # snapshot derives the exact time left from the deadline
+        remaining = math.ceil(engine.snapshot()["remaining"])
+        self.record(event, self._kind_code(engine.current_kind, engine.current_state),
+                    engine.is_running, engine.current_slot, remaining)
+
+    def _record_schedule(self, engine):
+        self.record(SCHEDULE, self._kind_code(engine.current_kind, engine.current_state),
+                    engine.is_running, engine.current_slot, encode_schedule(engine.schedule))
+        self._record_engine(engine, DURATIONS)
+
+    @staticmethod
+    def _kind_code(kind, state):
+        if kind == "long_break":
+            return KIND_LONG_BREAK
+        return KIND_WORK if state == "work" else KIND_BREAK
+
+    def record(self, event, kind, running, slot, value, timestamp=None):
+        """Buffers one event; it reaches disk with the next batch."""
+        timestamp = self._clock() if timestamp is None else timestamp
+        kind_byte = kind | (RUNNING_FLAG if running else 0)
+        self._buffer += self.RECORD.pack(timestamp, event, kind_byte, slot & 0xFFFF, max(0, int(value)))
+
+        if len(self._buffer) >= self.MAX_BUFFERED * self.RECORD.size:
+            self.flush()
+        elif QCoreApplication.instance() is None:
+            # No event loop to run the batch timer (scripts/tests): write through
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_timer is None:
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.timeout.connect(self.flush)
+        # Not restarted by later events: a batch is at most FLUSH_INTERVAL_MS old
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self.FLUSH_INTERVAL_MS)
+
+    def flush(self):
+        """Hands the buffered batch to the background writer as one append."""
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+        if not self._buffer:
+            return
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        filepath = self.filepath
+
+        def write():
+            with open(filepath, 'ab') as f:
+                f.write(data)
+
+        BackgroundWriter.instance().submit(write, key=filepath)
+
+    # --- Reading ---
+
+    def _read_records(self):
+        """All record bytes (file + unflushed batch), header stripped, cut to whole records."""
+        BackgroundWriter.instance().flush()
+        try:
+            with open(self.filepath, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        if data.startswith(self.MAGIC):
+            data = data[len(self.MAGIC):]
+        # A crash mid-append can leave a partial record at the end; ignore it
+        data = data[:len(data) - len(data) % self.RECORD.size]
+        return memoryview(data + bytes(self._buffer))
+
+    def _bisect(self, records, timestamp):
+        """Index of the first record at or after `timestamp` (records are time-ordered)."""
+        lo, hi = 0, len(records) // self.RECORD.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.RECORD.unpack_from(records, mid * self.RECORD.size)[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def iter_events(self, since=None, until=None):
+        """Yields JournalEvents with since <= timestamp < until, oldest first."""
+        records = self._read_records()
+        start = self._bisect(records, since) if since is not None else 0
+        for fields in self.RECORD.iter_unpack(records[start * self.RECORD.size:]):
+            if until is not None and fields[0] >= until:
+                break
+            yield self._decode(fields)
+
+    @staticmethod
+    def _decode(fields):
+        timestamp, event, kind_byte, slot, value = fields
+        return JournalEvent(timestamp, event, kind_byte & ~RUNNING_FLAG,
+                            bool(kind_byte & RUNNING_FLAG), slot, value)
+
+    def focused_seconds(self, since=None, until=None, now=None):
+        """
+        Seconds actually spent running in a work period within [since, until).
+        Each interval is capped at the time the period had left, so downtime
+        after a crash or quit never counts beyond the end of the period.
+        """
+        now = self._clock() if now is None else now
+        until = now if until is None else min(until, now)
+        lo = since if since is not None else float("-inf")
+
+        # Start from the last event before `since` to know the state at that moment
+        records = self._read_records()
+        start = max(0, self._bisect(records, since) - 1) if since is not None else 0
+
+        total = 0.0
+        focused = False
+        last, cap = None, 0
+        for fields in self.RECORD.iter_unpack(records[start * self.RECORD.size:]):
+            event = self._decode(fields)
+            if event.event == SCHEDULE:
+                continue # Carries durations, not the time left; DURATIONS follows
+            if focused:
+                total += self._overlap(last, min(event.timestamp, last + cap), lo, until)
+            if event.timestamp >= until:
+                return total
+            focused = (event.running and event.kind == KIND_WORK
+                       and event.event != WORK_COMPLETED)
+            last, cap = event.timestamp, event.value
+
+        if focused:
+            total += self._overlap(last, last + cap, lo, until)
+        return total
+
+    @staticmethod
+    def _overlap(start, end, lo, hi):
+        return max(0.0, min(end, hi) - max(start, lo))
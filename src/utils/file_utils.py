@@ -0,0 +1,19 @@
+import json
+import os
+import tempfile
+
+def write_json_atomic(filepath, data, indent=4):
+    """
+    Writes JSON to a temp file in the same directory and renames it over the target,
+    so a crash mid-write can never leave a truncated file behind.
+    """
+    directory = os.path.dirname(filepath) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -1,70 +1,458 @@
 import json
 import os
+import shutil
+from bisect import bisect_left
 from datetime import datetime
+from itertools import islice
+from utils.task_registry import TaskRegistry
+from utils.background_writer import BackgroundWriter
+from utils.search_index import SearchIndex
+
+# Marker key for records that patch the previous entry instead of adding a new one.
+AMEND_KEY = "_amend"
+
+
+def create_log_manager():
+    """
+    Returns the work log store selected by the 'log_backend' setting:
+    "json" (default, append-only JSONL) or "sqlite".
+    """
+    from utils.settings_manager import SettingsManager
+    backend = SettingsManager.load_settings().get('log_backend', 'json')
+    if backend == 'sqlite':
+        from utils.sqlite_log_manager import SqliteLogManager
+        return SqliteLogManager()
+    return LogManager()
+
+
+def iso_timestamp(value):
+    """Query bound as a comparable ISO string (datetime or ISO string; None stays None)."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def read_log_file(filepath):
+    """
+    Reads a work log file and returns the list of entries.
+    Understands both the legacy JSON array format and the append-only
+    JSONL format (one record per line, with amend records applied in order).
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return []
+
+    stripped = content.lstrip()
+    if stripped.startswith('['):
+        # Legacy format: the whole history is a single JSON array
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            return []
+
+    logs = []
+    for line in content.splitlines():
+        record = _parse_record(line)
+        if record is None:
+            continue
+        if record.pop(AMEND_KEY, False):
+            if logs:
+                logs[-1].update(record)
+        else:
+            logs.append(record)
+    return logs
+
+
+def _parse_record(line):
+    """Parses one JSONL line. Blank or truncated lines (e.g. after a crash) are skipped."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return record if isinstance(record, dict) else None
+
 
 class LogManager:
     """
-    Manages reading and writing work logs to a JSON file.
+    Manages reading and writing work logs.
+    Entries are stored append-only in a JSONL file: one record per line.
+    Promoting a 'planned' entry to 'completed' appends a small amend record
+    instead of rewriting the history.
+    Parsed entries are kept in an indexed in-memory cache that is only
+    refreshed when the file's mtime or size changes. Task IDs are assigned
+    by a persistent TaskRegistry.
+    version()/get_changes() let readers such as the log viewer pick up only
+    what was appended since they last looked. search() runs over a persisted
+    SearchIndex that every save updates. query() filters through the cache's
+    indexes: a timestamp-sorted array and per-task / per-status posting lists.
     """
-    def __init__(self, data_dir="user_data", filename="work_logs.json"):
+    LEGACY_FILENAME = "work_logs.json"
+
+    def __init__(self, data_dir="user_data", filename="work_logs.jsonl"):
         self.data_dir = os.path.join(os.getcwd(), data_dir)
         self.filepath = os.path.join(self.data_dir, filename)
+        self.legacy_filepath = os.path.join(self.data_dir, self.LEGACY_FILENAME)
         self._ensure_file_exists()
+        self._generation = 0 # Bumped whenever the cache is rebuilt from scratch
+        self._reset_cache()
+
+        # Stable Task IDs live next to the log file
+        stem = os.path.splitext(filename)[0]
+        self.task_registry = TaskRegistry(os.path.join(self.data_dir, f"{stem}.tasks.json"))
+        if not self.task_registry.exists():
+            self.task_registry.bootstrap(self.get_all_logs())
+
+        # Full-text index over task names and reflections, loaded on first search
+        self.search_index = SearchIndex(os.path.join(self.data_dir, f"{stem}.search.json"))
+        self._search_version = None
 
     def _ensure_file_exists(self):
         """Creates the data directory and empty logs file if they don't exist."""
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
-        
-        if not os.path.exists(self.filepath):
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4)
 
-    def get_all_logs(self):
-        """Returns a list of all log entries."""
+        if os.path.exists(self.filepath):
+            # Older builds may still point us at a JSON array file
+            if self._is_legacy_format(self.filepath):
+                self._migrate_legacy_file(self.filepath)
+        elif os.path.exists(self.legacy_filepath):
+            self._migrate_legacy_file(self.legacy_filepath)
+        else:
+            open(self.filepath, 'w', encoding='utf-8').close()
+
+    @staticmethod
+    def _is_legacy_format(filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return f.read(64).lstrip().startswith('[')
+
+    def _migrate_legacy_file(self, source_path):
+        """
+        One-time migration from a legacy JSON array file.
+        The old file is kept as <name>.bak so the migration never runs twice.
+        The new file is in place before the old one is moved aside, so a crash
+        at any point leaves the entries in one of the two.
+        """
+        logs = read_log_file(source_path)
+        backup_path = source_path + ".bak"
+
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in logs:
+                f.write(self._encode(entry))
+        if os.path.abspath(source_path) == os.path.abspath(self.filepath):
+            # Converting in place: the replace below overwrites the source, so copy it first
+            shutil.copyfile(source_path, backup_path)
+            os.replace(tmp_path, self.filepath)
+        else:
+            os.replace(tmp_path, self.filepath)
+            os.replace(source_path, backup_path)
+        print(f"LogManager: Migrated {len(logs)} entries to {self.filepath}")
+
+    @staticmethod
+    def _encode(record):
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def _append(self, record):
+        """Queues the record on the background writer and applies it to the cache right away."""
+        data = self._encode(record).encode('utf-8')
+        filepath = self.filepath
+
+        def write():
+            with open(filepath, 'ab') as f:
+                f.write(data)
+
+        BackgroundWriter.instance().submit(write, key=filepath)
+        self._index_record(dict(record))
+        self._offset += len(data)
+
+    # --- Indexed cache ---
+
+    def _reset_cache(self):
+        self._entries = []
+        self._task_order = {}   # task name -> first-seen ordinal (1-based)
+        self._by_task = {}      # task name -> positions of its entries, ascending
+        self._by_status = {}    # status -> positions, ascending
+        self._by_time = []      # (timestamp, position), sorted when _by_time_sorted
+        self._by_time_sorted = True
+        self._chronological = True # Log order == time order (so posting lists are time ordered)
+        self._offset = 0        # bytes of the file already parsed
+        self._signature = None
+        self._revision = 0      # records indexed (entries and amends)
+        self._generation += 1
+
+    def _refresh_cache(self):
+        """
+        Reloads the cache only when the file's mtime or size changed.
+        Since the file is append-only, growth is handled by parsing just the new tail.
+        """
+        if self._signature is None:
+            # First load: let appends queued by other instances land first, or our
+            # own appends would later be counted against a misaligned offset
+            BackgroundWriter.instance().wait(self.filepath)
+
         try:
-            with open(self.filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            self._reset_cache()
+            return
+
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return
+
+        if st.st_size < self._offset and BackgroundWriter.instance().has_pending(self.filepath):
+            # Our own appends are still queued on the writer; the cache is already ahead
+            return
+
+        cached = self._signature
+        if cached is None or cached[0] != st.st_ino or st.st_size < self._offset:
+            # First load, file replaced or truncated: rebuild from scratch
+            self._reset_cache()
+
+        with open(self.filepath, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        # Leave a trailing partial line (write in progress) for the next refresh
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            record = _parse_record(line)
+            if record is not None:
+                self._index_record(record)
+
+        self._offset += end
+        self._signature = signature
+
+    def _index_record(self, record):
+        self._revision += 1
+        if record.pop(AMEND_KEY, False):
+            if not self._entries:
+                return
+            position = len(self._entries) - 1
+            last = self._entries[position]
+            self._unindex_entry(position, last)
+            last.update(record)
+            self._index_entry(position, last)
+        else:
+            self._entries.append(record)
+            self._index_entry(len(self._entries) - 1, record)
+
+    def _index_entry(self, position, entry):
+        name = entry.get('task_name')
+        if name:
+            if name not in self._task_order:
+                self._task_order[name] = len(self._task_order) + 1
+            self._by_task.setdefault(name, []).append(position)
+        self._by_status.setdefault(entry.get('status', 'completed'), []).append(position)
+        item = (entry.get('timestamp') or '', position)
+        if self._by_time and item < self._by_time[-1]:
+            # Logged out of order (e.g. clock change): query() sorts once when needed
+            self._chronological = False
+            self._by_time_sorted = False
+        self._by_time.append(item)
+
+    def _unindex_entry(self, position, entry):
+        # Only ever called for the last entry: it is at the end of every
+        # posting list, and a task that disappears is always the most
+        # recently introduced one.
+        name = entry.get('task_name')
+        if name and name in self._by_task:
+            self._by_task[name].pop()
+            if not self._by_task[name]:
+                del self._by_task[name]
+                del self._task_order[name]
+        status = entry.get('status', 'completed')
+        self._by_status[status].pop()
+        if not self._by_status[status]:
+            del self._by_status[status]
+        item = (entry.get('timestamp') or '', position)
+        if self._by_time[-1] == item:
+            self._by_time.pop()
+        elif self._by_time_sorted:
+            del self._by_time[bisect_left(self._by_time, item)]
+        else:
+            self._by_time.remove(item)
+
+    def get_all_logs(self):
+        """
+        Returns a list of all log entries. Like every entry this class hands
+        out, they are copies: changing them can't corrupt the cache or indexes.
+        """
+        self._refresh_cache()
+        return [dict(entry) for entry in self._entries]
+
+    def version(self):
+        """
+        Opaque token that changes whenever the log changes.
+        Costs one stat() when the file is untouched.
+        """
+        self._refresh_cache()
+        return (self._generation, len(self._entries), self._revision)
+
+    def get_changes(self, version=None):
+        """
+        Returns (version, start, entries): the log entries from position `start`
+        on that are new or changed since `version` (a token from version() or a
+        previous call). Amends only ever touch the last entry, so `start` is
+        either the old entry count or one less when that entry was amended.
+        start is 0 with the whole log when version is None or the file was
+        replaced; entries is empty when nothing changed.
+        """
+        current, start, entries = self._changes(version)
+        return current, start, [dict(entry) for entry in entries]
+
+    def _changes(self, version):
+        """get_changes() without the copies (the cached entries themselves)."""
+        current = self.version()
+        if version is None or version[0] != current[0] or version[1] > current[1]:
+            return current, 0, self._entries
+
+        _, count, revision = version
+        start = count
+        if current[2] - revision > current[1] - count and count > 0:
+            # More records than new entries: the previous last entry was amended
+            start = count - 1
+        return current, start, self._entries[start:]
+
+    def query(self, task=None, since=None, until=None, status=None, min_rating=None,
+              limit=None, order="asc"):
+        """
+        Lazily yields the entries matching every given filter, by timestamp
+        (order "asc": oldest first, "desc": newest first).
+        task/status: exact match. since/until: datetime or ISO string, [since, until).
+        min_rating: rating >= value. limit: stop after that many entries.
+        The smallest of the time range and the task/status posting lists is
+        walked; the other filters are checked per entry.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order: {order}")
+        self._refresh_cache()
+        since, until = iso_timestamp(since), iso_timestamp(until)
+        if not self._by_time_sorted:
+            self._by_time.sort()
+            self._by_time_sorted = True
+
+        lo = bisect_left(self._by_time, (since,)) if since is not None else 0
+        hi = bisect_left(self._by_time, (until,)) if until is not None else len(self._by_time)
+        candidates = [(max(0, hi - lo), None)]
+        if task is not None:
+            positions = self._by_task.get(task, [])
+            candidates.append((len(positions), positions))
+        if status is not None:
+            positions = self._by_status.get(status, [])
+            candidates.append((len(positions), positions))
+        _, positions = min(candidates, key=lambda candidate: candidate[0])
+
+        descending = order == "desc"
+        if positions is None:
+            # The time range itself is the smallest set and already sorted
+            by_time = self._by_time
+            indices = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+            ordered = (by_time[i][1] for i in indices)
+        elif self._chronological:
+            # Posting lists are in log order, which is time order here
+            ordered = positions[::-1] if descending else list(positions)
+        else:
+            entries = self._entries
+            ordered = sorted(positions, key=lambda p: (entries[p].get('timestamp') or '', p),
+                             reverse=descending)
+
+        def matches(entry):
+            if task is not None and entry.get('task_name') != task:
+                return False
+            if status is not None and entry.get('status', 'completed') != status:
+                return False
+            timestamp = entry.get('timestamp') or ''
+            if since is not None and timestamp < since:
+                return False
+            if until is not None and timestamp >= until:
+                return False
+            return min_rating is None or (entry.get('rating') or 0) >= min_rating
+
+        results = (dict(entry) for entry in map(self._entries.__getitem__, ordered) if matches(entry))
+        return islice(results, limit)
+
+    def get_logs_for_task(self, task_name):
+        """Returns all entries for a task, oldest first."""
+        return list(self.query(task=task_name))
+
+    def get_logs_between(self, since=None, until=None):
+        """
+        Returns entries whose timestamp falls in [since, until), oldest first.
+        since/until: datetime or ISO string, either may be None.
+        """
+        return list(self.query(since=since, until=until))
+
+    def search(self, query, limit=50):
+        """
+        Returns entries whose task name or reflections contain every word of
+        `query` (the last word may be partial), best match first.
+        """
+        # Index whatever other writers added since the last search
+        self._sync_search_index()
+        return [dict(self._entries[position]) for position in self.search_index.search(query, limit)]
+
+    def _sync_search_index(self):
+        self._search_version, start, entries = self._changes(self._search_version)
+        self.search_index.sync(start, entries)
+
+    def prepare_search(self):
+        """
+        Loads and catches up the search index (and folds its journal into the
+        snapshot when due), so later searches are instant. Slow on first use;
+        meant for a worker thread such as the log viewer's loader.
+        """
+        self._sync_search_index()
+        if self.search_index.needs_compaction():
+            self.search_index.compact()
+
+    def get_task_names(self):
+        """Returns unique task names in order of first appearance."""
+        self._refresh_cache()
+        return list(self._task_order)
 
     def save_log(self, entry):
         """
         Saves a single log entry.
         entry: dict containing log details.
         """
-        logs = self.get_all_logs()
-        
         # Add timestamp if not present
         if 'timestamp' not in entry:
             entry['timestamp'] = datetime.now().isoformat()
-            
+
+        # Make sure the cache (and its file offset) is current before appending
+        self._refresh_cache()
+
         # Check status
         status = entry.get('status', 'completed')
-        
-        if status == 'completed':
-            # Check if previous log was 'planned'
-            if logs and logs[-1].get('status') == 'planned':
-                # Update the existing planned log instead of appending
-                # We overwrite keys with new data
-                logs[-1].update(entry)
-            else:
-                logs.append(entry)
+
+        if status == 'completed' and self.get_pending_plan() is not None:
+            # Update the existing planned log instead of appending
+            # We overwrite keys with new data
+            amend = dict(entry)
+            amend[AMEND_KEY] = True
+            self._append(amend)
         else:
             # For 'planned' or other statuses, always append
-            logs.append(entry)
-        
-        with open(self.filepath, 'w', encoding='utf-8') as f:
-            json.dump(logs, f, indent=4, ensure_ascii=False)
+            self._append(entry)
+
+        # Either way the affected entry is now the last one
+        self.search_index.add(len(self._entries) - 1, self._entries[-1])
+
+        self.task_registry.record(entry.get('task_name'), entry['timestamp'],
+                                  completed=(status == 'completed'))
 
     def get_pending_plan(self):
         """
         Returns the last log ONLY IF its status is 'planned'.
         Otherwise returns None.
         """
-        logs = self.get_all_logs()
-        if logs and logs[-1].get('status') == 'planned':
-            return logs[-1]
+        self._refresh_cache()
+        if self._entries and self._entries[-1].get('status') == 'planned':
+            return dict(self._entries[-1])
         return None
 
     def get_next_session_number(self, task_name):
@@ -72,38 +460,19 @@ class LogManager:
         Returns the next session number for a given task name.
         Counts how many entries have the exact same 'task_name'.
         """
-        logs = self.get_all_logs()
-        count = 0
-        for log in logs:
-            if log.get('task_name') == task_name:
-                count += 1
-        return count + 1
+        self._refresh_cache()
+        return len(self._by_task.get(task_name, ())) + 1
 
     def get_last_task_name(self):
         """Returns the task name of the most recent log, or empty string."""
-        logs = self.get_all_logs()
-        if not logs:
+        self._refresh_cache()
+        if not self._entries:
             return ""
-        return logs[-1].get('task_name', "")
+        return self._entries[-1].get('task_name', "")
 
     def get_task_id(self, task_name):
         """
         Generates or retrieves a Task ID (e.g., #T1) for a given task name.
-        This simple implementation assigns ID based on order of appearance of unique task names.
+        IDs come from the persistent task registry and never shift.
         """
-        if not task_name:
-            return ""
-            
-        logs = self.get_all_logs()
-        unique_tasks = []
-        for log in logs:
-            name = log.get('task_name')
-            if name and name not in unique_tasks:
-                unique_tasks.append(name)
-        
-        # If this is a new task not in history yet, append it to calculation
-        if task_name not in unique_tasks:
-             unique_tasks.append(task_name)
-             
-        index = unique_tasks.index(task_name) + 1
-        return f"#T{index}"
+        return self.task_registry.get_id(task_name)
@@ -0,0 +1,323 @@
+import json
+import math
+import os
+import re
+import unicodedata
+import zlib
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
+from utils.background_writer import BackgroundWriter
+
+# Fields that are searched: the task name plus the reflection notes
+SEARCH_FIELDS = ("task_name", "deliverables", "good_bad", "better_way", "wishes")
+# A word in the task name counts this many times when ranking
+TASK_NAME_WEIGHT = 2
+# A prefix (the word still being typed) expands to at most this many terms
+MAX_PREFIX_TERMS = 100
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase words with accents removed ("Café" -> "cafe"),
+    which matches what SQLite's unicode61 tokenizer does.
+    """
+    if not text:
+        return []
+    text = str(text).lower()
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return _WORD_RE.findall(text)
+
+
+def document_terms(entry):
+    """Term frequencies ({term: count}) of one log entry over SEARCH_FIELDS."""
+    words = []
+    for field in SEARCH_FIELDS:
+        field_words = tokenize(entry.get(field))
+        words.extend(field_words * TASK_NAME_WEIGHT if field == "task_name" else field_words)
+    return dict(Counter(words))
+
+
+def fingerprint(entry):
+    """Cheap checksum of the searchable text, used to skip unchanged entries."""
+    text = "\x1f".join(str(entry.get(field) or "") for field in SEARCH_FIELDS)
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class SearchIndex:
+    """
+    Inverted index over task names and reflection notes, ranked by TF-IDF.
+    Documents are log positions 0..n-1 (0 = oldest entry). The log only grows
+    at the end, amends touch the last entry and a rewritten log is re-synced
+    from its first difference, so every update happens at the tail: postings
+    are parallel lists of ascending positions and term frequencies.
+
+    On disk: a JSON snapshot that loads in one json.load() plus an append-only
+    journal of the records written since, both through the BackgroundWriter.
+    Nothing is read until the first query. Every record carries a fingerprint
+    of the entry, so sync() can repair whatever the files missed.
+    """
+    COMPACT_AFTER = 1000 # Journal records before compact() folds them into the snapshot
+
+    def __init__(self, filepath):
+        """filepath: the snapshot (.json); the journal sits next to it (.journal.jsonl)."""
+        self.filepath = filepath
+        self.journal_path = os.path.splitext(filepath)[0] + ".journal.jsonl"
+        self._loaded = False
+        self._reset()
+        self._journal = 0 # Records in the journal
+
+    def _reset(self):
+        self._crcs = []     # fingerprint per position (None: unknown, re-index)
+        self._lengths = []  # words per position
+        self._norms = []    # 1 / sqrt(length) per position
+        self._postings = {} # term -> [[positions ascending], [term frequencies]]
+        self._terms = None  # sorted terms for prefix lookups, rebuilt when needed
+
+    def __len__(self):
+        self.load()
+        return len(self._crcs)
+
+    # --- Persistence ---
+
+    def load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._crcs = snapshot["crcs"]
+            self._lengths = snapshot["lengths"]
+            self._postings = snapshot["terms"]
+            self._norms = [1.0 / math.sqrt(n) if n else 0.0 for n in self._lengths]
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"SearchIndex: Ignoring damaged index {self.filepath}: {e}")
+            self._reset()
+
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue # Truncated by a crash; sync() re-indexes what is missing
+                    self._apply(record)
+                    self._journal += 1
+        except FileNotFoundError:
+            pass
+
+    def _write(self, records):
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(',', ':')) + "\n" for r in records)
+        journal_path = self.journal_path
+
+        def append():
+            with open(journal_path, 'a', encoding='utf-8') as f:
+                f.write(data)
+
+        BackgroundWriter.instance().submit(append, key=journal_path)
+        self._journal += len(records)
+
+    def needs_compaction(self):
+        return self._journal > self.COMPACT_AFTER
+
+    def compact(self):
+        """
+        Writes a fresh snapshot and empties the journal. The snapshot is
+        serialized by the caller (best done off the GUI thread, e.g. by the
+        log viewer's loader); the BackgroundWriter writes it out.
+        """
+        self.load()
+        data = json.dumps({"crcs": self._crcs, "lengths": self._lengths, "terms": self._postings},
+                          ensure_ascii=False, separators=(',', ':'))
+        snapshot_path, journal_path = self.filepath, self.journal_path
+
+        def rewrite():
+            tmp_path = snapshot_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, snapshot_path)
+            # Replaying a stale journal over the new snapshot is harmless, so no need to be atomic here
+            open(journal_path, 'w', encoding='utf-8').close()
+
+        # Same key as the journal appends, so the two stay in order
+        BackgroundWriter.instance().submit(rewrite, key=journal_path)
+        self._journal = 0
+
+    # --- Updates ---
+
+    @staticmethod
+    def _record(position, entry, crc=None):
+        return {"doc": position, "crc": fingerprint(entry) if crc is None else crc,
+                "terms": document_terms(entry)}
+
+    def _is_current(self, position, crc):
+        return position < len(self._crcs) and self._crcs[position] == crc
+
+    def add(self, position, entry):
+        """
+        Indexes (or re-indexes) the entry at `position`. Called on every save;
+        if the index was never loaded, the record is only appended to the journal.
+        """
+        crc = fingerprint(entry)
+        if self._loaded and self._is_current(position, crc):
+            return
+        record = self._record(position, entry, crc)
+        if self._loaded:
+            self._apply(record)
+        self._write([record])
+
+    def sync(self, start, entries):
+        """
+        Brings the index in line with a store's get_changes() result: entries
+        from position `start` on. start == 0 means the whole log, so documents
+        past its end are dropped. Large catch-ups go straight to a new snapshot.
+        """
+        self.load()
+        records = []
+        for position, entry in enumerate(entries, start):
+            crc = fingerprint(entry)
+            if self._is_current(position, crc):
+                continue
+            record = self._record(position, entry, crc)
+            self._apply(record)
+            records.append(record)
+
+        if start == 0 and len(self._crcs) > len(entries):
+            record = {"truncate": len(entries)}
+            self._apply(record)
+            records.append(record)
+
+        if len(records) > self.COMPACT_AFTER:
+            self.compact()
+        elif records:
+            self._write(records)
+
+    def _apply(self, record):
+        if "truncate" in record:
+            self._truncate(record["truncate"])
+            return
+
+        position = record["doc"]
+        if position < len(self._crcs):
+            if self._crcs[position] == record["crc"]:
+                return # Already indexed (e.g. a journal replayed over a newer snapshot)
+            self._truncate(position)
+        while len(self._crcs) < position:
+            # Records lost in a crash: placeholders that sync() will re-index
+            self._crcs.append(None)
+            self._lengths.append(0)
+            self._norms.append(0.0)
+
+        terms = record["terms"]
+        length = sum(terms.values())
+        self._crcs.append(record["crc"])
+        self._lengths.append(length)
+        self._norms.append(1.0 / math.sqrt(length) if length else 0.0)
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = [[position], [tf]]
+                self._terms = None
+            else:
+                postings[0].append(position)
+                postings[1].append(tf)
+
+    def _truncate(self, count):
+        """
+        Drops the documents at positions >= count. Walks the vocabulary once,
+        which is cheap next to indexing and rare (amends, rewritten logs).
+        """
+        if count >= len(self._crcs):
+            return
+        del self._crcs[count:]
+        del self._lengths[count:]
+        del self._norms[count:]
+        for term in list(self._postings):
+            positions, tfs = self._postings[term]
+            if positions[-1] < count:
+                continue
+            cut = bisect_left(positions, count)
+            if cut == 0:
+                del self._postings[term]
+                self._terms = None
+            else:
+                del positions[cut:]
+                del tfs[cut:]
+
+    # --- Queries ---
+
+    def _prefix_terms(self, prefix):
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        i = bisect_left(self._terms, prefix)
+        matches = []
+        while i < len(self._terms) and self._terms[i].startswith(prefix) and len(matches) < MAX_PREFIX_TERMS:
+            matches.append(self._terms[i])
+            i += 1
+        return matches
+
+    def _word_scores(self, postings_lists, candidates=None):
+        """
+        TF-IDF score per document for one query word (its best expanded term).
+        With `candidates`, only those documents are looked up.
+        """
+        norms = self._norms
+        doc_count = len(self._crcs)
+        scores = {}
+        for positions, tfs in postings_lists:
+            idf = math.log(1 + doc_count / len(positions))
+            if candidates is None:
+                if not scores:
+                    scores = {p: tf * norms[p] * idf for p, tf in zip(positions, tfs)}
+                    continue
+                pairs = zip(positions, tfs)
+            else:
+                # Binary search each candidate in the ascending positions
+                pairs = []
+                for p in candidates:
+                    i = bisect_left(positions, p)
+                    if i < len(positions) and positions[i] == p:
+                        pairs.append((p, tfs[i]))
+            for p, tf in pairs:
+                score = tf * norms[p] * idf
+                if score > scores.get(p, 0.0):
+                    scores[p] = score
+        return scores
+
+    def search(self, query, limit=50):
+        """
+        Positions of the documents containing every word of `query`, best
+        match first (newest first on ties). The last word also matches as a
+        prefix, so results follow the user's typing.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        self.load()
+
+        postings_per_word = []
+        for i, word in enumerate(words):
+            terms = self._prefix_terms(word) if i == len(words) - 1 else [word]
+            lists = [self._postings[t] for t in terms if t in self._postings]
+            if not lists:
+                return []
+            postings_per_word.append(lists)
+
+        # Score the rarest word first; the others only look at its documents
+        postings_per_word.sort(key=lambda lists: sum(len(positions) for positions, _ in lists))
+        scores = self._word_scores(postings_per_word[0])
+        for lists in postings_per_word[1:]:
+            word_scores = self._word_scores(lists, candidates=scores)
+            scores = {p: s + word_scores[p] for p, s in scores.items() if p in word_scores}
+            if not scores:
+                return []
+
+        best = heapq.nlargest(limit, scores.items(), key=itemgetter(1, 0))
+        return [position for position, _ in best]
@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from utils.file_utils import write_json_atomic
+from utils.background_writer import BackgroundWriter
+
+class SessionStore:
+    """
+    Crash-safe snapshot of the running timer session.
+    The snapshot is only written on transitions (state switch, pause/resume,
+    reset, schedule edits), never per tick, through the background writer as
+    an atomic replace, so a crash leaves either the old or the new snapshot.
+    On startup after a crash, logoff or reboot the session resumes with the
+    wall-clock time spent down replayed against the schedule. Quitting from
+    the tray drops the snapshot, and downtime longer than a full cycle starts
+    fresh instead.
+    """
+    VERSION = 1
+    # Downtime longer than this many cycles is not replayed (e.g. a crash overnight)
+    MAX_REPLAY_CYCLES = 1
+
+    def __init__(self, data_dir="user_data", filename="session.json"):
+        self.data_dir = os.path.join(os.getcwd(), data_dir)
+        self.filepath = os.path.join(self.data_dir, filename)
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+        self._closed = False
+
+    def attach(self, engine):
+        """Saves a snapshot whenever the engine's session changes in a way worth keeping."""
+        save = lambda *args: self.save(engine)
+        engine.state_changed.connect(save)
+        engine.running_changed.connect(save)
+        engine.schedule_changed.connect(save)
+
+    def save(self, engine):
+        if self._closed:
+            return
+        snapshot = engine.snapshot()
+        snapshot["version"] = self.VERSION
+        # Wall clock, not monotonic: we need time elapsed across reboots
+        snapshot["saved_at"] = time.time()
+        filepath = self.filepath
+        BackgroundWriter.instance().submit(
+            lambda: write_json_atomic(filepath, snapshot, indent=None),
+            key=filepath, coalesce=True
+        )
+
+    def close(self):
+        """
+        Call when the user quits: deletes the snapshot and stops saving, so the
+        next launch starts fresh. (An OS shutdown keeps it, so the session resumes.)
+        """
+        self._closed = True
+        filepath = self.filepath
+
+        def remove():
+            try:
+                os.remove(filepath)
+            except FileNotFoundError:
+                pass
+
+        # Same key as save(), so it replaces a snapshot still waiting to be written
+        BackgroundWriter.instance().submit(remove, key=filepath, coalesce=True)
+
+    def load(self):
+        """Returns the saved snapshot, or None if there is none or it can't be read."""
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"SessionStore: Error loading {self.filepath}: {e}")
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != self.VERSION:
+            return None
+        return snapshot
+
+    def restore(self, engine, now=None):
+        """
+        Resumes the engine from the saved snapshot.
+        Returns True if the session was restored, False to start fresh
+        (no snapshot, the schedule changed since it was written, or a running
+        session was down for longer than MAX_REPLAY_CYCLES cycles).
+        """
+        snapshot = self.load()
+        if snapshot is None:
+            return False
+        now = time.time() if now is None else now
+        # A clock set backwards must not rewind the timer
+        elapsed = max(0.0, now - snapshot.get("saved_at", now))
+        if snapshot.get("running") and elapsed > self.MAX_REPLAY_CYCLES * engine.schedule.cycle_seconds:
+            print(f"SessionStore: Session was down for {elapsed / 3600:.1f}h, starting fresh")
+            return False
+        if not engine.restore(snapshot, elapsed=elapsed):
+            print("SessionStore: Saved session does not match the current schedule, starting fresh")
+            return False
+        return True
@@ -1,6 +1,8 @@
 import json
 import os
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QCoreApplication, QTimer
+from utils.background_writer import BackgroundWriter
+from utils.file_utils import write_json_atomic
 
 class SettingsManager:
     REPO_SETTINGS_FILE = os.path.join(os.getcwd(), 'settings.json')
@@ -9,6 +11,8 @@ class SettingsManager:
     DEFAULT_SETTINGS = {
         "work_minutes": 25,
         "break_minutes": 5,
+        "long_break_minutes": 15,
+        "cycles_before_long_break": 0,
         "work_color": "#FFA500",
         "break_color": "#32CD32",
         "text_size": 40,
@@ -19,11 +23,30 @@ class SettingsManager:
         "run_at_startup": True,
         "timer_style": "orange",
         "orange_opacity": 0.25,
-        "work_log_enabled": False
+        "work_log_enabled": False,
+        "log_backend": "json"
     }
 
+    # Disk writes are debounced: trailing edge after this much idle time
+    SAVE_DEBOUNCE_MS = 300
+
+    # In-memory settings (authoritative once loaded) and debounce state
+    _settings = None
+    _dirty = False
+    _save_timer = None
+
     @staticmethod
     def load_settings():
+        """
+        Returns a copy of the current settings.
+        They are read from disk once, then served from memory.
+        """
+        if SettingsManager._settings is None:
+            SettingsManager._settings = SettingsManager._read_settings_files()
+        return dict(SettingsManager._settings)
+
+    @staticmethod
+    def _read_settings_files():
         """
         Load settings with a fallback hierarchy:
         1. Hardcoded DEFAULT_SETTINGS
@@ -52,11 +75,56 @@ class SettingsManager:
                 
         return settings
 
+    @staticmethod
+    def diff_settings(old, new):
+        """Returns {key: new_value} for every key whose value differs between old and new."""
+        return {key: value for key, value in new.items() if old.get(key, object()) != value}
+
+    @staticmethod
+    def update_settings(settings_dict):
+        """
+        Applies changes in memory immediately and schedules a debounced save.
+        Keys not present in settings_dict (e.g. widget position) are preserved.
+        Use this for rapid-fire changes like slider drags.
+        """
+        SettingsManager.load_settings()
+        SettingsManager._settings.update(settings_dict)
+        SettingsManager._dirty = True
+
+        if QCoreApplication.instance() is None:
+            # No event loop to debounce on (scripts/tests): write straight away
+            SettingsManager.flush()
+            return
+
+        if SettingsManager._save_timer is None:
+            timer = QTimer()
+            timer.setSingleShot(True)
+            timer.setInterval(SettingsManager.SAVE_DEBOUNCE_MS)
+            timer.timeout.connect(SettingsManager.flush)
+            SettingsManager._save_timer = timer
+        # Restarting pushes the write to the trailing edge of the burst
+        SettingsManager._save_timer.start()
+
     @staticmethod
     def save_settings(settings_dict):
-        """Save settings dict to custom_settings.json to avoid polluting the repo."""
-        try:
-            with open(SettingsManager.CUSTOM_SETTINGS_FILE, 'w') as f:
-                json.dump(settings_dict, f, indent=4)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        """Save settings to custom_settings.json (avoids polluting the repo) without debouncing."""
+        SettingsManager.update_settings(settings_dict)
+        SettingsManager.flush()
+
+    @staticmethod
+    def flush():
+        """
+        Writes pending changes now (call on hide/quit).
+        The write is atomic (temp file + rename) and runs on the background writer.
+        """
+        if SettingsManager._save_timer is not None:
+            SettingsManager._save_timer.stop()
+        if not SettingsManager._dirty:
+            return
+        SettingsManager._dirty = False
+
+        snapshot = dict(SettingsManager._settings)
+        filepath = SettingsManager.CUSTOM_SETTINGS_FILE
+        BackgroundWriter.instance().submit(
+            lambda: write_json_atomic(filepath, snapshot), key=filepath, coalesce=True
+        )
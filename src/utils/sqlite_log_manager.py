@@ -0,0 +1,349 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from utils.log_manager import read_log_file, iso_timestamp
+from utils.task_registry import TaskRegistry
+from utils.background_writer import BackgroundWriter
+from utils.search_index import SEARCH_FIELDS, TASK_NAME_WEIGHT, tokenize
+
+class SqliteLogManager:
+    """
+    SQLite-backed alternative to LogManager with the same public interface.
+    Task name, timestamp and status are indexed columns, so per-task and
+    date-range lookups don't need to deserialize the whole history.
+    The full entry is kept as JSON in the 'data' column.
+    Task names and reflections are also kept in an FTS5 table (maintained by
+    triggers, so writes from any connection are indexed) for search().
+    Every insert or update stamps its row with the next value of a store-wide
+    revision counter, which is how readers find out what changed (get_changes()).
+    Saves run on the background writer (on their own connection), like the
+    JSONL log's appends; reads wait for this database's queued saves first, so
+    a read right after save_log() already sees it.
+    """
+    # Files imported automatically when the database is first created
+    IMPORT_CANDIDATES = ("work_logs.jsonl", "work_logs.json")
+
+    def __init__(self, data_dir="user_data", filename="work_logs.db"):
+        self.data_dir = os.path.join(os.getcwd(), data_dir)
+        self.filepath = os.path.join(self.data_dir, filename)
+
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+
+        is_new = not os.path.exists(self.filepath)
+        # The log viewer loads on a worker thread; callers never use the
+        # connection from two threads at once
+        self.conn = sqlite3.connect(self.filepath, check_same_thread=False)
+        self._create_schema()
+
+        if is_new:
+            for candidate in self.IMPORT_CANDIDATES:
+                path = os.path.join(self.data_dir, candidate)
+                if os.path.exists(path):
+                    count = self.import_json(path)
+                    print(f"SqliteLogManager: Imported {count} entries from {path}")
+                    break
+
+        # Stable Task IDs live next to the database
+        stem = os.path.splitext(filename)[0]
+        self.task_registry = TaskRegistry(os.path.join(self.data_dir, f"{stem}.tasks.json"))
+        if not self.task_registry.exists():
+            self.task_registry.bootstrap(self.get_all_logs())
+
+    def _create_schema(self):
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_name TEXT,
+                    timestamp TEXT,
+                    status TEXT,
+                    rating INTEGER,
+                    data TEXT NOT NULL,
+                    revision INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(logs)")]
+            if "revision" not in columns:
+                # Databases from older builds: their rows predate any reader's version
+                self.conn.execute("ALTER TABLE logs ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_task_name ON logs (task_name)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_status ON logs (status)")
+            # query(task=...) returns a task's entries in time order straight from this index
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_task_time ON logs (task_name, timestamp)")
+            # MAX(revision) for version() and "revision > ?" for get_changes()
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_revision ON logs (revision)")
+        self._has_fts = self._create_search_schema()
+
+    @staticmethod
+    def _search_values(row):
+        """SQL expressions for the SEARCH_FIELDS of a logs row (e.g. row="new" in a trigger)."""
+        return ", ".join(f"{row}.task_name" if field == "task_name" else f"json_extract({row}.data, '$.{field}')"
+                         for field in SEARCH_FIELDS)
+
+    def _create_search_schema(self):
+        """Creates (and on first run fills) the full-text table. Returns False without FTS5."""
+        columns = ", ".join(SEARCH_FIELDS)
+        values = self._search_values("new")
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'logs_fts'"
+        ).fetchone() is not None
+        try:
+            with self.conn:
+                self.conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5({columns}, "
+                                  "tokenize = 'unicode61 remove_diacritics 2')")
+                self.conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+                        INSERT INTO logs_fts (rowid, {columns}) VALUES (new.id, {values});
+                    END
+                """)
+                self.conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS logs_fts_update AFTER UPDATE ON logs BEGIN
+                        DELETE FROM logs_fts WHERE rowid = old.id;
+                        INSERT INTO logs_fts (rowid, {columns}) VALUES (new.id, {values});
+                    END
+                """)
+                if not exists:
+                    # Databases from older builds: index the existing history once
+                    self.conn.execute(
+                        f"INSERT INTO logs_fts (rowid, {columns}) SELECT logs.id, {self._search_values('logs')} FROM logs"
+                    )
+        except sqlite3.OperationalError as e:
+            print(f"SqliteLogManager: Full-text search unavailable: {e}")
+            return False
+        return True
+
+    # Every write takes the next revision, whichever connection makes it
+    _NEXT_REVISION = "(SELECT COALESCE(MAX(revision), 0) + 1 FROM logs)"
+    _INSERT_SQL = ("INSERT INTO logs (task_name, timestamp, status, rating, data, revision) "
+                   f"VALUES (?, ?, ?, ?, ?, {_NEXT_REVISION})")
+
+    @staticmethod
+    def _row_values(entry):
+        return (
+            entry.get('task_name'),
+            entry.get('timestamp'),
+            entry.get('status', 'completed'),
+            entry.get('rating', 0),
+            json.dumps(entry, ensure_ascii=False),
+        )
+
+    def import_json(self, filepath):
+        """
+        One-shot import from a JSON/JSONL work log file (e.g. user_data/work_logs.json).
+        Returns the number of imported entries.
+        """
+        logs = read_log_file(filepath)
+        with self.conn:
+            self.conn.executemany(
+                self._INSERT_SQL, [self._row_values(entry) for entry in logs]
+            )
+        return len(logs)
+
+    def _execute(self, sql, params=()):
+        """Runs a read once the saves queued for this database have landed."""
+        BackgroundWriter.instance().wait(self.filepath)
+        return self.conn.execute(sql, params)
+
+    def _fetch_entries(self, sql, params=()):
+        return [json.loads(row[0]) for row in self._execute(sql, params)]
+
+    _LAST_ROW_SQL = "SELECT id, status, data FROM logs ORDER BY id DESC LIMIT 1"
+
+    def _last_row(self):
+        return self._execute(self._LAST_ROW_SQL).fetchone()
+
+    def get_all_logs(self):
+        """Returns a list of all log entries."""
+        return self._fetch_entries("SELECT data FROM logs ORDER BY id")
+
+    def version(self):
+        """
+        Opaque token that changes whenever the log changes: the row count and
+        the highest revision, both read from the table, so writes from any
+        connection count.
+        """
+        count = self._execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+        revision = self._execute("SELECT MAX(revision) FROM logs").fetchone()[0] or 0
+        return (0, count, revision)
+
+    def get_changes(self, version=None):
+        """
+        Returns (version, start, entries): the entries from position `start` on
+        that are new or changed since `version`. Same contract as LogManager.get_changes().
+        """
+        current = self.version()
+        if version is None or version[1] > current[1]:
+            return current, 0, self.get_all_logs()
+        if version == current:
+            return current, current[1], []
+
+        _, count, revision = version
+        # Rows inserted or updated since `version` carry a newer revision; the
+        # first of them (usually a promoted plan or the first new row) is the start
+        first_id = self._execute(
+            "SELECT MIN(id) FROM logs WHERE revision > ?", (revision,)
+        ).fetchone()[0]
+        start = count
+        if first_id is not None:
+            start = min(count, self._execute(
+                "SELECT COUNT(*) FROM logs WHERE id < ?", (first_id,)
+            ).fetchone()[0])
+        return current, start, self._fetch_entries(
+            "SELECT data FROM logs ORDER BY id LIMIT -1 OFFSET ?", (start,)
+        )
+
+    def query(self, task=None, since=None, until=None, status=None, min_rating=None,
+              limit=None, order="asc"):
+        """
+        Lazily yields the entries matching every given filter, by timestamp
+        (order "asc": oldest first, "desc": newest first).
+        Same contract as LogManager.query(); rows are decoded as the cursor advances.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown order: {order}")
+        clauses = []
+        params = []
+        for clause, value in (("task_name = ?", task),
+                              ("timestamp >= ?", iso_timestamp(since)),
+                              ("timestamp < ?", iso_timestamp(until)),
+                              ("status = ?", status),
+                              ("rating >= ?", min_rating)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = order.upper()
+        sql = f"SELECT data FROM logs {where} ORDER BY timestamp {direction}, id {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return (json.loads(row[0]) for row in self._execute(sql, params))
+
+    def get_logs_for_task(self, task_name):
+        """Returns all entries for a task, oldest first."""
+        return list(self.query(task=task_name))
+
+    def get_logs_between(self, since=None, until=None):
+        """
+        Returns entries whose timestamp falls in [since, until), oldest first.
+        since/until: datetime or ISO string, either may be None.
+        """
+        return list(self.query(since=since, until=until))
+
+    def search(self, query, limit=50):
+        """
+        Returns entries whose task name or reflections contain every word of
+        `query` (the last word may be partial), best match first.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        if not self._has_fts:
+            # No FTS5 in this SQLite build: scan, newest first
+            matches = []
+            for entry in reversed(self.get_all_logs()):
+                text = set(tokenize(" ".join(str(entry.get(field) or "") for field in SEARCH_FIELDS)))
+                if all(any(w.startswith(word) for w in text) for word in words):
+                    matches.append(entry)
+                    if len(matches) == limit:
+                        break
+            return matches
+
+        # Quoted words, the last one as a prefix; FTS5 ANDs them
+        match = " ".join(f'"{word}"' for word in words) + "*"
+        weights = ", ".join(str(TASK_NAME_WEIGHT if field == "task_name" else 1) for field in SEARCH_FIELDS)
+        return self._fetch_entries(f"""
+            SELECT logs.data FROM logs_fts JOIN logs ON logs.id = logs_fts.rowid
+            WHERE logs_fts MATCH ?
+            ORDER BY bm25(logs_fts, {weights}), logs.id DESC
+            LIMIT ?
+        """, (match, limit))
+
+    def prepare_search(self):
+        """Nothing to warm up: the FTS table is kept current by triggers."""
+
+    def save_log(self, entry):
+        """
+        Saves a single log entry.
+        entry: dict containing log details.
+        """
+        # Add timestamp if not present
+        if 'timestamp' not in entry:
+            entry['timestamp'] = datetime.now().isoformat()
+
+        status = entry.get('status', 'completed')
+        entry_copy = dict(entry)
+        filepath = self.filepath
+
+        def write():
+            # The writer thread gets its own connection; self.conn stays with the readers
+            conn = sqlite3.connect(filepath)
+            try:
+                with conn:
+                    # Decide insert vs. update against the rows as they are now, not when queued
+                    conn.execute("BEGIN IMMEDIATE")
+                    last = conn.execute(self._LAST_ROW_SQL).fetchone()
+                    if status == 'completed' and last and last[1] == 'planned':
+                        # Update the existing planned log instead of appending
+                        merged = json.loads(last[2])
+                        merged.update(entry_copy)
+                        conn.execute(
+                            f"UPDATE logs SET task_name = ?, timestamp = ?, status = ?, rating = ?, data = ?, "
+                            f"revision = {self._NEXT_REVISION} WHERE id = ?",
+                            self._row_values(merged) + (last[0],)
+                        )
+                    else:
+                        conn.execute(self._INSERT_SQL, self._row_values(entry_copy))
+            finally:
+                conn.close()
+
+        BackgroundWriter.instance().submit(write, key=filepath)
+
+        self.task_registry.record(entry.get('task_name'), entry['timestamp'],
+                                  completed=(status == 'completed'))
+
+    def get_pending_plan(self):
+        """
+        Returns the last log ONLY IF its status is 'planned'.
+        Otherwise returns None.
+        """
+        last = self._last_row()
+        if last and last[1] == 'planned':
+            return json.loads(last[2])
+        return None
+
+    def get_next_session_number(self, task_name):
+        """Returns the next session number for a given task name."""
+        row = self._execute(
+            "SELECT COUNT(*) FROM logs WHERE task_name = ?", (task_name,)
+        ).fetchone()
+        return row[0] + 1
+
+    def get_last_task_name(self):
+        """Returns the task name of the most recent log, or empty string."""
+        row = self._execute(
+            "SELECT task_name FROM logs ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return (row[0] or "") if row else ""
+
+    def get_task_names(self):
+        """Returns unique task names in order of first appearance."""
+        rows = self._execute("""
+            SELECT task_name FROM logs
+            WHERE task_name IS NOT NULL AND task_name != ''
+            GROUP BY task_name ORDER BY MIN(id)
+        """)
+        return [row[0] for row in rows]
+
+    def get_task_id(self, task_name):
+        """
+        Generates or retrieves a Task ID (e.g., #T1) for a given task name.
+        IDs come from the persistent task registry and never shift.
+        """
+        return self.task_registry.get_id(task_name)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """
+    Opt-in startup timing. Set TOMODORANGE_PROFILE_STARTUP=1 to record:
+    - import time of every module loaded from here on (self and cumulative),
+    - construction time of the components wrapped in measure(),
+    - milestones (e.g. first paint) relative to process start.
+    report() prints the summary. When the variable is unset every call is a no-op.
+    """
+    ENV_VAR = "TOMODORANGE_PROFILE_STARTUP"
+    enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+
+    _t0 = time.perf_counter()
+    _components = [] # (name, ms)
+    _milestones = [] # (name, ms since start)
+    _imports = {}    # module name -> [self ms, cumulative ms]
+    _import_stack = []
+    _hook = None
+
+    @staticmethod
+    def start(t0=None):
+        """Installs the import timing hook. t0: perf_counter() value to measure from."""
+        if not StartupProfiler.enabled:
+            return
+        if t0 is not None:
+            StartupProfiler._t0 = t0
+        if StartupProfiler._hook is None:
+            StartupProfiler._hook = _ImportTimingFinder()
+            sys.meta_path.insert(0, StartupProfiler._hook)
+
+    @staticmethod
+    def stop():
+        if StartupProfiler._hook is not None:
+            sys.meta_path.remove(StartupProfiler._hook)
+            StartupProfiler._hook = None
+
+    @staticmethod
+    @contextmanager
+    def measure(name):
+        """Times a block (typically a component's construction)."""
+        if not StartupProfiler.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            StartupProfiler._components.append((name, (time.perf_counter() - started) * 1000))
+
+    @staticmethod
+    def mark(name):
+        """Records a milestone; returns ms since start."""
+        elapsed_ms = (time.perf_counter() - StartupProfiler._t0) * 1000
+        if StartupProfiler.enabled:
+            StartupProfiler._milestones.append((name, elapsed_ms))
+        return elapsed_ms
+
+    @staticmethod
+    def _record_import(name, self_ms, total_ms):
+        StartupProfiler._imports[name] = [self_ms, total_ms]
+
+    @staticmethod
+    def report(top=15):
+        if not StartupProfiler.enabled:
+            return
+        StartupProfiler.stop()
+        print("=== Startup profile ===")
+        for name, ms in StartupProfiler._milestones:
+            print(f"  [milestone] {name:<40} {ms:8.1f} ms")
+        for name, ms in StartupProfiler._components:
+            print(f"  [component] {name:<40} {ms:8.1f} ms")
+
+        imports = sorted(StartupProfiler._imports.items(), key=lambda item: item[1][0], reverse=True)
+        total_self = sum(self_ms for self_ms, _ in StartupProfiler._imports.values())
+        print(f"  [imports] {len(imports)} modules, {total_self:.1f} ms total; slowest (self / cumulative):")
+        for name, (self_ms, total_ms) in imports[:top]:
+            print(f"    {name:<44} {self_ms:8.1f} / {total_ms:8.1f} ms")
+
+
+class _ImportTimingFinder:
+    """
+    Meta path finder that finds nothing itself: it asks the real finders for
+    the spec and wraps the loader so module execution gets timed.
+    """
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader)
+            return spec
+        return None
+
+
+class _TimedLoader:
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = StartupProfiler._import_stack
+        stack.append(0.0) # time spent in nested imports
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            nested_ms = stack.pop()
+            if stack:
+                stack[-1] += total_ms
+            StartupProfiler._record_import(module.__name__, total_ms - nested_ms, total_ms)
+
+    def __getattr__(self, name):
+        # get_resource_reader, is_package, get_code... go to the real loader
+        return getattr(self._loader, name)
@@ -0,0 +1,119 @@
+import json
+import os
+from datetime import datetime
+from utils.file_utils import write_json_atomic
+from utils.background_writer import BackgroundWriter
+
+class TaskRegistry:
+    """
+    Persistent mapping of task name -> stable Task ID (#Tn).
+    Each task also tracks created/last-used timestamps and a session counter.
+    The registry is updated incrementally on every save, so IDs never shift
+    when history is edited and lookups are a single dict access.
+    """
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.tasks = {}
+        self.next_number = 1
+        self._signature = None
+        self._refresh()
+
+    def exists(self):
+        return os.path.exists(self.filepath) or BackgroundWriter.instance().has_pending(self.filepath)
+
+    def _refresh(self):
+        """Reloads from disk if another process (or manager instance) changed the file."""
+        if self._signature is None:
+            # First load: another instance's queued save must land before we read,
+            # or we'd start from an empty or stale registry and later overwrite it
+            BackgroundWriter.instance().wait(self.filepath)
+        elif BackgroundWriter.instance().has_pending(self.filepath):
+            # Memory is ahead of the file until our queued save lands
+            return
+
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return
+
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return
+
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.tasks = data.get('tasks', {})
+            self.next_number = data.get('next_number', len(self.tasks) + 1)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"TaskRegistry: Error loading {self.filepath}: {e}")
+        self._signature = signature
+
+    def save(self):
+        """Persists a snapshot through the background writer (queued saves coalesce)."""
+        snapshot = {
+            "next_number": self.next_number,
+            "tasks": {name: dict(task) for name, task in self.tasks.items()},
+        }
+        filepath = self.filepath
+
+        def write():
+            write_json_atomic(filepath, snapshot)
+            st = os.stat(filepath)
+            self._signature = (st.st_mtime_ns, st.st_size)
+
+        BackgroundWriter.instance().submit(write, key=filepath, coalesce=True)
+
+    def bootstrap(self, entries):
+        """
+        Builds the registry from existing history (order of first appearance),
+        so upgraded installs keep the IDs they had before.
+        """
+        for entry in entries:
+            self.record(entry.get('task_name'), entry.get('timestamp'),
+                        completed=entry.get('status', 'completed') != 'planned', save=False)
+        self.save()
+
+    def get_id(self, task_name):
+        """Returns the task's ID, or the ID it would get if recorded now."""
+        if not task_name:
+            return ""
+        self._refresh()
+        task = self.tasks.get(task_name)
+        if task:
+            return task['id']
+        return f"#T{self.next_number}"
+
+    def get(self, task_name):
+        self._refresh()
+        return self.tasks.get(task_name)
+
+    def record(self, task_name, timestamp=None, completed=True, save=True):
+        """
+        Registers use of a task, assigning the next ID if it is new.
+        Only completed sessions count towards the session counter; plans just reserve the ID.
+        """
+        if not task_name:
+            return
+        if save:
+            self._refresh()
+
+        timestamp = timestamp or datetime.now().isoformat()
+        task = self.tasks.get(task_name)
+        if task is None:
+            task = {
+                "id": f"#T{self.next_number}",
+                "created": timestamp,
+                "last_used": timestamp,
+                "sessions": 0,
+            }
+            self.tasks[task_name] = task
+            self.next_number += 1
+
+        if completed:
+            task['sessions'] += 1
+        task['last_used'] = timestamp
+
+        if save:
+            self.save()
+
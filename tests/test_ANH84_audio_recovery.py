@@ -1,28 +1,37 @@
 
 import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput, QSoundEffect
-from PySide6.QtCore import QUrl
+from PySide6.QtCore import QUrl, QCoreApplication
 
-from src.core.audio_manager import AudioManager
+from core.audio_manager import AudioManager
+
+# Create QCoreApplication instance if it doesn't exist (queued signals need one)
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
 
 class TestAudioRecovery(unittest.TestCase):
     def setUp(self):
         # Create instance
-        # We need to mock the internal objects because __init__ creates them
-        with patch('src.core.audio_manager.QSoundEffect') as mock_se, \
-             patch('src.core.audio_manager.QMediaPlayer') as mock_mp, \
-             patch('src.core.audio_manager.QAudioOutput') as mock_ao, \
-             patch('src.core.audio_manager.QMediaDevices') as mock_md:
+        # We need to mock the internal objects; they are created lazily, so force them here
+        with patch('core.audio_manager.SoundEngine') as mock_se, \
+             patch('core.audio_manager.QMediaPlayer') as mock_mp, \
+             patch('core.audio_manager.QAudioOutput') as mock_ao, \
+             patch('core.audio_manager.QMediaDevices') as mock_md, \
+             patch('core.audio_manager.os.path.exists', return_value=True):
             
             self.audio_manager = AudioManager()
+            self.audio_manager._ensure_sound_engine()
+            self.audio_manager._ensure_player()
             self.mock_player = self.audio_manager.player
             self.mock_audio_output = self.audio_manager.audio_output
             self.mock_media_devices = self.audio_manager.media_devices
-            self.mock_tick_effect = self.audio_manager.tick_effect
+            self.mock_sound_engine = self.audio_manager.sound_engine
 
     def test_on_player_error_triggers_recovery(self):
         """Test that a ResourceError triggers recovery."""
@@ -60,7 +69,7 @@ class TestAudioRecovery(unittest.TestCase):
         
         self.audio_manager._recover_audio_state.assert_called_once()
 
-    @patch('src.core.audio_manager.QMediaDevices')
+    @patch('core.audio_manager.QMediaDevices')
     def test_recover_audio_state_resets_device(self, mock_md_cls):
         """Test that recovery attempts to set the default device."""
         # Setup default device return
@@ -71,9 +80,63 @@ class TestAudioRecovery(unittest.TestCase):
         
         self.audio_manager._recover_audio_state()
         
-        # Verify device was set on audio output and tick effect
+        # Verify device was set on audio output and the sound engine's stream
         self.mock_audio_output.setDevice.assert_called_with(mock_default_device)
-        self.mock_tick_effect.setAudioDevice.assert_called_with(mock_default_device)
+        self.mock_sound_engine.set_device.assert_called_with(mock_default_device)
+
+
+class TestLazyAudio(unittest.TestCase):
+    @patch('core.audio_manager.QMediaDevices')
+    @patch('core.audio_manager.QMediaPlayer')
+    @patch('core.audio_manager.SoundEngine')
+    def test_muted_audio_builds_nothing(self, mock_se, mock_mp, mock_md):
+        """With audio muted no multimedia objects are created"""
+        audio_manager = AudioManager()
+        audio_manager.toggle_mute(True)
+        audio_manager.play_tick()
+        audio_manager.start_break_sound()
+
+        mock_se.assert_not_called()
+        mock_mp.assert_not_called()
+        mock_md.assert_not_called()
+
+    @patch('core.audio_manager.QMediaPlayer')
+    def test_missing_asset_checked_once(self, mock_mp):
+        """A missing asset is remembered instead of failing on every break"""
+        audio_manager = AudioManager()
+        with patch('core.audio_manager.os.path.exists', return_value=False) as mock_exists:
+            audio_manager.start_break_sound()
+            audio_manager.stop_break_sound()
+            audio_manager.start_break_sound()
+
+        # One check per candidate file (waves.wav, waves.mp3), not one per break
+        self.assertEqual(mock_exists.call_count, 2)
+        self.assertIsNone(audio_manager.player)
+        mock_mp.assert_not_called()
+
+    @patch('core.audio_manager.QMediaDevices')
+    @patch('core.audio_manager.SoundBank')
+    @patch('core.audio_manager.SoundEngine')
+    def test_ambient_decoded_off_gui_thread_on_first_break(self, mock_se, mock_bank, mock_md):
+        """Ticks don't decode the ambient loop; the first break does, on a worker thread"""
+        decoded_on = []
+        def load(name, path):
+            decoded_on.append(threading.current_thread())
+            return "samples"
+        mock_bank.return_value.load.side_effect = load
+
+        audio_manager = AudioManager()
+        with patch('core.audio_manager.os.path.exists', return_value=True):
+            audio_manager.play_tick()
+            self.assertEqual(decoded_on, [])
+
+            audio_manager.start_break_sound()
+            audio_manager._ambient_thread.join()
+            QCoreApplication.processEvents() # Deliver ambient_decoded
+
+        self.assertIsNot(decoded_on[0], threading.main_thread())
+        mock_se.return_value.set_ambient_samples.assert_called_once_with("samples")
+        mock_se.return_value.start_loop.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
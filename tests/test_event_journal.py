@@ -0,0 +1,127 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from PySide6.QtCore import QCoreApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.timer_engine import TimerEngine
+from core.clock import VirtualScheduler
+from utils import event_journal
+from utils.event_journal import EventJournal
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+class TestEventJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.scheduler = VirtualScheduler(start=1_000_000.0)
+        self.journal = EventJournal(data_dir=os.path.join(self.tmp_dir, "user_data"),
+                                    clock=self.scheduler.now)
+        self.engine = TimerEngine(work_minutes=25, break_minutes=5, scheduler=self.scheduler)
+        self.journal.attach(self.engine)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_records_are_fixed_width_and_batched(self):
+        """Events stay in memory until flush, then land as 16-byte records"""
+        self.engine.start()
+        self.scheduler.advance(10)
+        self.engine.toggle_pause()
+        self.assertEqual(os.path.getsize(self.journal.filepath), 16)  # header only
+
+        self.journal.flush()
+        self.assertEqual(os.path.getsize(self.journal.filepath), 16 * 3)
+        events = list(self.journal.iter_events())
+        self.assertEqual([e.event for e in events], [event_journal.START, event_journal.PAUSE])
+        self.assertTrue(events[0].running)
+        self.assertEqual(events[1].value, 25 * 60 - 10)
+
+    def test_engine_events_in_order(self):
+        """Resets, duration edits and state switches are all journaled"""
+        self.engine.start()
+        self.scheduler.advance(25 * 60)
+        self.engine.update_durations(50, 10)
+        self.engine.reset_timer()
+
+        kinds = [e.event for e in self.journal.iter_events()]
+        self.assertEqual(kinds, [
+            event_journal.START, event_journal.WORK_COMPLETED, event_journal.STATE,
+            event_journal.SCHEDULE, event_journal.DURATIONS, event_journal.PAUSE, event_journal.RESET,
+            event_journal.STATE,
+        ])
+
+    def test_schedule_edit_records_new_durations(self):
+        """A duration edit journals every new duration, not just the current period's"""
+        self.engine.start()
+        self.scheduler.advance(60)
+        self.engine.update_durations(50, 10, 20, 3)
+
+        schedule, durations = list(self.journal.iter_events())[-2:]
+        self.assertEqual(schedule.event, event_journal.SCHEDULE)
+        self.assertEqual(event_journal.decode_schedule(schedule.value), (50, 10, 20, 3))
+        self.assertEqual(durations.event, event_journal.DURATIONS)
+        self.assertEqual(durations.value, 50 * 60)
+
+        # Without a long break its fields stay empty
+        self.engine.update_durations(30, 5)
+        schedule = list(self.journal.iter_events())[-2]
+        self.assertEqual(event_journal.decode_schedule(schedule.value), (30, 5, 0, 0))
+
+        # The packed durations are never mistaken for time left in the period
+        self.scheduler.advance(10 * 60)
+        self.assertAlmostEqual(self.journal.focused_seconds(), 11 * 60)
+
+    def test_focused_seconds(self):
+        """Only running work time counts; pauses and breaks don't"""
+        start = self.scheduler.now()
+        self.engine.start()
+        self.scheduler.advance(5 * 60)
+        self.engine.stop()
+        self.scheduler.advance(60 * 60)
+        self.engine.start()
+        self.scheduler.advance(25 * 60)  # 20 more minutes of work, then 5 of break
+
+        self.assertAlmostEqual(self.journal.focused_seconds(), 25 * 60)
+        # A window that starts mid-history only counts what falls inside it
+        self.assertAlmostEqual(self.journal.focused_seconds(since=start + 75 * 60), 10 * 60)
+
+    def test_focused_seconds_over_several_cycles(self):
+        """Every work period counts in full, not just the first one"""
+        self.engine.start()
+        self.scheduler.advance(3 * 30 * 60)
+
+        # Each switch records the time left in the period it enters
+        switches = [e for e in self.journal.iter_events() if e.event == event_journal.STATE]
+        self.assertEqual([e.value for e in switches], [5 * 60, 25 * 60] * 3)
+        self.assertAlmostEqual(self.journal.focused_seconds(), 3 * 25 * 60)
+
+    def test_power_saver_records_exact_remaining(self):
+        """Between sparse power-saver wake-ups the journal still records the exact time left"""
+        self.engine.set_power_saver(True)
+        self.engine.start()
+        self.scheduler.advance(115)
+        self.engine.stop()
+
+        pause = list(self.journal.iter_events())[-1]
+        self.assertEqual(pause.event, event_journal.PAUSE)
+        self.assertEqual(pause.value, 25 * 60 - 115)
+
+    def test_downtime_capped_at_period_end(self):
+        """A session left running (e.g. crash) counts at most the rest of its period"""
+        self.engine.start()
+        self.scheduler.jump(10 * 3600)
+
+        self.assertAlmostEqual(self.journal.focused_seconds(), 25 * 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch
+from PySide6.QtWidgets import QApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.floating_widget import FloatingWidget
+
+# Create QApplication instance if it doesn't exist
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+
+class TestFaceCache(unittest.TestCase):
+    def setUp(self):
+        self.widget = FloatingWidget()
+        self.widget.set_timer_style("orange")
+        self.renders = []
+        original = self.widget._paint_face
+        def paint_face(painter, rect):
+            self.renders.append((self.widget.current_mode, self.widget.visible_count))
+            original(painter, rect)
+        self.widget._paint_face = paint_face
+
+    def _key(self):
+        w = self.widget
+        return (w.width(), w.height(), w.devicePixelRatioF(), w.current_mode, w.visible_count, w.orange_opacity)
+
+    def test_same_state_is_rendered_once(self):
+        """A repaint in the same state reuses the cached face"""
+        first = self.widget._get_face_pixmap()
+        second = self.widget._get_face_pixmap()
+
+        self.assertIs(first, second)
+        self.assertEqual(self.renders, [("work", 6)])
+        self.assertIn(self._key(), self.widget._face_cache)
+
+    def test_key_covers_mode_segments_and_opacity(self):
+        """Mode, visible segments and opacity each get their own face"""
+        self.widget._get_face_pixmap()
+        self.widget.set_mode("break")
+        self.widget._get_face_pixmap()
+        self.widget.set_progress(0.5)
+        self.widget._get_face_pixmap()
+        self.widget.set_orange_opacity(0.5)
+        self.widget._get_face_pixmap()
+
+        self.assertEqual(len(self.widget._face_cache), 4)
+        self.assertEqual(len(self.renders), 4)
+
+    def test_least_recently_used_face_is_evicted(self):
+        """Past FACE_CACHE_SIZE the face used longest ago is dropped"""
+        self.widget.FACE_CACHE_SIZE = 2
+        self.widget._get_face_pixmap()        # work, 6 segments
+        work_key = self._key()
+        self.widget.set_progress(0.5)
+        self.widget._get_face_pixmap()        # work, 3 segments
+        half_key = self._key()
+
+        # Touch the full face, then add a third: the half face goes
+        self.widget.set_progress(0.0)
+        self.widget._get_face_pixmap()
+        self.widget.set_mode("break")
+        self.widget._get_face_pixmap()
+
+        self.assertEqual(len(self.widget._face_cache), 2)
+        self.assertIn(work_key, self.widget._face_cache)
+        self.assertNotIn(half_key, self.widget._face_cache)
+
+
+class TestSetProgress(unittest.TestCase):
+    def setUp(self):
+        self.widget = FloatingWidget()
+        self.widget.set_timer_style("orange")
+
+    def test_repaints_only_when_segment_count_changes(self):
+        """Progress inside one segment doesn't repaint; crossing into the next does"""
+        with patch.object(self.widget, "update") as update:
+            # 6 segments: the first disappears once progress passes 1/6
+            for progress in (0.0, 0.05, 0.1, 0.15):
+                self.widget.set_progress(progress)
+            self.assertEqual(update.call_count, 0)
+
+            self.widget.set_progress(0.2)
+            self.assertEqual(update.call_count, 1)
+            self.widget.set_progress(0.25)
+            self.assertEqual(update.call_count, 1)
+
+        self.assertEqual(self.widget.visible_count, 5)
+        self.assertEqual(self.widget.progress, 0.25)
+
+    def test_classic_style_never_repaints(self):
+        """The classic (text) style doesn't draw segments, so progress never repaints"""
+        self.widget.set_timer_style("classic")
+        with patch.object(self.widget, "update") as update:
+            self.widget.set_progress(0.9)
+
+        self.assertEqual(update.call_count, 0)
+        self.assertEqual(self.widget.visible_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.log_manager import LogManager
+from ui.log_loader import LogLoader
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+class TestLogLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = LogManager(data_dir=os.path.join(self.tmp_dir, "user_data"))
+        for i in range(25):
+            self.manager.save_log({"task_name": f"Task {i % 3}",
+                                   "timestamp": f"2025-01-01T10:{i:02d}:00"})
+        LogLoader.CHUNK_SIZE = 10
+
+    def tearDown(self):
+        LogLoader.CHUNK_SIZE = 2000
+        shutil.rmtree(self.tmp_dir)
+
+    def _run(self, loader):
+        loop = QEventLoop()
+        loader.loaded.connect(lambda *args: loop.quit())
+        QTimer.singleShot(5000, loop.quit)
+        loader.start()
+        loop.exec()
+        loader.join()
+
+    def test_streams_sorted_chunks(self):
+        """The log arrives newest first in chunks, followed by the store version"""
+        loader = LogLoader(self.manager)
+        chunks, progress, loaded = [], [], []
+        loader.chunk_ready.connect(chunks.append)
+        loader.progress.connect(lambda done, total: progress.append((done, total)))
+        loader.loaded.connect(lambda version, last: loaded.append((version, last)))
+        self._run(loader)
+
+        self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+        self.assertEqual(progress, [(10, 25), (20, 25), (25, 25)])
+        timestamps = [e['timestamp'] for c in chunks for e in c]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+        version, last = loaded[0]
+        self.assertEqual(version, self.manager.version())
+        self.assertEqual(last['timestamp'], "2025-01-01T10:24:00")
+
+    def test_cancel_emits_nothing(self):
+        """A cancelled load stops without delivering rows"""
+        loader = LogLoader(self.manager)
+        chunks, loaded = [], []
+        loader.chunk_ready.connect(chunks.append)
+        loader.loaded.connect(lambda *args: loaded.append(args))
+        loader.cancel()
+        loader.start()
+        loader.join()
+        QCoreApplication.processEvents()
+
+        self.assertFalse(loader.is_running())
+        self.assertEqual((chunks, loaded), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,295 @@
+import sys
+import os
+import json
+import shutil
+import time
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.log_manager import LogManager
+from utils.background_writer import BackgroundWriter
+
+
+class TestLogManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.tmp_dir, "user_data")
+        self.manager = LogManager(data_dir=self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_lines(self):
+        with open(self.manager.filepath, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_save_appends_one_record_per_line(self):
+        """Each save adds exactly one line to the log file"""
+        self.manager.save_log({"task_name": "A", "rating": 4})
+        self.manager.save_log({"task_name": "B", "rating": 3})
+
+        lines = self._read_lines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual([l['task_name'] for l in lines], ["A", "B"])
+
+    def test_plan_promotion_writes_amend_record(self):
+        """Completing a planned entry appends an amend record instead of a new entry"""
+        self.manager.save_log({"task_name": "A", "status": "planned", "deliverables": "draft"})
+        self.assertIsNotNone(self.manager.get_pending_plan())
+
+        self.manager.save_log({"task_name": "A", "status": "completed", "rating": 5})
+
+        logs = self.manager.get_all_logs()
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0]['status'], "completed")
+        self.assertEqual(logs[0]['deliverables'], "draft")
+        self.assertEqual(logs[0]['rating'], 5)
+        self.assertIsNone(self.manager.get_pending_plan())
+        self.assertEqual(len(self._read_lines()), 2)
+
+    def test_legacy_file_is_migrated_once(self):
+        """An existing work_logs.json array is converted and kept as a backup"""
+        legacy_dir = os.path.join(self.tmp_dir, "legacy")
+        os.makedirs(legacy_dir)
+        legacy = [{"task_name": "Old", "timestamp": "2024-01-01T10:00:00"},
+                  {"task_name": "Old", "timestamp": "2024-01-02T10:00:00"}]
+        with open(os.path.join(legacy_dir, "work_logs.json"), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f, indent=4)
+
+        manager = LogManager(data_dir=legacy_dir)
+
+        self.assertEqual(manager.get_all_logs(), legacy)
+        self.assertFalse(os.path.exists(os.path.join(legacy_dir, "work_logs.json")))
+        self.assertTrue(os.path.exists(os.path.join(legacy_dir, "work_logs.json.bak")))
+        self.assertEqual(manager.get_next_session_number("Old"), 3)
+
+    def test_legacy_array_in_place_is_converted(self):
+        """A .jsonl file still holding a JSON array is rewritten, with the array backed up"""
+        legacy_dir = os.path.join(self.tmp_dir, "inplace")
+        os.makedirs(legacy_dir)
+        legacy = [{"task_name": "Old", "timestamp": "2024-01-01T10:00:00"}]
+        path = os.path.join(legacy_dir, "work_logs.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        manager = LogManager(data_dir=legacy_dir)
+
+        self.assertEqual(manager.get_all_logs(), legacy)
+        with open(path + ".bak", 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), legacy)
+
+    def test_task_ids_follow_first_appearance(self):
+        """Task IDs are assigned in order of first appearance"""
+        self.assertEqual(self.manager.get_task_id("A"), "#T1")
+        self.manager.save_log({"task_name": "A"})
+        self.manager.save_log({"task_name": "B"})
+        self.manager.save_log({"task_name": "A"})
+
+        self.assertEqual(self.manager.get_task_id("A"), "#T1")
+        self.assertEqual(self.manager.get_task_id("B"), "#T2")
+        self.assertEqual(self.manager.get_task_id("C"), "#T3")
+        self.assertEqual(self.manager.get_next_session_number("A"), 3)
+        self.assertEqual(self.manager.get_last_task_name(), "A")
+
+    def test_cache_picks_up_external_appends(self):
+        """A second manager sees records appended by another writer"""
+        self.manager.save_log({"task_name": "A"})
+        self.assertEqual(self.manager.get_next_session_number("A"), 2)
+
+        other = LogManager(data_dir=self.data_dir)
+        other.save_log({"task_name": "A"})
+        other.save_log({"task_name": "B", "status": "planned"})
+
+        self.assertEqual(self.manager.get_next_session_number("A"), 3)
+        self.assertEqual(self.manager.get_task_names(), ["A", "B"])
+        self.assertEqual(self.manager.get_pending_plan()['task_name'], "B")
+
+    def test_renamed_plan_updates_indexes(self):
+        """Completing a plan under a different name moves its session count"""
+        self.manager.save_log({"task_name": "A"})
+        self.manager.save_log({"task_name": "Draft", "status": "planned"})
+        self.assertEqual(self.manager.get_task_id("Draft"), "#T2")
+
+        self.manager.save_log({"task_name": "A", "status": "completed"})
+
+        self.assertEqual(self.manager.get_task_names(), ["A"])
+        self.assertEqual(self.manager.get_next_session_number("A"), 3)
+        self.assertEqual(self.manager.get_next_session_number("Draft"), 1)
+        self.assertEqual(LogManager(data_dir=self.data_dir).get_task_names(), ["A"])
+
+    def test_task_ids_are_stable_across_history_edits(self):
+        """IDs come from the registry and survive rewriting the log file"""
+        self.manager.save_log({"task_name": "A"})
+        self.manager.save_log({"task_name": "B"})
+
+        # Drop task A from history entirely
+        with open(self.manager.filepath, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"task_name": "B"}) + "\n")
+
+        manager = LogManager(data_dir=self.data_dir)
+        self.assertEqual(manager.get_task_id("B"), "#T2")
+        self.assertEqual(manager.get_task_id("New"), "#T3")
+
+        task = manager.task_registry.get("B")
+        self.assertEqual(task['sessions'], 1)
+        self.assertIn('created', task)
+        self.assertIn('last_used', task)
+
+    def test_background_writer_keeps_cache_ahead_of_disk(self):
+        """With the writer thread running, saves are visible at once and land on disk after flush"""
+        writer = BackgroundWriter.instance()
+        writer.start()
+        try:
+            for _ in range(20):
+                self.manager.save_log({"task_name": "A"})
+            self.manager.save_log({"task_name": "B", "status": "planned"})
+            self.manager.save_log({"task_name": "B", "status": "completed"})
+
+            self.assertEqual(self.manager.get_next_session_number("A"), 21)
+            self.assertIsNone(self.manager.get_pending_plan())
+        finally:
+            writer.stop()
+
+        reloaded = LogManager(data_dir=self.data_dir)
+        self.assertEqual(len(reloaded.get_all_logs()), 21)
+        self.assertEqual(reloaded.get_task_id("B"), "#T2")
+        self.assertEqual(len(self._read_lines()), 22)
+
+    def test_fresh_instances_wait_for_queued_writes(self):
+        """A manager built while another's writes are still queued (slow disk) starts from them"""
+        run_job = BackgroundWriter._run_job
+        def slow_run_job(writer, key, job):
+            time.sleep(0.05)
+            run_job(writer, key, job)
+
+        writer = BackgroundWriter.instance()
+        writer.start()
+        try:
+            with patch.object(BackgroundWriter, "_run_job", slow_run_job):
+                # Like the dialogs: every log and every plan goes through a new manager
+                LogManager(data_dir=self.data_dir).save_log({"task_name": "A", "status": "planned"})
+                for previous, task in zip("ABCDE", "BCDEF"):
+                    LogManager(data_dir=self.data_dir).save_log({"task_name": previous, "status": "completed"})
+                    LogManager(data_dir=self.data_dir).save_log({"task_name": task, "status": "planned"})
+        finally:
+            writer.stop()
+
+        reloaded = LogManager(data_dir=self.data_dir)
+        logs = reloaded.get_all_logs()
+        self.assertEqual([log['task_name'] for log in logs], list("ABCDEF"))
+        self.assertEqual([log['status'] for log in logs], ["completed"] * 5 + ["planned"])
+        self.assertEqual([reloaded.get_task_id(task) for task in "ABCDEF"],
+                         ["#T1", "#T2", "#T3", "#T4", "#T5", "#T6"])
+
+    def test_get_changes_returns_only_new_entries(self):
+        """Readers get appended entries, the amended last entry, or everything after a rewrite"""
+        self.manager.save_log({"task_name": "A"})
+        version, start, entries = self.manager.get_changes()
+        self.assertEqual((start, len(entries)), (0, 1))
+
+        self.assertEqual(self.manager.get_changes(version), (version, 1, []))
+        self.assertEqual(self.manager.version(), version)
+
+        other = LogManager(data_dir=self.data_dir)
+        other.save_log({"task_name": "B", "status": "planned"})
+        version, start, entries = self.manager.get_changes(version)
+        self.assertEqual((start, [e['task_name'] for e in entries]), (1, ["B"]))
+
+        other.save_log({"task_name": "B", "status": "completed"})
+        other.save_log({"task_name": "C"})
+        version, start, entries = self.manager.get_changes(version)
+        self.assertEqual(start, 1)
+        self.assertEqual([e['task_name'] for e in entries], ["B", "C"])
+        self.assertEqual(entries[0]['status'], "completed")
+
+        with open(self.manager.filepath, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"task_name": "Z"}) + "\n")
+        _, start, entries = self.manager.get_changes(version)
+        self.assertEqual((start, [e['task_name'] for e in entries]), (0, ["Z"]))
+
+    def test_returned_entries_are_copies(self):
+        """Changing what the store hands out leaves its cache and indexes alone"""
+        self.manager.save_log({"task_name": "A", "status": "completed", "timestamp": "2025-01-01T10:00:00"})
+        self.manager.save_log({"task_name": "B", "status": "planned", "timestamp": "2025-01-01T11:00:00"})
+
+        handed_out = (self.manager.get_all_logs() + self.manager.get_changes()[2]
+                      + list(self.manager.query()) + [self.manager.get_pending_plan()])
+        for entry in handed_out:
+            entry['task_name'] = "Changed"
+            entry['status'] = "completed"
+            entry['timestamp'] = "2030-01-01T00:00:00"
+
+        self.assertEqual([e['task_name'] for e in self.manager.get_all_logs()], ["A", "B"])
+        self.assertEqual(self.manager.get_pending_plan()['task_name'], "B")
+        self.assertEqual([e['task_name'] for e in self.manager.query(task="A")], ["A"])
+        self.assertEqual(list(self.manager.query(task="Changed")), [])
+        self.assertEqual(len(list(self.manager.query(since="2025-01-01T10:30:00"))), 1)
+
+    def test_query_filters_and_orders(self):
+        """query() combines filters, orders by timestamp and stops at the limit"""
+        rows = [("A", "2025-01-01T09:00:00", 3, "completed"),
+                ("B", "2025-01-01T10:00:00", 5, "completed"),
+                ("A", "2025-01-02T09:00:00", 5, "completed"),
+                ("A", "2025-01-01T12:00:00", 1, "completed"), # Logged late, out of order
+                ("B", "2025-01-03T09:00:00", 0, "planned")]
+        for name, timestamp, rating, status in rows:
+            self.manager.save_log({"task_name": name, "timestamp": timestamp,
+                                   "rating": rating, "status": status})
+
+        def stamps(results):
+            return [e['timestamp'][5:13] for e in results]
+
+        self.assertEqual(stamps(self.manager.query(task="A")),
+                         ["01-01T09", "01-01T12", "01-02T09"])
+        self.assertEqual(stamps(self.manager.query(task="A", order="desc", limit=2)),
+                         ["01-02T09", "01-01T12"])
+        self.assertEqual(stamps(self.manager.query(since=datetime(2025, 1, 1, 10), until="2025-01-03")),
+                         ["01-01T10", "01-01T12", "01-02T09"])
+        self.assertEqual(stamps(self.manager.query(min_rating=5)), ["01-01T10", "01-02T09"])
+        self.assertEqual(stamps(self.manager.query(status="planned")), ["01-03T09"])
+        self.assertEqual(list(self.manager.query(task="B", status="planned", until="2025-01-02")), [])
+        self.assertEqual(len(self.manager.get_logs_for_task("A")), 3)
+        with self.assertRaises(ValueError):
+            self.manager.query(order="sideways")
+
+        # Promoting the plan moves it between the status lists
+        self.manager.save_log({"task_name": "B", "timestamp": "2025-01-03T09:30:00", "rating": 4,
+                               "status": "completed"})
+        self.assertEqual(list(self.manager.query(status="planned")), [])
+        self.assertEqual(stamps(self.manager.query(task="B", min_rating=4)), ["01-01T10", "01-03T09"])
+
+    def test_query_is_lazy_on_chronological_log(self):
+        """In a time-ordered log, posting lists are walked directly and only as far as needed"""
+        for i in range(5):
+            self.manager.save_log({"task_name": "A" if i % 2 == 0 else "B",
+                                   "timestamp": f"2025-01-0{i + 1}T09:00:00", "rating": i})
+
+        results = self.manager.query(task="A", order="desc")
+        self.assertEqual(next(results)['rating'], 4)
+        self.assertEqual([e['rating'] for e in results], [2, 0])
+        self.assertEqual([e['rating'] for e in self.manager.query(min_rating=1, limit=2)], [1, 2])
+
+    def test_search_covers_saved_and_external_entries(self):
+        """Saves update the search index; entries from other writers are indexed on search"""
+        self.manager.save_log({"task_name": "Report", "status": "planned"})
+        self.manager.save_log({"task_name": "Report", "status": "completed",
+                               "deliverables": "Quarterly numbers"})
+        self.assertEqual([e['task_name'] for e in self.manager.search("quarterly")], ["Report"])
+
+        other = LogManager(data_dir=self.data_dir)
+        other.save_log({"task_name": "Budget", "wishes": "Fewer quarterly meetings"})
+        self.assertEqual([e['task_name'] for e in self.manager.search("quart")], ["Report", "Budget"])
+        self.assertEqual(self.manager.search("meetings quarterly")[0]['task_name'], "Budget")
+
+        # The persisted index is picked up by a new manager
+        reloaded = LogManager(data_dir=self.data_dir)
+        self.assertEqual(len(reloaded.search("quarterly")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+import unittest
+from PySide6.QtCore import QCoreApplication, Qt
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ui.log_table_model import LogTableModel
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+def make_entries(count):
+    return [{
+        "timestamp": f"2025-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}",
+        "task_id": f"#T{i % 7 + 1}",
+        "task_name": f"Task {i % 7}",
+        "session_num_display": i // 7 + 1,
+        "rating": i % 6,
+    } for i in range(count)]
+
+
+class TestLogTableModel(unittest.TestCase):
+    def setUp(self):
+        self.model = LogTableModel()
+
+    def test_rows_are_paged(self):
+        """Only one page of rows is exposed until the view fetches more"""
+        self.model.set_entries(make_entries(100000))
+
+        self.assertEqual(self.model.rowCount(), LogTableModel.PAGE_SIZE)
+        self.assertTrue(self.model.canFetchMore())
+        self.model.fetchMore()
+        self.assertEqual(self.model.rowCount(), 2 * LogTableModel.PAGE_SIZE)
+        self.assertEqual(self.model.total_count(), 100000)
+
+    def test_cells_formatted_newest_first(self):
+        """data() formats date, session and rating on demand"""
+        self.model.set_entries(make_entries(10))
+
+        self.assertFalse(self.model.canFetchMore())
+        row = [self.model.data(self.model.index(0, col)) for col in range(5)]
+        self.assertEqual(row, ["2025-01-01 00:00", "#T3", "Task 2", "2", "⭐⭐⭐"])
+        self.assertEqual(self.model.data(self.model.index(9, 4)), "-")
+        self.assertEqual(self.model.data(self.model.index(0, 0), Qt.UserRole)["rating"], 3)
+
+    def test_add_entries_inserts_rows_in_place(self):
+        """New entries are inserted at their sorted row without a model reset"""
+        entries = make_entries(5)
+        self.model.set_entries(entries[:4])
+        resets, inserted = [], []
+        self.model.modelReset.connect(lambda: resets.append(1))
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append(first))
+
+        amended = dict(entries[3], rating=5)
+        self.model.add_entries([amended, entries[4]], replaces=self.model.entry(0))
+
+        self.assertEqual(resets, [])
+        self.assertEqual(inserted, [0, 0])
+        self.assertEqual(self.model.rowCount(), 5)
+        self.assertIs(self.model.entry(0), entries[4])
+        self.assertIs(self.model.entry(1), amended)
+
+        # Older than every shown row: lands at the bottom
+        self.model.add_entries([{"timestamp": "2024-12-31T00:00:00"}])
+        self.assertEqual(self.model.entry(5)["timestamp"], "2024-12-31T00:00:00")
+
+    def test_extend_entries_fills_first_page(self):
+        """Streamed chunks expose rows up to one page, the rest wait for fetchMore"""
+        entries = make_entries(500)[::-1]
+        self.model.set_entries([])
+        self.model.extend_entries(entries[:150])
+        self.assertEqual(self.model.rowCount(), 150)
+        self.model.extend_entries(entries[150:])
+        self.assertEqual(self.model.rowCount(), LogTableModel.PAGE_SIZE)
+        self.assertEqual(self.model.total_count(), 500)
+        self.assertIs(self.model.entry(0), entries[0])
+
+    def test_bad_timestamp_shown_as_is(self):
+        """Unparseable timestamps fall back to the raw string"""
+        self.model.set_entries([{"timestamp": "yesterday", "task_name": "A"}])
+        self.assertEqual(self.model.data(self.model.index(0, 0)), "yesterday")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from PySide6.QtWidgets import QApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.clock import VirtualScheduler
+from utils.settings_manager import SettingsManager
+import main as app_main
+
+# Create QApplication instance if it doesn't exist
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+
+class TestBuildApp(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved = (SettingsManager.REPO_SETTINGS_FILE, SettingsManager.CUSTOM_SETTINGS_FILE)
+        SettingsManager.REPO_SETTINGS_FILE = os.path.join(self.tmp_dir, "settings.json")
+        SettingsManager.CUSTOM_SETTINGS_FILE = os.path.join(self.tmp_dir, "custom_settings.json")
+        SettingsManager._settings = None
+
+        patchers = [patch("ui.settings_window.SettingsWindow"), patch("ui.log_viewer_window.LogViewerWindow"),
+                    patch.object(QApplication, "quit")]
+        self.settings_window, self.log_viewer, self.quit = [p.start() for p in patchers]
+        for p in patchers:
+            self.addCleanup(p.stop)
+
+        self.components = app_main.build_app(app, scheduler=VirtualScheduler(),
+                                              data_dir=os.path.join(self.tmp_dir, "user_data"))
+        self.tray = self.components["tray_manager"]
+
+    def tearDown(self):
+        self.components["session_store"].close()
+        self.tray.tray_icon.hide()
+        SettingsManager.flush()
+        SettingsManager.REPO_SETTINGS_FILE, SettingsManager.CUSTOM_SETTINGS_FILE = self.saved
+        SettingsManager._settings = None
+        shutil.rmtree(self.tmp_dir)
+
+    def test_no_window_built_at_startup(self):
+        """Building the app creates neither the Settings nor the Log Viewer window"""
+        self.settings_window.assert_not_called()
+        self.log_viewer.assert_not_called()
+
+    def test_settings_built_on_first_request_only(self):
+        """The Settings window is built the first time the tray asks, then reused"""
+        self.tray.show_settings_requested.emit()
+        self.tray.show_settings_requested.emit()
+
+        self.settings_window.assert_called_once()
+        self.assertEqual(self.settings_window.return_value.showNormal.call_count, 2)
+        self.log_viewer.assert_not_called()
+
+    def test_log_viewer_built_on_first_request_only(self):
+        """The Log Viewer is built the first time the tray asks, then reused"""
+        self.tray.review_logs_requested.emit()
+        self.tray.review_logs_requested.emit()
+
+        self.log_viewer.assert_called_once()
+        self.assertEqual(self.log_viewer.return_value.showNormal.call_count, 2)
+        self.settings_window.assert_not_called()
+
+    def test_tray_quit_drops_session_snapshot(self):
+        """Only quitting from the tray deletes the session snapshot; the next launch starts fresh"""
+        store = self.components["session_store"]
+        self.assertTrue(os.path.exists(store.filepath))
+
+        self.tray.quit_requested.emit()
+
+        self.quit.assert_called_once()
+        self.assertFalse(os.path.exists(store.filepath))
+
+
+if __name__ == "__main__":
+    unittest.main()
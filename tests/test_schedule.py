@@ -0,0 +1,48 @@
+import sys
+import os
+import unittest
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.schedule import Schedule
+
+
+class TestSchedule(unittest.TestCase):
+    def setUp(self):
+        # 3 x (work 25 / break 5), the third break is a 15 minute long break
+        self.schedule = Schedule.standard(25, 5, 15, 3)
+
+    def test_compiled_timeline(self):
+        """Slots get cumulative start offsets and the last break is long"""
+        self.assertEqual(len(self.schedule), 6)
+        self.assertEqual([slot.start for slot in self.schedule.slots],
+                         [0, 1500, 1800, 3300, 3600, 5100])
+        self.assertEqual(self.schedule.slot(5).kind, "long_break")
+        self.assertEqual(self.schedule.slot(5).state, "break")
+        self.assertEqual(self.schedule.cycle_seconds, 6000)
+
+    def test_index_at_wraps_across_cycles(self):
+        """Lookup returns absolute indices that keep counting across repetitions"""
+        self.assertEqual(self.schedule.index_at(0), 0)
+        self.assertEqual(self.schedule.index_at(1499.5), 0)
+        self.assertEqual(self.schedule.index_at(1500), 1)
+        self.assertEqual(self.schedule.index_at(6000 + 3400), 6 + 3)
+        self.assertEqual(self.schedule.start_of(9), 6000 + 3300)
+        self.assertEqual(self.schedule.end_of(9), 6000 + 3600)
+
+    def test_work_slots_between(self):
+        """Work slot counting is O(1) across whole cycles"""
+        self.assertEqual(self.schedule.work_slots_between(1, 2), 0)
+        self.assertEqual(self.schedule.work_slots_between(1, 3), 1)
+        self.assertEqual(self.schedule.work_slots_between(0, 6 * 10), 30)
+
+    def test_long_breaks_disabled(self):
+        """cycles_before_long_break=0 keeps the plain work/break alternation"""
+        schedule = Schedule.standard(25, 5)
+        self.assertEqual([(s.state, s.duration) for s in schedule.slots],
+                         [("work", 1500), ("break", 300)])
+
+
+if __name__ == "__main__":
+    unittest.main()
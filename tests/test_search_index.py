@@ -0,0 +1,82 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.search_index import SearchIndex, tokenize
+
+
+ENTRIES = [
+    {"task_name": "Write report", "deliverables": "First draft of the quarterly report"},
+    {"task_name": "Refactor parser", "good_bad": "Tests were slow", "better_way": "Profile before optimizing"},
+    {"task_name": "Café planning", "wishes": "More focus, fewer meetings"},
+    {"task_name": "Review", "deliverables": "Reviewed the parser refactor and the report"},
+]
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "work_logs.search.json")
+        self.index = SearchIndex(self.path)
+        self.index.sync(0, ENTRIES)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_tokenize_folds_case_and_accents(self):
+        self.assertEqual(tokenize("Café, NAÏVE tests!"), ["cafe", "naive", "tests"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_all_words_must_match_and_last_is_prefix(self):
+        """Queries are ANDed; the word being typed matches as a prefix"""
+        self.assertEqual(sorted(self.index.search("report")), [0, 3])
+        self.assertEqual(sorted(self.index.search("parser refac")), [1, 3])
+        self.assertEqual(self.index.search("cafe"), [2])
+        self.assertEqual(self.index.search("report meetings"), [])
+        self.assertEqual(self.index.search("  "), [])
+
+    def test_task_name_matches_rank_first(self):
+        """A word in the task name outranks the same word in a long note"""
+        self.assertEqual(self.index.search("parser"), [1, 3])
+        self.assertEqual(self.index.search("report"), [0, 3])
+
+    def test_reindex_and_truncate(self):
+        """Changed entries replace their terms; a shorter log drops documents"""
+        self.index.add(3, {"task_name": "Review", "deliverables": "Nothing"})
+        self.assertEqual(self.index.search("report"), [0])
+
+        self.index.sync(0, ENTRIES[:2])
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.search("cafe"), [])
+
+    def test_index_is_persisted(self):
+        """A new instance reads the journal (and, after compaction, the snapshot) back"""
+        self.index.add(3, {"task_name": "Review", "deliverables": "Nothing"})
+        reloaded = SearchIndex(self.path)
+        self.assertEqual(len(reloaded), 4)
+        self.assertEqual(reloaded.search("report"), [0])
+        self.assertEqual(reloaded.search("nothing"), [3])
+
+        reloaded.compact()
+        self.assertEqual(os.path.getsize(reloaded.journal_path), 0)
+        snapshot = SearchIndex(self.path)
+        self.assertEqual(snapshot.search("nothing"), [3])
+        self.assertEqual(snapshot.search("par"), [1])
+
+    def test_sync_repairs_changed_history(self):
+        """A rewritten entry in the middle re-indexes from there on"""
+        changed = list(ENTRIES)
+        changed[1] = {"task_name": "Gardening"}
+        self.index.sync(0, changed)
+        self.assertEqual(self.index.search("parser"), [3])
+        self.assertEqual(self.index.search("garden"), [1])
+        self.assertEqual(self.index.search("cafe"), [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
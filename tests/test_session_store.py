@@ -0,0 +1,115 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from PySide6.QtCore import QCoreApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.timer_engine import TimerEngine
+from core.clock import VirtualScheduler
+from utils.session_store import SessionStore
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = SessionStore(data_dir=os.path.join(self.tmp_dir, "user_data"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _engine(self):
+        scheduler = VirtualScheduler()
+        return TimerEngine(work_minutes=25, break_minutes=5, scheduler=scheduler), scheduler
+
+    def test_snapshot_written_on_transitions_only(self):
+        """Ticks don't touch the file; pausing does"""
+        engine, scheduler = self._engine()
+        self.store.attach(engine)
+        engine.start()
+        first = os.stat(self.store.filepath).st_mtime_ns
+        scheduler.advance(60)
+        self.assertEqual(os.stat(self.store.filepath).st_mtime_ns, first)
+
+        engine.toggle_pause()
+        snapshot = self.store.load()
+        self.assertFalse(snapshot["running"])
+        self.assertAlmostEqual(snapshot["remaining"], 25 * 60 - 60)
+
+    def test_restore_replays_downtime(self):
+        """A running session resumes where wall-clock time says it should be"""
+        engine, scheduler = self._engine()
+        self.store.attach(engine)
+        engine.start()
+        saved_at = self.store.load()["saved_at"]
+
+        # App was down for 27 minutes: work ended, 2 minutes into the break
+        restored, scheduler = self._engine()
+        completed = []
+        restored.work_completed.connect(lambda: completed.append(True))
+        self.assertTrue(self.store.restore(restored, now=saved_at + 27 * 60))
+        scheduler.advance(0)
+
+        self.assertEqual(restored.current_state, "break")
+        self.assertEqual(restored.remaining_seconds, 3 * 60)
+        self.assertEqual(completed, [True])
+
+    def test_paused_session_stays_paused(self):
+        """Downtime doesn't count against a paused session"""
+        engine, scheduler = self._engine()
+        self.store.attach(engine)
+        engine.start()
+        scheduler.advance(90)
+        engine.stop()
+        saved_at = self.store.load()["saved_at"]
+
+        restored, _ = self._engine()
+        self.assertTrue(self.store.restore(restored, now=saved_at + 3600))
+        self.assertFalse(restored.is_running)
+        self.assertEqual(restored.remaining_seconds, 25 * 60 - 90)
+
+    def test_long_downtime_starts_fresh(self):
+        """Downtime past a full cycle is not replayed"""
+        engine, _ = self._engine()
+        self.store.attach(engine)
+        engine.start()
+        saved_at = self.store.load()["saved_at"]
+
+        restored, _ = self._engine()
+        completed = []
+        restored.work_completed.connect(lambda: completed.append(True))
+        self.assertFalse(self.store.restore(restored, now=saved_at + 10 * 3600))
+        self.assertEqual(completed, [])
+
+    def test_close_drops_snapshot(self):
+        """Quitting from the tray leaves nothing to resume"""
+        engine, _ = self._engine()
+        self.store.attach(engine)
+        engine.start()
+        self.store.close()
+        engine.stop()
+
+        self.assertIsNone(self.store.load())
+        restored, _ = self._engine()
+        self.assertFalse(self.store.restore(restored))
+
+    def test_schedule_change_starts_fresh(self):
+        """A snapshot for different durations is ignored"""
+        engine, _ = self._engine()
+        self.store.attach(engine)
+        engine.start()
+
+        other = TimerEngine(work_minutes=50, break_minutes=10, scheduler=VirtualScheduler())
+        self.assertFalse(self.store.restore(other))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.settings_manager import SettingsManager
+from utils.file_utils import write_json_atomic
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+def wait(ms):
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+class TestSettingsManagerSaves(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved = (SettingsManager.REPO_SETTINGS_FILE, SettingsManager.CUSTOM_SETTINGS_FILE)
+        SettingsManager.REPO_SETTINGS_FILE = os.path.join(self.tmp_dir, "settings.json")
+        SettingsManager.CUSTOM_SETTINGS_FILE = os.path.join(self.tmp_dir, "custom_settings.json")
+        SettingsManager._settings = None
+        SettingsManager._dirty = False
+
+    def tearDown(self):
+        SettingsManager.flush()
+        SettingsManager.REPO_SETTINGS_FILE, SettingsManager.CUSTOM_SETTINGS_FILE = self.saved
+        SettingsManager._settings = None
+        shutil.rmtree(self.tmp_dir)
+
+    def _read_custom(self):
+        with open(SettingsManager.CUSTOM_SETTINGS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_burst_is_written_once_after_debounce(self):
+        """A slider drag is applied in memory at once but written once, 300 ms after it ends"""
+        with patch("utils.settings_manager.write_json_atomic", wraps=write_json_atomic) as writes:
+            for volume in (10, 20, 30):
+                SettingsManager.update_settings({'work_volume': volume})
+                self.assertEqual(SettingsManager.load_settings()['work_volume'], volume)
+            wait(SettingsManager.SAVE_DEBOUNCE_MS // 2)
+            self.assertEqual(writes.call_count, 0)
+
+            wait(SettingsManager.SAVE_DEBOUNCE_MS + 200)
+            self.assertEqual(writes.call_count, 1)
+        self.assertEqual(self._read_custom()['work_volume'], 30)
+
+    def test_flush_writes_pending_changes_now(self):
+        """flush() skips the remaining debounce and cancels the pending write"""
+        with patch("utils.settings_manager.write_json_atomic", wraps=write_json_atomic) as writes:
+            SettingsManager.update_settings({'text_size': 55})
+            SettingsManager.flush()
+            self.assertEqual(writes.call_count, 1)
+            self.assertEqual(self._read_custom()['text_size'], 55)
+
+            # Nothing left to write: neither a second flush nor the timer writes again
+            SettingsManager.flush()
+            wait(SettingsManager.SAVE_DEBOUNCE_MS + 100)
+            self.assertEqual(writes.call_count, 1)
+
+
+class TestWriteJsonAtomic(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "data.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_renames_temp_file_over_target(self):
+        """The data is written to a temp file next to the target and renamed over it"""
+        write_json_atomic(self.path, {"a": 1})
+        with patch("utils.file_utils.os.replace", wraps=os.replace) as replace:
+            write_json_atomic(self.path, {"a": 2})
+
+        tmp_path, target = replace.call_args[0]
+        self.assertEqual(target, self.path)
+        self.assertEqual(os.path.dirname(tmp_path), self.tmp_dir)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"a": 2})
+        self.assertEqual(os.listdir(self.tmp_dir), ["data.json"])
+
+    def test_failed_write_keeps_old_file(self):
+        """A write that fails midway leaves the previous file and no temp file"""
+        write_json_atomic(self.path, {"a": 1})
+        with self.assertRaises(TypeError):
+            write_json_atomic(self.path, {"a": object()})
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {"a": 1})
+        self.assertEqual(os.listdir(self.tmp_dir), ["data.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
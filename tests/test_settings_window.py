@@ -0,0 +1,83 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from PySide6.QtWidgets import QApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.settings_manager import SettingsManager
+from ui.settings_window import SettingsWindow
+
+# Create QApplication instance if it doesn't exist
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+
+class TestDiffSettings(unittest.TestCase):
+    def test_only_changed_keys(self):
+        """Only keys whose value differs are returned, with their new value"""
+        old = {"work_minutes": 25, "break_minutes": 5, "work_color": "#FFA500"}
+        new = {"work_minutes": 30, "break_minutes": 5, "work_color": "#FFA500"}
+        self.assertEqual(SettingsManager.diff_settings(old, new), {"work_minutes": 30})
+
+    def test_new_key_counts_as_changed(self):
+        """A key missing from the old settings is a change, even if its value is falsy"""
+        self.assertEqual(SettingsManager.diff_settings({}, {"is_muted": False}), {"is_muted": False})
+
+    def test_no_changes(self):
+        settings = {"work_minutes": 25, "text_opacity": 0.5}
+        self.assertEqual(SettingsManager.diff_settings(settings, dict(settings)), {})
+
+
+class TestSettingsWindowSignals(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved = (SettingsManager.REPO_SETTINGS_FILE, SettingsManager.CUSTOM_SETTINGS_FILE)
+        SettingsManager.REPO_SETTINGS_FILE = os.path.join(self.tmp_dir, "settings.json")
+        SettingsManager.CUSTOM_SETTINGS_FILE = os.path.join(self.tmp_dir, "custom_settings.json")
+        SettingsManager._settings = None
+
+        self.window = SettingsWindow()
+        self.diffs = []
+        self.changed = []
+        self.window.settings_diff.connect(lambda changes: self.diffs.append(changes))
+        self.window.setting_changed.connect(lambda key, value: self.changed.append((key, value)))
+
+    def tearDown(self):
+        SettingsManager.flush()
+        SettingsManager.REPO_SETTINGS_FILE, SettingsManager.CUSTOM_SETTINGS_FILE = self.saved
+        SettingsManager._settings = None
+        shutil.rmtree(self.tmp_dir)
+
+    def test_one_key_per_edit(self):
+        """Editing one input emits just that key, once on each signal"""
+        self.window.work_input.setValue(40)
+
+        self.assertEqual(self.diffs, [{"work_minutes": 40}])
+        self.assertEqual(self.changed, [("work_minutes", 40)])
+        self.assertEqual(SettingsManager.load_settings()["work_minutes"], 40)
+
+    def test_each_edit_reports_only_its_own_key(self):
+        """The baseline moves with every emission, so earlier edits are not repeated"""
+        self.window.work_input.setValue(40)
+        self.window.size_slider['slider'].setValue(60)
+
+        self.assertEqual(self.diffs, [{"work_minutes": 40}, {"text_size": 60}])
+        self.assertEqual(self.changed, [("work_minutes", 40), ("text_size", 60)])
+
+    def test_no_emission_without_changes(self):
+        """Re-emitting unchanged settings (or a tray-side work log toggle) emits nothing"""
+        self.window.emit_settings()
+        self.window.set_work_log_enabled(True)
+        self.window.emit_settings()
+
+        self.assertEqual(self.diffs, [])
+        self.assertEqual(self.changed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
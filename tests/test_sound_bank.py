@@ -0,0 +1,117 @@
+import sys
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+from array import array
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.sound_bank import SoundBank, Mixer, decode_wav, SAMPLE_BYTES
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets', 'audio')
+
+
+class TestSoundBank(unittest.TestCase):
+    def test_decodes_tick_once(self):
+        """The tick WAV decodes to 16-bit mono samples and is cached by name"""
+        bank = SoundBank()
+        samples = bank.load("tick", os.path.join(ASSETS_DIR, "water_drop.wav"))
+        self.assertEqual(len(samples), 7281)
+        self.assertIs(bank.load("tick", "ignored.wav"), samples)
+        self.assertEqual(decode_wav(os.path.join(ASSETS_DIR, "water_drop.wav")), samples)
+
+    def test_missing_file_is_remembered(self):
+        """A missing asset loads as None and is not retried"""
+        bank = SoundBank()
+        self.assertIsNone(bank.load("ambient", os.path.join(ASSETS_DIR, "missing.wav")))
+        self.assertNotIn("ambient", bank)
+
+
+class TestDecodeWav(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, channels, width, rate, raw):
+        path = os.path.join(self.tmp_dir, "sound.wav")
+        with wave.open(path, 'wb') as w:
+            w.setnchannels(channels)
+            w.setsampwidth(width)
+            w.setframerate(rate)
+            w.writeframes(raw)
+        return path
+
+    def test_stereo_is_averaged(self):
+        """Interleaved channels are averaged with floor division"""
+        path = self._write(2, 2, 44100, struct.pack("<6h", 100, 300, -5, 2, 32767, 32767))
+        self.assertEqual(list(decode_wav(path)), [200, -2, 32767])
+
+    def test_8_and_32_bit_are_widened_and_narrowed(self):
+        """Unsigned 8-bit becomes the high byte; 32-bit keeps its high 16 bits"""
+        path = self._write(1, 1, 44100, bytes([0, 128, 255]))
+        self.assertEqual(list(decode_wav(path)), [-32768, 0, 127 << 8])
+        path = self._write(1, 4, 44100, struct.pack("<3i", 1 << 16, -(1 << 16), 0x7FFFFFFF))
+        self.assertEqual(list(decode_wav(path)), [1, -1, 32767])
+
+    def test_nearest_sample_resampling(self):
+        """Output sample i is input sample i * rate // 44100, for any pair of rates"""
+        source = list(range(0, 3000, 3))
+        for rate in (22050, 88200, 48000, 8000):
+            path = self._write(1, 2, rate, struct.pack(f"<{len(source)}h", *source))
+            count = len(source) * 44100 // rate
+            expected = [source[i * rate // 44100] for i in range(count)]
+            self.assertEqual(list(decode_wav(path)), expected, rate)
+
+
+class TestMixer(unittest.TestCase):
+    def setUp(self):
+        self.mixer = Mixer()
+        self.mixer.set_tick(array('h', [1000] * 10), volume=0.5)
+        self.mixer.set_ambient(array('h', [32000, -30000, 100]), volume=1.0)
+
+    def _mix(self, count):
+        out = array('h')
+        out.frombytes(self.mixer.mix(count))
+        if sys.byteorder == 'big':
+            out.byteswap()
+        return list(out)
+
+    def test_silence_when_idle(self):
+        """Nothing playing produces silence and reports inactive"""
+        self.assertFalse(self.mixer.active)
+        self.assertEqual(self.mixer.mix(4), bytes(4 * SAMPLE_BYTES))
+
+    def test_tick_is_prescaled_and_padded(self):
+        """A tick over silence plays at its channel volume, then silence"""
+        self.mixer.tick.trigger()
+        self.assertEqual(self._mix(12), [500] * 10 + [0, 0])
+        self.assertFalse(self.mixer.active)
+
+    def test_loop_wraps_and_mixes_with_clipping(self):
+        """The ambient loop repeats; overlapping sounds are summed and clipped"""
+        self.mixer.ambient.playing = True
+        self.mixer.tick.trigger()
+        self.assertEqual(self._mix(4), [32500, -29500, 600, 32500])
+        self.mixer.tick.set_volume(1.0)
+        self.mixer.tick.trigger()
+        # Both voices now at full volume: 32000 + 1000 + 1000 clips
+        self.assertEqual(self._mix(3)[2], 32767)
+
+    def test_mute_without_rebuilding(self):
+        """Muting silences the loop and ignores new ticks"""
+        self.mixer.ambient.playing = True
+        self.mixer.ambient.muted = True
+        self.mixer.tick.muted = True
+        self.mixer.tick.trigger()
+        self.assertFalse(self.mixer.active)
+        self.assertEqual(self._mix(3), [0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import sys
+import os
+import json
+import sqlite3
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.sqlite_log_manager import SqliteLogManager
+from utils.background_writer import BackgroundWriter
+
+
+class TestSqliteLogManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.tmp_dir, "user_data")
+        self.manager = SqliteLogManager(data_dir=self.data_dir)
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_plan_promotion_updates_last_row(self):
+        """Completing a planned entry updates it in place"""
+        self.manager.save_log({"task_name": "A", "status": "planned", "deliverables": "draft"})
+        self.assertEqual(self.manager.get_pending_plan()['task_name'], "A")
+
+        self.manager.save_log({"task_name": "A", "status": "completed", "rating": 4})
+
+        logs = self.manager.get_all_logs()
+        self.assertEqual(len(logs), 1)
+        self.assertEqual(logs[0]['deliverables'], "draft")
+        self.assertEqual(logs[0]['rating'], 4)
+        self.assertIsNone(self.manager.get_pending_plan())
+
+    def test_saves_run_on_the_background_writer(self):
+        """Rows are written on the writer thread; reads right after a save already see it"""
+        writer = BackgroundWriter.instance()
+        threads = []
+        connect = sqlite3.connect
+        def tracking_connect(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return connect(*args, **kwargs)
+
+        writer.start()
+        try:
+            with patch("utils.sqlite_log_manager.sqlite3.connect", tracking_connect):
+                self.manager.save_log({"task_name": "A", "status": "planned"})
+                self.manager.save_log({"task_name": "A", "status": "completed"})
+                self.manager.save_log({"task_name": "B", "status": "planned"})
+                self.assertEqual(self.manager.get_pending_plan()['task_name'], "B")
+                self.assertEqual(self.manager.get_next_session_number("A"), 2)
+        finally:
+            writer.stop()
+
+        self.assertEqual(threads, ["BackgroundWriter"] * 3)
+        self.assertEqual([log['status'] for log in self.manager.get_all_logs()], ["completed", "planned"])
+
+    def test_get_changes_returns_only_new_entries(self):
+        """Readers get new rows, plus the last row again when it was updated"""
+        self.manager.save_log({"task_name": "A"})
+        version, start, entries = self.manager.get_changes()
+        self.assertEqual((start, len(entries)), (0, 1))
+        self.assertEqual(self.manager.get_changes(version), (version, 1, []))
+
+        self.manager.save_log({"task_name": "B", "status": "planned"})
+        version, start, entries = self.manager.get_changes(version)
+        self.assertEqual((start, [e['task_name'] for e in entries]), (1, ["B"]))
+
+        other = SqliteLogManager(data_dir=self.data_dir)
+        other.save_log({"task_name": "B", "status": "completed"})
+        other.close()
+        version, start, entries = self.manager.get_changes(version)
+        self.assertEqual((start, [e['status'] for e in entries]), (1, ["completed"]))
+
+    def test_get_changes_sees_external_amend_and_insert(self):
+        """Another connection promoting the plan and adding a row is reported from the amended row on"""
+        self.manager.save_log({"task_name": "A"})
+        self.manager.save_log({"task_name": "B", "status": "planned"})
+        version, _, _ = self.manager.get_changes()
+
+        other = SqliteLogManager(data_dir=self.data_dir)
+        other.save_log({"task_name": "B", "status": "completed"})
+        other.save_log({"task_name": "C", "status": "planned"})
+        other.close()
+
+        version, start, entries = self.manager.get_changes(version)
+        self.assertEqual(start, 1)
+        self.assertEqual([(e['task_name'], e['status']) for e in entries],
+                         [("B", "completed"), ("C", "planned")])
+        self.assertEqual(self.manager.get_changes(version), (version, 3, []))
+
+    def test_old_database_gets_revision_column(self):
+        """A database from before the revision column is upgraded in place"""
+        self.manager.close()
+        path = os.path.join(self.data_dir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE logs (id INTEGER PRIMARY KEY AUTOINCREMENT, task_name TEXT, "
+                     "timestamp TEXT, status TEXT, rating INTEGER, data TEXT NOT NULL)")
+        conn.execute("INSERT INTO logs (task_name, timestamp, status, rating, data) VALUES (?, ?, ?, ?, ?)",
+                     ("Old", "2025-01-01T10:00:00", "completed", 0,
+                      json.dumps({"task_name": "Old", "timestamp": "2025-01-01T10:00:00"})))
+        conn.commit()
+        conn.close()
+
+        self.manager = SqliteLogManager(data_dir=self.data_dir, filename="old.db")
+        version, start, entries = self.manager.get_changes()
+        self.assertEqual(version, (0, 1, 0))
+        self.manager.save_log({"task_name": "New"})
+        version, start, entries = self.manager.get_changes(version)
+        self.assertEqual((start, [e['task_name'] for e in entries]), (1, ["New"]))
+
+    def test_query_filters_and_orders(self):
+        """query() combines filters, orders by timestamp and stops at the limit"""
+        rows = [("A", "2025-01-01T09:00:00", 3, "completed"),
+                ("B", "2025-01-01T10:00:00", 5, "completed"),
+                ("A", "2025-01-02T09:00:00", 5, "completed"),
+                ("A", "2025-01-01T12:00:00", 1, "completed"), # Logged late, out of order
+                ("B", "2025-01-03T09:00:00", 0, "planned")]
+        for name, timestamp, rating, status in rows:
+            self.manager.save_log({"task_name": name, "timestamp": timestamp,
+                                   "rating": rating, "status": status})
+
+        def stamps(results):
+            return [e['timestamp'][5:13] for e in results]
+
+        self.assertEqual(stamps(self.manager.query(task="A")),
+                         ["01-01T09", "01-01T12", "01-02T09"])
+        self.assertEqual(stamps(self.manager.query(task="A", order="desc", limit=2)),
+                         ["01-02T09", "01-01T12"])
+        self.assertEqual(stamps(self.manager.query(since=datetime(2025, 1, 1, 10), until="2025-01-03")),
+                         ["01-01T10", "01-01T12", "01-02T09"])
+        self.assertEqual(stamps(self.manager.query(min_rating=5)), ["01-01T10", "01-02T09"])
+        self.assertEqual(stamps(self.manager.query(status="planned")), ["01-03T09"])
+        self.assertEqual(list(self.manager.query(task="B", status="planned", until="2025-01-02")), [])
+        self.assertEqual(len(self.manager.get_logs_for_task("A")), 3)
+        with self.assertRaises(ValueError):
+            self.manager.query(order="sideways")
+
+        # Promoting the plan moves it between the status lists
+        self.manager.save_log({"task_name": "B", "timestamp": "2025-01-03T09:30:00", "rating": 4,
+                               "status": "completed"})
+        self.assertEqual(list(self.manager.query(status="planned")), [])
+        self.assertEqual(stamps(self.manager.query(task="B", min_rating=4)), ["01-01T10", "01-03T09"])
+
+    def test_search(self):
+        """Full-text search covers inserted and updated rows, last word as a prefix"""
+        self.manager.save_log({"task_name": "Report", "status": "planned"})
+        self.manager.save_log({"task_name": "Report", "status": "completed",
+                               "deliverables": "Quarterly numbers"})
+        self.manager.save_log({"task_name": "Budget", "wishes": "Fewer quarterly meetings"})
+
+        self.assertEqual([e['task_name'] for e in self.manager.search("quart")], ["Report", "Budget"])
+        self.assertEqual([e['task_name'] for e in self.manager.search("report quarterly")], ["Report"])
+        self.assertEqual(self.manager.search("nothing"), [])
+
+    def test_task_lookups(self):
+        """Task IDs, session numbers and names match the JSON manager"""
+        for name in ["A", "B", "A"]:
+            self.manager.save_log({"task_name": name})
+
+        self.assertEqual(self.manager.get_task_id("A"), "#T1")
+        self.assertEqual(self.manager.get_task_id("B"), "#T2")
+        self.assertEqual(self.manager.get_task_id("C"), "#T3")
+        self.assertEqual(self.manager.get_next_session_number("A"), 3)
+        self.assertEqual(self.manager.get_task_names(), ["A", "B"])
+        self.assertEqual(self.manager.get_last_task_name(), "A")
+        self.assertEqual(len(self.manager.get_logs_for_task("A")), 2)
+
+    def test_date_range_query(self):
+        """Entries are filtered by timestamp range"""
+        for day in (1, 2, 3):
+            self.manager.save_log({"task_name": "A", "timestamp": f"2024-01-0{day}T10:00:00"})
+
+        logs = self.manager.get_logs_between("2024-01-02", "2024-01-03")
+        self.assertEqual([l['timestamp'] for l in logs], ["2024-01-02T10:00:00"])
+
+    def test_imports_existing_json_on_creation(self):
+        """A new database imports the legacy work_logs.json"""
+        legacy_dir = os.path.join(self.tmp_dir, "legacy")
+        os.makedirs(legacy_dir)
+        legacy = [{"task_name": "Old", "timestamp": "2024-01-01T10:00:00"}]
+        with open(os.path.join(legacy_dir, "work_logs.json"), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        manager = SqliteLogManager(data_dir=legacy_dir)
+        self.assertEqual(manager.get_all_logs(), legacy)
+        manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
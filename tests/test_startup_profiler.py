@@ -0,0 +1,113 @@
+import sys
+import os
+import io
+import shutil
+import tempfile
+import importlib
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import utils.startup_profiler as startup_profiler
+
+ENV_VAR = startup_profiler.StartupProfiler.ENV_VAR
+
+
+def load_profiler(value):
+    """Re-imports the profiler with the env var set to `value` (None: unset)."""
+    env = {key: val for key, val in os.environ.items() if key != ENV_VAR}
+    if value is not None:
+        env[ENV_VAR] = value
+    with patch.dict(os.environ, env, clear=True):
+        return importlib.reload(startup_profiler).StartupProfiler
+
+
+class TestStartupProfilerGate(unittest.TestCase):
+    def tearDown(self):
+        load_profiler(os.environ.get(ENV_VAR))
+
+    def test_env_var_values(self):
+        """Only a non-empty value other than 0 turns profiling on"""
+        self.assertFalse(load_profiler(None).enabled)
+        self.assertFalse(load_profiler("").enabled)
+        self.assertFalse(load_profiler("0").enabled)
+        self.assertTrue(load_profiler("1").enabled)
+
+    def test_disabled_is_a_no_op(self):
+        """Without the env var nothing is hooked, recorded or printed"""
+        profiler = load_profiler(None)
+        hooks = len(sys.meta_path)
+        profiler.start()
+        with profiler.measure("component"):
+            pass
+        self.assertGreaterEqual(profiler.mark("milestone"), 0)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            profiler.report()
+        self.assertEqual(len(sys.meta_path), hooks)
+        self.assertEqual(profiler._components, [])
+        self.assertEqual(profiler._milestones, [])
+        self.assertEqual(output.getvalue(), "")
+
+    def test_enabled_records_and_reports(self):
+        """With the env var, components and milestones end up in the report"""
+        profiler = load_profiler("1")
+        with profiler.measure("Widget"):
+            pass
+        profiler.mark("First paint")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            profiler.report()
+        self.assertIn("[component] Widget", output.getvalue())
+        self.assertIn("[milestone] First paint", output.getvalue())
+
+
+class TestImportHook(unittest.TestCase):
+    def setUp(self):
+        self.profiler = load_profiler("1")
+        self.tmp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.tmp_dir, "profiled_parent.py"), 'w', encoding='utf-8') as f:
+            f.write("import time\nimport profiled_child\ntime.sleep(0.01)\n")
+        with open(os.path.join(self.tmp_dir, "profiled_child.py"), 'w', encoding='utf-8') as f:
+            f.write("import time\ntime.sleep(0.02)\n")
+        sys.path.insert(0, self.tmp_dir)
+
+    def tearDown(self):
+        self.profiler.stop()
+        sys.path.remove(self.tmp_dir)
+        for name in ("profiled_parent", "profiled_child"):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.tmp_dir)
+        load_profiler(os.environ.get(ENV_VAR))
+
+    def test_import_times_self_and_cumulative(self):
+        """Nested imports count toward the parent's cumulative time, not its self time"""
+        self.profiler.start()
+        import profiled_parent
+        self.profiler.stop()
+
+        child_self, child_total = self.profiler._imports["profiled_child"]
+        parent_self, parent_total = self.profiler._imports["profiled_parent"]
+        self.assertGreaterEqual(child_self, 15)
+        self.assertGreaterEqual(parent_total, parent_self + child_total - 1)
+        self.assertLess(parent_self, child_self)
+        self.assertTrue(profiled_parent.profiled_child)
+
+    def test_stop_removes_hook(self):
+        """stop() takes the finder out of sys.meta_path; later imports aren't timed"""
+        self.profiler.start()
+        self.assertIn(self.profiler._hook, sys.meta_path)
+        self.profiler.stop()
+        import profiled_child
+
+        self.assertNotIn("profiled_child", self.profiler._imports)
+        self.assertFalse(any(isinstance(f, startup_profiler._ImportTimingFinder) for f in sys.meta_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
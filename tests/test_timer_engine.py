@@ -0,0 +1,199 @@
+import sys
+import os
+import unittest
+from PySide6.QtCore import QCoreApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.timer_engine import TimerEngine
+from core.clock import VirtualScheduler
+from core.schedule import Schedule
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+class TestTimerEngineSignals(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = VirtualScheduler()
+        self.engine = TimerEngine(work_minutes=3, break_minutes=1, progress_resolution=6,
+                                  scheduler=self.scheduler)
+        self.displays = []
+        self.progress = []
+        self.heartbeats = []
+        self.engine.display_changed.connect(lambda text: self.displays.append(text))
+        self.engine.progress_changed.connect(lambda p: self.progress.append(p))
+        self.engine.heartbeat.connect(lambda secs: self.heartbeats.append(secs))
+
+    def test_display_changes_once_per_minute(self):
+        """display_changed only fires when the minute text changes"""
+        self.engine.start()
+        self.scheduler.advance(3 * 60 - 1)
+
+        self.assertEqual(len(self.heartbeats), 3 * 60 - 1)
+        self.assertEqual(self.displays, ["03", "02", "01"])
+
+    def test_progress_is_quantized(self):
+        """progress_changed fires once per resolution step"""
+        self.engine.start()
+        self.scheduler.advance(3 * 60 - 1)
+
+        self.assertEqual(self.progress, [i / 6 for i in range(6)])
+
+
+class TestTimerEngineDeadline(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = VirtualScheduler(start=1000.0)
+        self.engine = TimerEngine(work_minutes=1, break_minutes=1, scheduler=self.scheduler)
+        self.states = []
+        self.engine.state_changed.connect(lambda state: self.states.append(state))
+
+    def test_late_timeouts_do_not_stretch_the_period(self):
+        """Each timeout firing late does not accumulate into the countdown"""
+        self.scheduler.latency = 0.3
+        self.engine.start()
+        self.scheduler.advance(60.5)
+
+        self.assertEqual(self.states, ["break"])
+        # Break deadline is exactly two minutes after start despite the late ticks
+        self.assertAlmostEqual(self.engine._deadline, 1000.0 + 120)
+        self.assertAlmostEqual(self.engine.drift_stats()["max_ms"], 300)
+
+    def test_resume_after_sleep_skips_missed_periods(self):
+        """A long stall lands in the right period without replaying every tick"""
+        completed = []
+        self.engine.work_completed.connect(lambda: completed.append(True))
+        self.engine.start()
+
+        # 4.5 minutes later: work, break, work, break, then 30s into work
+        self.scheduler.jump(4 * 60 + 30)
+        self.scheduler.advance(0)
+
+        self.assertEqual(self.engine.current_state, "work")
+        self.assertEqual(self.engine.remaining_seconds, 30)
+        self.assertEqual(self.states, ["work"])
+        self.assertEqual(len(completed), 1)
+
+    def test_pause_keeps_remaining_time(self):
+        """Time spent paused is not counted"""
+        self.engine.start()
+        self.scheduler.advance(10)
+        self.engine.stop()
+        self.scheduler.advance(500)
+        self.engine.start()
+        self.scheduler.advance(1)
+
+        self.assertEqual(self.engine.remaining_seconds, 49)
+
+
+class TestTimerEnginePowerSaver(unittest.TestCase):
+    def _collect(self, power_saver, coarse_rounding=False):
+        scheduler = VirtualScheduler(coarse_rounding=coarse_rounding)
+        engine = TimerEngine(work_minutes=25, break_minutes=5, progress_resolution=6,
+                             scheduler=scheduler)
+        displays, progress, states = [], [], []
+        engine.display_changed.connect(lambda text: displays.append(text))
+        engine.progress_changed.connect(lambda p: progress.append(p))
+        engine.state_changed.connect(lambda state: states.append(state))
+        engine.set_power_saver(power_saver)
+        engine.start()
+        scheduler.advance(3600)
+        return (displays, progress, states), engine.wakeups_per_hour()
+
+    def test_power_saver_matches_visible_output(self):
+        """Coarse scheduling produces the same display/progress/state sequence"""
+        precise, precise_wakeups = self._collect(power_saver=False)
+        coarse, coarse_wakeups = self._collect(power_saver=True)
+
+        self.assertEqual(precise, coarse)
+        self.assertGreater(precise_wakeups, 3500)
+        # One coarse wake-up plus one precise final approach per visible change
+        self.assertLess(coarse_wakeups, 200)
+
+    def test_power_saver_with_rounded_coarse_timers(self):
+        """Coarse wake-ups rounded to whole seconds stay bounded and on time"""
+        precise, _ = self._collect(power_saver=False)
+        rounded, rounded_wakeups = self._collect(power_saver=True, coarse_rounding=True)
+
+        self.assertEqual(precise, rounded)
+        self.assertLess(rounded_wakeups, 200)
+
+
+class TestTimerEngineFastForward(unittest.TestCase):
+    def test_day_of_cycles_in_order(self):
+        """A virtual day emits work_completed before each switch to break, in order"""
+        scheduler = VirtualScheduler()
+        engine = TimerEngine(work_minutes=25, break_minutes=5, scheduler=scheduler)
+        events = []
+        engine.work_completed.connect(lambda: events.append("work_completed"))
+        engine.state_changed.connect(lambda state: events.append(state))
+
+        engine.start()
+        scheduler.advance(24 * 3600)
+
+        # 48 full work/break cycles in 24h
+        self.assertEqual(events, ["work_completed", "break", "work"] * 48)
+
+
+class TestTimerEngineSchedule(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = VirtualScheduler()
+        # 2 x (work 1 / break 1), the second break lasts 3 minutes
+        self.engine = TimerEngine(scheduler=self.scheduler,
+                                  schedule=Schedule.standard(1, 1, 3, 2))
+        self.kinds = []
+        self.engine.state_changed.connect(lambda state: self.kinds.append(self.engine.current_kind))
+
+    def test_long_break_after_cycles(self):
+        """Every second break is the long one"""
+        self.engine.start()
+        self.scheduler.advance(2 * 6 * 60)
+
+        self.assertEqual(self.kinds, ["break", "work", "long_break", "work"] * 2)
+
+    def test_skip_moves_to_next_slot(self):
+        """skip() starts the next slot in full without reporting a completed work period"""
+        completed = []
+        self.engine.work_completed.connect(lambda: completed.append(True))
+        self.engine.start()
+        self.scheduler.advance(10)
+        self.engine.skip()
+        self.scheduler.advance(1)
+
+        self.assertEqual(self.kinds, ["break"])
+        self.assertEqual(self.engine.remaining_seconds, 59)
+        self.assertEqual(completed, [])
+
+    def test_seek_and_position(self):
+        """seek() lands inside the long break; position() reports the timeline offset"""
+        self.engine.seek(3 * 60 + 30)
+
+        self.assertEqual(self.engine.current_kind, "long_break")
+        self.assertEqual(self.engine.remaining_seconds, 150)
+        self.assertEqual(self.engine.position(), 210)
+
+    def test_schedule_edit_keeps_unchanged_period(self):
+        """Editing only the long break keeps the running work period's deadline"""
+        self.engine.start()
+        self.scheduler.advance(20)
+        self.engine.set_schedule(Schedule.standard(1, 1, 5, 2))
+        self.assertEqual(self.engine.remaining_seconds, 40)
+
+        self.engine.set_schedule(Schedule.standard(2, 1, 5, 2))
+        self.assertEqual(self.engine.remaining_seconds, 2 * 60)
+
+    def test_sleep_lands_in_long_break(self):
+        """A stall spanning several slots lands in the right one"""
+        self.engine.start()
+        self.scheduler.jump(4 * 60)
+        self.scheduler.advance(0)
+
+        self.assertEqual(self.kinds, ["long_break"])
+        self.assertEqual(self.engine.remaining_seconds, 2 * 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
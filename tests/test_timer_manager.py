@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+from PySide6.QtCore import QCoreApplication
+
+# Add src to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.timer_manager import TimerManager
+from core.clock import VirtualScheduler
+
+# Create QCoreApplication instance if it doesn't exist
+app = QCoreApplication.instance()
+if not app:
+    app = QCoreApplication(sys.argv)
+
+
+class TestTimerManager(unittest.TestCase):
+    def setUp(self):
+        self.base = VirtualScheduler()
+        self.manager = TimerManager(base_scheduler=self.base)
+
+    def test_timers_run_independently_on_one_scheduler(self):
+        """Each engine keeps its own schedule and signals"""
+        pomodoro = self.manager.add_timer("pomodoro", work_minutes=25, break_minutes=5)
+        standup = self.manager.add_timer("standup", work_minutes=10, break_minutes=1)
+        states = {"pomodoro": [], "standup": []}
+        pomodoro.state_changed.connect(lambda s: states["pomodoro"].append(s))
+        standup.state_changed.connect(lambda s: states["standup"].append(s))
+
+        pomodoro.start()
+        standup.start()
+        self.base.advance(30 * 60 - 1)
+
+        self.assertEqual(states["pomodoro"], ["break"])
+        self.assertEqual(states["standup"], ["break", "work", "break", "work"])
+        self.assertIs(self.manager.primary, pomodoro)
+
+    def test_shared_deadlines_share_wakeups(self):
+        """Timers ticking on the same second boundaries cost one OS wake-up"""
+        for name in ("a", "b", "c"):
+            self.manager.add_timer(name, work_minutes=5, break_minutes=5).start()
+        self.base.advance(60)
+
+        self.assertEqual(self.base.wakeups, 60)
+        self.assertTrue(all(engine.remaining_seconds == 4 * 60 for engine in self.manager))
+
+    def test_stopped_timer_leaves_the_heap(self):
+        """Pausing or removing a timer drops its deadline"""
+        a = self.manager.add_timer("a")
+        b = self.manager.add_timer("b")
+        a.start()
+        b.start()
+        self.assertEqual(len(self.manager.scheduler), 2)
+
+        a.stop()
+        self.manager.remove_timer("b")
+        self.assertEqual(len(self.manager.scheduler), 0)
+        self.base.advance(3600)
+        self.assertEqual(self.base.wakeups, 0)
+        self.assertEqual(self.manager.names(), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()